@@ -8,6 +8,7 @@ from mechanalyzer import parser
 from mechanalyzer import plotter
 from mechanalyzer import par
 from mechanalyzer import inf
+from mechanalyzer import cache
 
 
 __all__ = [
@@ -17,4 +18,5 @@ __all__ = [
     'plotter',
     'par',
     'inf',
+    'cache',
 ]
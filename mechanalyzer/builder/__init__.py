@@ -26,6 +26,7 @@ from mechanalyzer.builder._names import remove_stereo_name_suffix
 from mechanalyzer.builder._prompt import multipes_prompt_dissociation_ktp_dct
 from mechanalyzer.builder import rxn
 from mechanalyzer.builder import checker
+from mechanalyzer.builder import mech_index
 from mechanalyzer.builder import sorter
 from mechanalyzer.builder import strip_ste
 from mechanalyzer.builder import submech
@@ -58,6 +59,7 @@ __all__ = [
     'multipes_prompt_dissociation_ktp_dct',
     'rxn',
     'checker',
+    'mech_index',
     'sorter',
     'strip_ste',
     'submech',
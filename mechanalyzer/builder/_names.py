@@ -7,6 +7,7 @@ import automol.chi
 import automol.graph
 from automol.graph import FunctionalGroup
 import automol.form
+from mechanalyzer import cache
 
 
 # Name remaping function
@@ -221,7 +222,7 @@ def functional_group_name(ich, name='', rename_rule_dct=None,
                        for fgrp_name, fgrp_lst in rename_rule_dct.items()}
 
     # Get the ich, geom, and gra and other info used for getting name
-    gra = automol.chi.graph(ich)
+    gra = cache.graph(ich)
     fml = automol.graph.formula(gra)
 
     # Get the number of atoms and functional groups
@@ -1,15 +1,20 @@
 """ Return the rates from a prompt dissociation process
 """
 from operator import mod
+import os
 import sys
 import copy
+import time
+import multiprocessing
 import mess_io
+from mechanalyzer import cache
 from mechanalyzer import calculator
 from mechanalyzer.parser._util import resort_ktp_labels
 from mechanalyzer.parser._util import remove_fw_rxns
 from mechanalyzer.parser._util import remove_rev_rxns
 
-def multipes_prompt_dissociation_ktp_dct(list_strs_dct, model, bf_thresh):
+def multipes_prompt_dissociation_ktp_dct(list_strs_dct, model, bf_thresh,
+                                         nprocs='auto'):
     """ generation of rxn_ktp_dct for multipes with unknown character
         - identifies if ped or hot
         - extracts prompt rates for all
@@ -17,6 +22,8 @@ def multipes_prompt_dissociation_ktp_dct(list_strs_dct, model, bf_thresh):
         :param list_strs_dct: list of the dictionaries for each rxn
                 containing the corresponding file strings
         :type list_strs_dct: [{'inp': str, 'ktp_out':str, ...}, {}, ...]
+        :param nprocs: number of processes for the prompt calculations
+        :type nprocs: int or 'auto'
     """
     if isinstance(model, list):
         model = model[0]
@@ -35,21 +42,22 @@ def multipes_prompt_dissociation_ktp_dct(list_strs_dct, model, bf_thresh):
         elif hot_spc_en and not ped_spc:
             rxn_type_dct['hot'].append(strs_dct)
 
-        rxn_ktp_dct_full0.update(
-            mess_io.reader.rates.get_rxn_ktp_dct(
-                strs_dct['ktp_out'], filter_kts=True,
-                filter_reaction_types=('fake', 'self',
-                                       'loss', 'capture', 'reverse'),
-                #   NB KEEP THE REVERSE HERE!! ONLY WANT 1 CHNL
-                relabel_reactions=True
-            ))
+        # parsed once for all models (see mechanalyzer.cache)
+        rxn_ktp_dct_full0.update(copy.deepcopy(cache.cached_call(
+            mess_io.reader.rates.get_rxn_ktp_dct,
+            strs_dct['ktp_out'], filter_kts=True,
+            filter_reaction_types=('fake', 'self',
+                                   'loss', 'capture', 'reverse'),
+            #   NB KEEP THE REVERSE HERE!! ONLY WANT 1 CHNL
+            relabel_reactions=True
+        )))
     # resort labels to adjust prod order for different PESs with potential same prods
     rxn_ktp_dct_full0 = resort_ktp_labels(
         rxn_ktp_dct_full0)
 
     rxn_ktp_dct_full = rxn_chains_calc(
         rxn_type_dct['ped'], rxn_type_dct['pedhot'], rxn_type_dct['hot'],
-        model, bf_thresh)
+        model, bf_thresh, nprocs=nprocs)
 
     # Add in the prompt versions of the reactions
     # remove reactions possibly written in the fw or bw direction
@@ -65,14 +73,20 @@ def multipes_prompt_dissociation_ktp_dct(list_strs_dct, model, bf_thresh):
     return rxn_ktp_dct_full
 
 
-def rxn_chains_calc(PES_0, PES_i, PES_end, model, bf_thresh):
+def rxn_chains_calc(PES_0, PES_i, PES_end, model, bf_thresh, *,
+                    nprocs='auto'):
     """ generate reaction chains of successive prompt/hot PESs
+
+        Each PED PES with each connected hot PES, and each chain of
+        PED/hot PESs, is an independent task. Tasks run on a pool of
+        nprocs processes, which receive the MESS file strings once;
+        the results are merged in the order of PES_0.
     """
-    def listconnected(PES_str0, PESs_str):
-        retlist = []
-        [retlist.append(PES_str)
-         for PES_str in PESs_str if isconnected(PES_str0, PES_str)]
-        return retlist
+    def listconnected(PES_str0, PESs_str, idxs=None):
+        """ indices of the PESs in PESs_str connected to PES_str0 """
+        if idxs is None:
+            idxs = range(len(PESs_str))
+        return [idx for idx in idxs if isconnected(PES_str0, PESs_str[idx])]
 
     def isconnected(ped_spc_str, hot_en_spc_str):
         """ return true if ped species is hot species of the following PES """
@@ -88,86 +102,77 @@ def rxn_chains_calc(PES_0, PES_i, PES_end, model, bf_thresh):
 
         return len(connected) > 0
 
-    rxn_ktp_dct_full = {}
     # SIMPLE PED/HOT PESs: COUPLE ANY N OF PED AND HOT
     # INTERMEDIATE PEDs: JUST ALLOW 1 REACTION CHAIN FOR NOW
-    for pes0 in PES_0:
-        rxn_ktp_dct_ped = {}  # ped dct
+    tasks = []
+    for idx0, pes0 in enumerate(PES_0):
 
         hotend = listconnected(pes0, PES_end)
-        if len(hotend) > 0:
-            for hot_strs_dct in hotend:
-                # call the usual function of the prompt dissociation
-                rxn_ktp_dct, _, _ = calculator.nonboltz.prompt_dissociation_ktp_dct(
-                    pes0['inp'], pes0['ktp_out'],
-                    pes0['ped'], pes0['ke_out'],
-                    hot_strs_dct['inp'], hot_strs_dct['log'],
-                    model, bf_thresh)
-
-                # update dct
-                rxn_ktp_dct_ped.update(
-                    rxn_ktp_dct)
+        for idx_hot in hotend:
+            tasks.append(('hot', idx0, idx_hot))
 
         pedhot = listconnected(pes0, PES_i)
         if len(pedhot) == 1:
-            # create chain
-            pedhot_all = copy.deepcopy(PES_i)
-            pedhot_i = pedhot[0]
-            pedhot_all.remove(pedhot_i)
-
-            # PED: PES0, HOT: PEDHOT_I - EXTRACT RATES AND NEW ENERGY DISTRIBUTION
-            # call the usual function of the prompt dissociation
-            rxn_ktp_dct, pednew_dct, ene_bw_dct = calculator.nonboltz.prompt_dissociation_ktp_dct(
-                pes0['inp'], pes0['ktp_out'],
-                pes0['ped'], pes0['ke_out'],
-                pedhot_i['inp'], pedhot_i['log'],
-                model, bf_thresh, hot_ped_str=pedhot_i['ped'], hot_ke_out_str=pedhot_i['ke_out'])
-            # you need the reaction ktp dictionary as a new input
-            # you need the starting energy distribution of the products of pedhot_i
-            prompt_ktp_dct = copy.deepcopy(rxn_ktp_dct)
-            # rxn_ktp_dct contains all reactions in the chain,
-            # prompt_ktp_dct contains only the rxns to be "expanded"
+            # create chain: PEDHOT PESs up to a hot PES ending it
+            chain = [pedhot[0]]
+            pedhot_all = [idx for idx in range(len(PES_i))
+                          if idx != pedhot[0]]
+            chain_end = None
 
             while len(hotend) == 0:  # until you find a termination to the chain
 
-                pedhot_new = listconnected(pedhot_i, pedhot_all)
+                pedhot_new = listconnected(
+                    PES_i[chain[-1]], PES_i, idxs=pedhot_all)
                 if len(pedhot_new) == 1:
-                    pedhot_i = copy.deepcopy(pedhot_new[0])
-                    pedhot_all.remove(pedhot_i)
-
-                    prompt_ktp_dct, pednew_dct, ene_bw_dct = calculator.nonboltz.prompt_chain_ktp_dct(
-                        prompt_ktp_dct, pednew_dct,
-                        pedhot_i['inp'], pedhot_i['log'],
-                        model, bf_thresh, ene_bw_dct, hot_ped_str=pedhot_i['ped'],
-                        hot_ke_out_str=pedhot_i['ke_out'])
-
-                    # replace rxns every time
-                    rxn_ktp_dct.update(prompt_ktp_dct)
+                    chain.append(pedhot_new[0])
+                    pedhot_all.remove(pedhot_new[0])
 
                 elif len(pedhot_new) > 1:
                     print('*Error: more than 1 hot chan starting from {}. Exiting')
                     sys.exit()
 
                 # search for end of connection
-                hotend = listconnected(pedhot_i, PES_end)
+                hotend = listconnected(PES_i[chain[-1]], PES_end)
                 if len(hotend) > 0:
-                    hot_strs_dct = hotend[0]
+                    chain_end = hotend[0]
 
-                    prompt_ktp_dct, _, _ = calculator.nonboltz.prompt_chain_ktp_dct(
-                        prompt_ktp_dct, pednew_dct,
-                        hot_strs_dct['inp'], hot_strs_dct['log'],
-                        model, bf_thresh, ene_bw_dct)
-
-                    rxn_ktp_dct.update(prompt_ktp_dct)
-
-            # update dct
-            rxn_ktp_dct_ped.update(
-                rxn_ktp_dct)
+            tasks.append(('chain', idx0, tuple(chain), chain_end))
 
         elif len(pedhot) > 1:
             print('*Error: only chains with 1 connected pedhot species PES available')
             sys.exit()
 
+    # RUN THE TASKS
+    pes_strs = (PES_0, PES_i, PES_end)
+    task_args = [task + (model, bf_thresh) for task in tasks]
+    if nprocs == 'auto':
+        nprocs = os.cpu_count()
+    if nprocs == 1 or len(tasks) < 2:
+        _init_prompt_worker(pes_strs)
+        try:
+            results = list(map(_prompt_task, task_args))
+        finally:
+            # do not keep the strings in this process after the call
+            _PES_STRS.clear()
+    else:
+        with multiprocessing.Pool(
+                min(nprocs, len(tasks)), initializer=_init_prompt_worker,
+                initargs=(pes_strs,)) as pool:
+            results = list(
+                pool.imap(_pool_prompt_task, task_args, chunksize=1))
+
+    print('Wall times of the prompt dissociation tasks:')
+    for task, (_, wall_time) in zip(tasks, results):
+        print(f'  {_task_name(task)}: {wall_time:.1f} s')
+
+    # MERGE: IN THE ORDER OF THE TASKS FOR EACH PED PES
+    rxn_ktp_dct_full = {}
+    for idx0, _ in enumerate(PES_0):
+        rxn_ktp_dct_ped = {}  # ped dct
+        for task, (rxn_ktp_dct, _) in zip(tasks, results):
+            if task[1] == idx0:
+                rxn_ktp_dct_ped.update(rxn_ktp_dct)
+
         # merge the ped dct with the full one
         # before merging: resort labels
         rxn_ktp_dct_ped = resort_ktp_labels(
@@ -177,3 +182,112 @@ def rxn_chains_calc(PES_0, PES_i, PES_end, model, bf_thresh):
         )
 
     return rxn_ktp_dct_full
+
+
+# MESS file strings of the PESs in each process: (PES_0, PES_i, PES_end)
+_PES_STRS = []
+
+
+def _init_prompt_worker(pes_strs):
+    """ store the MESS file strings of all PESs in the process
+    """
+    _PES_STRS[:] = pes_strs
+
+
+def _prompt_task(task):
+    """ run one prompt dissociation task
+
+        :param task: ('hot', idx0, idx_hot, model, bf_thresh) or
+            ('chain', idx0, chain, chain_end, model, bf_thresh)
+        :return: rates of the task and its wall time in s
+        :rtype: ({rxn: {P: (T, k)}}, float)
+    """
+    start = time.time()
+    if task[0] == 'hot':
+        rxn_ktp_dct = _hot_ktp_dct(*task[1:])
+    else:
+        rxn_ktp_dct = _chain_ktp_dct(*task[1:])
+
+    return rxn_ktp_dct, time.time() - start
+
+
+def _pool_prompt_task(task):
+    """ run one prompt dissociation task in a worker process
+    """
+    try:
+        return _prompt_task(task)
+    except SystemExit as err:
+        # do not exit a worker process: the pool would never return
+        raise RuntimeError(
+            f'{_task_name(task)} failed and exited') from err
+
+
+def _hot_ktp_dct(idx0, idx_hot, model, bf_thresh):
+    """ prompt rates from PED PES PES_0[idx0] and hot PES PES_end[idx_hot]
+    """
+    pes0, hot_strs_dct = _PES_STRS[0][idx0], _PES_STRS[2][idx_hot]
+    # call the usual function of the prompt dissociation
+    rxn_ktp_dct, _, _ = calculator.nonboltz.prompt_dissociation_ktp_dct(
+        pes0['inp'], pes0['ktp_out'],
+        pes0['ped'], pes0['ke_out'],
+        hot_strs_dct['inp'], hot_strs_dct['log'],
+        model, bf_thresh)
+
+    return rxn_ktp_dct
+
+
+def _chain_ktp_dct(idx0, chain, chain_end, model, bf_thresh):
+    """ prompt rates from PED PES PES_0[idx0], through the chain of
+        PEDHOT PESs PES_i[chain], to the hot PES PES_end[chain_end]
+    """
+    pes0 = _PES_STRS[0][idx0]
+    pedhot_i = _PES_STRS[1][chain[0]]
+
+    # PED: PES0, HOT: PEDHOT_I - EXTRACT RATES AND NEW ENERGY DISTRIBUTION
+    # call the usual function of the prompt dissociation
+    rxn_ktp_dct, pednew_dct, ene_bw_dct = calculator.nonboltz.prompt_dissociation_ktp_dct(
+        pes0['inp'], pes0['ktp_out'],
+        pes0['ped'], pes0['ke_out'],
+        pedhot_i['inp'], pedhot_i['log'],
+        model, bf_thresh, hot_ped_str=pedhot_i['ped'], hot_ke_out_str=pedhot_i['ke_out'])
+    # you need the reaction ktp dictionary as a new input
+    # you need the starting energy distribution of the products of pedhot_i
+    prompt_ktp_dct = copy.deepcopy(rxn_ktp_dct)
+    # rxn_ktp_dct contains all reactions in the chain,
+    # prompt_ktp_dct contains only the rxns to be "expanded"
+
+    for idx in chain[1:]:
+        pedhot_i = _PES_STRS[1][idx]
+        prompt_ktp_dct, pednew_dct, ene_bw_dct = calculator.nonboltz.prompt_chain_ktp_dct(
+            prompt_ktp_dct, pednew_dct,
+            pedhot_i['inp'], pedhot_i['log'],
+            model, bf_thresh, ene_bw_dct, hot_ped_str=pedhot_i['ped'],
+            hot_ke_out_str=pedhot_i['ke_out'])
+
+        # replace rxns every time
+        rxn_ktp_dct.update(prompt_ktp_dct)
+
+    if chain_end is not None:
+        hot_strs_dct = _PES_STRS[2][chain_end]
+
+        prompt_ktp_dct, _, _ = calculator.nonboltz.prompt_chain_ktp_dct(
+            prompt_ktp_dct, pednew_dct,
+            hot_strs_dct['inp'], hot_strs_dct['log'],
+            model, bf_thresh, ene_bw_dct)
+
+        rxn_ktp_dct.update(prompt_ktp_dct)
+
+    return rxn_ktp_dct
+
+
+def _task_name(task):
+    """ description of a prompt dissociation task
+    """
+    if task[0] == 'hot':
+        name = f'PED PES {task[1]} + hot PES {task[2]}'
+    else:
+        name = f'PED PES {task[1]} + PEDHOT PESs {list(task[2])}'
+        if task[3] is not None:
+            name += f' + hot PES {task[3]}'
+
+    return name
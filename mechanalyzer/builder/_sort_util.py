@@ -0,0 +1,124 @@
+""" Helpers of sort_fct: connected channels of each PES and species of
+    the reaction sides interned to integer arrays
+"""
+
+import pandas as pd
+import numpy
+from mechanalyzer.parser import pes
+
+
+def conn_chn_df(mech_df):
+    """ Identifies connected channels and assigns them to the same subpes
+        Generate pes dictionary for each reaction and save for later use
+
+    :param self.mech_df: dataframe with mech info (contains all reactions)
+    :param conn_chn_df: empty dataframe df[subpes][rxn]
+
+    :returns: conn_chn_df dataframe[subpes][rxn]
+    :rtype: dataframe[int][tuple]
+    """
+    # taken for granted: classification always includes pes, subpes, chnl
+    # work on row positions: columns are filled at once at the end
+    nrxns = len(mech_df.index)
+    subpes_col = numpy.full(nrxns, numpy.nan, dtype=object)
+    chnl_col = numpy.full(nrxns, numpy.nan, dtype=object)
+    chnl_tuple_col = numpy.full(nrxns, numpy.nan, dtype=object)
+    rct_names_lst = mech_df['rct_names_lst'].values
+    prd_names_lst = mech_df['prd_names_lst'].values
+    rxn_names = mech_df['rxn_names'].values
+
+    for pes_pos in mech_df.groupby('pes').indices.values():
+        idx_start = 0
+        # Set the names lists for the rxns and species needed below
+        pes_pos = pes_pos[_argsort_names(rxn_names[pes_pos])]
+        connchnls = pes.find_conn_chnls(
+            rct_names_lst[pes_pos], prd_names_lst[pes_pos], pes_pos)
+        # Write subpes, channel index and channel tuple of each rxn
+        for key, value in connchnls.items():
+            # reorder by rxn name before assigning the channel index
+            chnl_pos = pes_pos[value]
+            chnl_pos = chnl_pos[_argsort_names(
+                rxn_names[chnl_pos], ascending=False)]
+            for chnl_idx, pos in enumerate(chnl_pos):
+                subpes_col[pos] = key+1
+                chnl_col[pos] = chnl_idx+idx_start+1
+                chnl_tuple_col[pos] = (
+                    chnl_idx+idx_start, (rct_names_lst[pos], prd_names_lst[pos]))
+
+            idx_start += len(chnl_pos)
+
+    chn_df = pd.DataFrame(
+        {'subpes': subpes_col, 'chnl': chnl_col,
+         'pes_chnl_tuple': chnl_tuple_col},
+        index=mech_df.index, dtype=object)
+
+    return chn_df
+
+
+def _argsort_names(rxn_names, ascending=True):
+    """ Sorting indices of reaction names, with the same order of ties as
+        DataFrame.sort_values(by=['rxn_names'])
+    """
+    if ascending:
+        return rxn_names.argsort(kind='quicksort')
+    rev_idx = rxn_names[::-1].argsort(kind='quicksort')
+
+    return (len(rxn_names)-1-rev_idx)[::-1]
+
+
+def names_csr(names_lst, spc_idx):
+    """ Interns the species of a list of reaction sides (reactants or
+        products) to CSR-style integer arrays
+
+    :param names_lst: species names of each reaction side
+    :type names_lst: list[tuple(str)]
+    :param spc_idx: integer id of each species name
+    :type spc_idx: dict[str: int]
+
+    :returns: ptr, ids: the species ids of side i are ids[ptr[i]:ptr[i+1]]
+    :rtype: numpy.ndarray, numpy.ndarray
+    """
+    ptr = numpy.zeros(len(names_lst)+1, dtype=int)
+    numpy.cumsum(list(map(len, names_lst)), out=ptr[1:])
+    ids = numpy.fromiter(
+        (spc_idx[name] for names in names_lst for name in names),
+        dtype=int, count=ptr[-1])
+
+    return ptr, ids
+
+
+def csr_append(csr, new_csr):
+    """ Appends reaction sides at the end of CSR arrays
+
+    :param csr: CSR arrays (ptr, ids) of the reaction sides
+    :type csr: tuple(numpy.ndarray, numpy.ndarray)
+    :param new_csr: CSR arrays (ptr, ids) of the new reaction sides
+    :type new_csr: tuple(numpy.ndarray, numpy.ndarray)
+
+    :returns: ptr, ids of all the reaction sides
+    :rtype: numpy.ndarray, numpy.ndarray
+    """
+    ptr, ids = csr
+    new_ptr, new_ids = new_csr
+
+    return (numpy.concatenate((ptr, new_ptr[1:] + ptr[-1])),
+            numpy.concatenate((ids, new_ids)))
+
+
+def csr_count(csr, spc_mask):
+    """ Counts the species of each reaction side that are in a mask
+
+    :param csr: CSR arrays (ptr, ids) of the reaction sides
+    :type csr: tuple(numpy.ndarray, numpy.ndarray)
+    :param spc_mask: selected species, indexed by species id
+    :type spc_mask: numpy.ndarray(bool)
+
+    :returns: number of selected species in each reaction side
+    :rtype: numpy.ndarray(int)
+    """
+    ptr, ids = csr
+    nsides = len(ptr)-1
+    rows = numpy.repeat(numpy.arange(nsides), numpy.diff(ptr))
+
+    return numpy.bincount(
+        rows[spc_mask[ids]], minlength=nsides)
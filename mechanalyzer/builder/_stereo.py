@@ -4,12 +4,14 @@
     maybe remove all inchis that are not incomplete?
 """
 import os
+import shelve
+import functools
+import multiprocessing
 import itertools as it
 from copy import deepcopy
 
 import automol
 from chemkin_io.writer._util import format_rxn_name
-from autorun import execute_function_in_parallel
 import mechanalyzer.parser
 from mechanalyzer.builder._update import update_spc_dct_from_reactions
 from mechanalyzer.builder._update import update_rxn_dct
@@ -18,72 +20,122 @@ from mechanalyzer.builder._names import rxn_name_str
 
 # MAIN CALLABLE
 def expand_mech_stereo(inp_mech_rxn_dct, inp_mech_spc_dct, nprocs='auto',
-                       enant=True):
+                       enant=True, cache_path=None):
     """ Build list of stereochemistry to reactions
 
+        The reactions of all PESs are expanded by a single pool of worker
+        processes, most expensive (most stereo centers) first. Reactions
+        that are the same without stereo are only expanded once.
+
         :param enant: Include all enantiomers? Otherwise, includes only
             canonical enantiomer species and reactions.
         :type enant: bool
+        :param cache_path: file for an on-disk cache of the expansions of
+            each reaction, keyed by its InChIs without stereo, so that
+            re-expanding an edited mechanism only expands the new reactions
+        :type cache_path: str
 
         Currently, we assume that the species in them mech_spc_dct have
         stereochemistry already added to them.
     """
 
-    def _expand(name_ich_dct, rxns, output_queue):
-        """ Expand reactons
-        """
-        # First loop over all reactions to add stereo
-        all_ste_rxns = []
-        for rxn in rxns:
-
-            log1 = f'\nExpanding Stereo for Reaction: {format_rxn_name(rxn)}\n'
-            print(log1)
-
-            # Reformat reaction to use InChI instead of mechanism name
-            # Split thrdbdy off, not needed for stereo code, add back later
-            rxn_ich = _rxn_name_to_ich(rxn, name_ich_dct)
-            _rxn_ich = (rxn_ich[0], rxn_ich[1])
-            thrdbdy = rxn_ich[2]
-
-            # Build list of all stereochemically allowed versions of reaction
-            ste_rxns_lst, log2 = _ste_rxn_lsts(_rxn_ich, enant=enant)
-            print(log2)
-            # Appropriately format the reactions with third body
-            ste_rxns_lst = _add_third(ste_rxns_lst, thrdbdy)
-            all_ste_rxns.append(ste_rxns_lst)
-        output_queue.put(tuple(all_ste_rxns))
-        print(f'Processor {os.getpid()} finished')
-
     # Dictionaries to map name to inchi
     name_ich_dct = mechanalyzer.parser.spc.name_inchi_dct(inp_mech_spc_dct)
 
     # Generate all stereo reactons from the initial set
     rxns = tuple(inp_mech_rxn_dct.keys())
-    args = (name_ich_dct,)
     pes_noste_rxns_dct = _rxns_noste_pes_dct(rxns, name_ich_dct)
-    all_ste_rxns = ()
 
-    # Loop over the PES (stoich similar)
-    forms = list(pes_noste_rxns_dct.keys())
-    # ste_rxn_cnt = 0
-    for formula in forms:
-        noste_rxns_dct = pes_noste_rxns_dct[formula]
+    # Loop over the PES (stoich similar) and ccs (connected channels) to
+    # gather the reactions of all PESs in order
+    ordered_rxns = []
+    for formula, noste_rxns_dct in pes_noste_rxns_dct.items():
         print('PES: {} has {:g} reactions'.format(
             formula, len(noste_rxns_dct.keys())))
-        pes_gra, ccs_dct = _pes_gra(noste_rxns_dct)
-        # Loop over ccs (connected channels)
-        for _, rxns in ccs_dct.items():
-            args = (name_ich_dct,)
-            ste_rxns = [
-                key for key, val in noste_rxns_dct.items() if val in rxns]
-            # expand each reaction to all valid stoich versions
-            ste_rxns = execute_function_in_parallel(
-                _expand, ste_rxns, args, nprocs=nprocs)
-            for rxn_lst in ste_rxns:
-                all_ste_rxns += rxn_lst
+        _, ccs_dct = _pes_gra(noste_rxns_dct)
+        for _, ccs_rxns in ccs_dct.items():
+            ordered_rxns.extend(
+                key for key, val in noste_rxns_dct.items() if val in ccs_rxns)
+
+    # Reformat reactions to use InChI instead of mechanism name
+    rxn_ich_dct = {rxn: _rxn_name_to_ich(rxn, name_ich_dct)
+                   for rxn in ordered_rxns}
+
+    # Expand each reaction to all valid stereo versions
+    ste_rxn_lsts_dct = _expand_rxn_ichs(
+        tuple((rxn_ich[0], rxn_ich[1]) for rxn_ich in rxn_ich_dct.values()),
+        enant=enant, nprocs=nprocs, cache_path=cache_path)
+
+    all_ste_rxns = ()
+    for rxn, rxn_ich in rxn_ich_dct.items():
+        log1 = f'\nExpanding Stereo for Reaction: {format_rxn_name(rxn)}\n'
+        print(log1)
+
+        # Thrdbdy was split off, not needed for stereo code, add back now
+        ste_rxns_lst, log2 = ste_rxn_lsts_dct[(rxn_ich[0], rxn_ich[1])]
+        print(log2)
+        all_ste_rxns += (_add_third(ste_rxns_lst, rxn_ich[2]),)
+
     return all_ste_rxns
 
 
+def _expand_rxn_ichs(rxn_ichs, enant=True, nprocs='auto', cache_path=None):
+    """ Run _ste_rxn_lsts for a set of reactions written with InChIs
+
+        Reactions are keyed by their InChIs without stereo (see
+        _noste_rxn_ichs); each key is expanded once, either read from the
+        on-disk cache or computed by a pool of processes that lives for the
+        whole set, with the most stereo centers handed out first.
+
+        :return ste_rxn_lsts_dct: output of _ste_rxn_lsts for each reaction
+        :rtype: dict {(rct_ichs, prd_ichs): (ste_rxn_ichs, log)}
+    """
+
+    # Keep one reaction per key, with the estimated cost of the expansion
+    key_dct = {rxn_ich: _noste_rxn_ichs(rxn_ich) for rxn_ich in rxn_ichs}
+    todo_dct = {}
+    for rxn_ich, key in key_dct.items():
+        cost = sum(_stereo_center_count(ich)
+                   for ich in rxn_ich[0] + rxn_ich[1])
+        if key not in todo_dct or cost > todo_dct[key][1]:
+            todo_dct[key] = (rxn_ich, cost)
+
+    expanded_dct = {}
+    cache = shelve.open(cache_path) if cache_path is not None else {}
+    try:
+        # Read previously expanded reactions
+        for key in tuple(todo_dct):
+            cache_key = repr((key, enant))
+            if cache_key in cache:
+                expanded_dct[key] = cache[cache_key]
+                todo_dct.pop(key)
+
+        # Expand the rest, most expensive first
+        keys = sorted(todo_dct, key=lambda key: todo_dct[key][1],
+                      reverse=True)
+        todo_rxn_ichs = tuple(todo_dct[key][0] for key in keys)
+        expand = functools.partial(_ste_rxn_lsts, enant=enant)
+        if nprocs == 'auto':
+            nprocs = os.cpu_count()
+        if nprocs == 1 or len(todo_rxn_ichs) < 2:
+            results = map(expand, todo_rxn_ichs)
+            for key, result in zip(keys, results):
+                expanded_dct[key] = cache[repr((key, enant))] = result
+        else:
+            with multiprocessing.Pool(min(nprocs, len(todo_rxn_ichs))) as pool:
+                results = pool.imap(expand, todo_rxn_ichs, chunksize=1)
+                for key, result in zip(keys, results):
+                    expanded_dct[key] = cache[repr((key, enant))] = result
+    finally:
+        if cache_path is not None:
+            cache.close()
+
+    ste_rxn_lsts_dct = {rxn_ich: expanded_dct[key]
+                        for rxn_ich, key in key_dct.items()}
+
+    return ste_rxn_lsts_dct
+
+
 def expand_mech_stereo_debug(inp_mech_rxn_dct, inp_mech_spc_dct, enant=True):
     """ Build list of stereochemistry to reactions
 
@@ -151,22 +203,15 @@ def valid_enantiomerically(ste_mech_spc_dct):
     """ are there NOT enantiomeric species in this reaction list
     """
     rule_out = False
-    for spc_name_i, spc_name_j in list(
-            it.combinations(ste_mech_spc_dct.keys(), 2)):
-        no_ste_ich_i = automol.chi.standard_form(
-            ste_mech_spc_dct[spc_name_i]['inchi'], stereo=False)
-        no_ste_ich_j = automol.chi.standard_form(
-            ste_mech_spc_dct[spc_name_j]['inchi'], stereo=False)
-        if no_ste_ich_i == no_ste_ich_j:
-            if automol.chi.are_enantiomers(
-                    ste_mech_spc_dct[spc_name_i]['inchi'],
-                    ste_mech_spc_dct[spc_name_j]['inchi']):
-                print(
-                    'ruling out because',
-                    ste_mech_spc_dct[spc_name_i]['inchi'],
-                    ste_mech_spc_dct[spc_name_j]['inchi'])
-                rule_out = True
-                break
+    ichs = [spc_dct['inchi'] for spc_dct in ste_mech_spc_dct.values()]
+    ent_idx = _enant_index(ichs)
+    ich_ids = set(ent_idx[ich][0] for ich in ichs)
+    for ich in ichs:
+        ich_id, ent_id, _, _ = ent_idx[ich]
+        if ent_id != ich_id and ent_id in ich_ids:
+            print('ruling out because', ich, automol.chi.reflect(ich))
+            rule_out = True
+            break
     return rule_out is False
 
 
@@ -212,42 +257,41 @@ def _is_ste_conn(rxn, rxn_lst, prev_rxns_lst):
     return i_is_conn or j_is_conn or prev_rxns_lst == ['fake']
 
 
-def _missed_rxn(rxn, rxn_lst, ignore_rxns):
-    """ Are to rxns connected stereochemically?
+def _enant_index(ichs):
+    """ Index of the enantiomers of a set of species, built once so that
+        later checks are integer comparisons instead of InChI operations:
+        ich: (ich_id, ent_id, cls_id, is_enant), with ent_id the id of its
+        enantiomer (its own id if it has none), cls_id the smaller id of the
+        enantiomer pair and is_enant from automol.inchi.is_enantiomer;
+        enantiomers missing from ichs are added to the index
     """
-    all_pes_ichs = []
-    ichsi, ichsj, _ = rxn
-    enant_rxns = []
-    for rxn_i in ignore_rxns:
-        enant_rxns.append(_enant_rxn(rxn_i))
-    enant_spcs = [ich for ich in rxn_i[:2] for rxn_i in enant_rxns]
-    i_is_conn = False
-    j_is_conn = False
-    for rxn_i in rxn_lst:
-        if rxn_i not in ignore_rxns:
-            ichs1, ichs2, _ = rxn_i
-            if not any(ich in enant_spcs for ich in ichs1 + ichs2):
-                all_pes_ichs.append(
-                    [ichs for ichs in ichs1 + ichs2])# if automol.inchi.is_enantiomer(ichs1)])
-    if ichsi in all_pes_ichs:
-        i_is_conn = True
-    if ichsj in all_pes_ichs:
-        j_is_conn = True
-    return i_is_conn or j_is_conn
+    ent_idx = {}
+    for ich in ichs:
+        if ich in ent_idx:
+            continue
+        ich_id = len(ent_idx)
+        is_enant = automol.inchi.is_enantiomer(ich)
+        ent_ich = automol.chi.reflect(ich)
+        if ent_ich == ich:
+            ent_idx[ich] = (ich_id, ich_id, ich_id, is_enant)
+        else:
+            ent_idx[ich] = (ich_id, ich_id + 1, ich_id, is_enant)
+            ent_idx[ent_ich] = (ich_id + 1, ich_id, ich_id, is_enant)
+    return ent_idx
 
 
-def _enant_rxn(rxn_i):
-    """ Returns the enantiomer of a reaction,
-        uses None if there is no enantiomer
+def _rxn_ids(rxn, ent_idx):
+    """ Reactants and products of a reaction as species ids, and those of its
+        enantiomer (None for a side that is its own enantiomer)
     """
-    check_ent = [
-        tuple(map(automol.chi.reflect, ichs)) for ichs in rxn_i[:-1]]
-    if check_ent[0] == rxn_i[0]:
-        check_ent[0] = None
-    if check_ent[1] == rxn_i[1]:
-        check_ent[1] = None
-    check_ent.append(rxn_i[-1])
-    return check_ent
+    sides = tuple(
+        tuple(ent_idx[ich][0] for ich in ichs) for ichs in rxn[:2])
+    ent_sides = tuple(
+        tuple(ent_idx[ich][1] for ich in ichs) for ichs in rxn[:2])
+    ent_sides = tuple(
+        None if ent_side == side else ent_side
+        for side, ent_side in zip(sides, ent_sides))
+    return sides, ent_sides
 
 
 def _split_ste_ccs(ccs_rxn_gra):
@@ -255,48 +299,41 @@ def _split_ste_ccs(ccs_rxn_gra):
         where a numeric index is a key and a
         list of stereo-reactions (in ichs) is val
     """
-    def _get_best_combo(exp_rxns_lst, maxcombo=None):
+    def _get_best_combo(exp_rxns_lst):
+        """ largest sets of stereo-expansions without enantiomeric
+            reactions, each completed with the non-enantiomeric expansions
+        """
         nonste_rxns_lst = ()
         ste_rxns_lst = ()
-        for rxn in exp_rxns_lst:
-            enantiomer = False
-            for ich in rxn[0] + rxn[1]:
-                if automol.inchi.is_enantiomer(ich):
-                    enantiomer = True
-            if enantiomer:
+        for rxn in sorted(exp_rxns_lst, key=str):
+            if any(ent_idx[ich][3] for ich in rxn[0] + rxn[1]):
                 ste_rxns_lst += (rxn,)
             else:
                 nonste_rxns_lst += (rxn,)
-        rxn_combos = (0)
-        if maxcombo is None:
-            maxcombo = len(ste_rxns_lst)
-        if maxcombo > 10 and maxcombo < 15:
-            maxcombo = 12
-        elif maxcombo > 14:
-            maxcombo = 5
-        print('setting r max', maxcombo)
-        #for r in range(1, maxcombo+1, 1):# if len(ste_rxns_lst) % 6 == 0 else 2):
-        for r in range(1, maxcombo, 1):# if  len(ste_rxns_lst) % 6 == 0 or len(ste_rxns_lst)==16 else 2):
-            if rxn_combos == ():
-                break
-            print('combining r=', r)
-            last_combo = deepcopy(rxn_combos)
-            rxn_combos = ()
-            for rxn_combo in it.combinations(ste_rxns_lst, r):
-                good_combo = True
-                for rxn_i in rxn_combo:
-                    check_ent = _enant_rxn(rxn_i)
-                    if _is_ste_conn(check_ent, rxn_combo, []):
-                        good_combo = False
-                        break
-                    if _missed_rxn(rxn_i, ste_rxns_lst, rxn_combo):
-                        good_combo = False
-                        break
-                if good_combo:
-                    rxn_combos += (rxn_combo,)
-        if rxn_combos != () and r < 4:
-            last_combo = deepcopy(rxn_combos)
-        return (combo + nonste_rxns_lst for combo in last_combo)
+
+        # a reaction cannot share a set with another one that connects to
+        # its enantiomer (or with itself, if it connects to its own)
+        ids_lst = [rxn_ids_dct[rxn] for rxn in ste_rxns_lst]
+        ste_idxs = [
+            idx for idx, (sides, ent_sides) in enumerate(ids_lst)
+            if not set(ent_sides) & set(sides)]
+        nbr_bits = [0] * len(ste_idxs)
+        for (nidx_i, idx_i), (nidx_j, idx_j) in it.combinations(
+                enumerate(ste_idxs), 2):
+            sides_i, ent_sides_i = ids_lst[idx_i]
+            sides_j, ent_sides_j = ids_lst[idx_j]
+            if not (set(ent_sides_i) & set(sides_j) or
+                    set(ent_sides_j) & set(sides_i)):
+                nbr_bits[nidx_i] |= 1 << nidx_j
+                nbr_bits[nidx_j] |= 1 << nidx_i
+        cliques = _max_cliques(nbr_bits)
+        max_size = max(len(clique) for clique in cliques)
+        print(f'{len(ste_rxns_lst)} stereo-expansions give sets of',
+              max_size)
+        return tuple(
+            tuple(ste_rxns_lst[ste_idxs[nidx]] for nidx in clique)
+            + nonste_rxns_lst
+            for clique in cliques if len(clique) == max_size)
 
     def _recursive_step(
             noste_rxn, ccs_rxn_gra, old_sccs_rxn_gra,
@@ -311,8 +348,7 @@ def _split_ste_ccs(ccs_rxn_gra):
             'next reaction in ccs has {:g} expansions'.format(len(exp_rxns_lst)))
         sccs_rxn_gra = {}
 
-        maxcombo=None
-        best_combos = _get_best_combo(exp_rxns_lst, maxcombo=maxcombo)
+        best_combos = _get_best_combo(exp_rxns_lst)
         print("WHAT")
         for rxn_set in  best_combos:
             print('rxn set', rxn_set)
@@ -325,19 +361,13 @@ def _split_ste_ccs(ccs_rxn_gra):
                             rxn_i, old_sccs_rxn_gra[idx], prev_rxn_lst)
                         for rxn_i in rxn_set):
                     continue
-                combo_allowed = True
-                for rxn_i in rxn_set:
-                    # check if this stereo-rxn is connected to the sccs
-                    # if _is_ste_conn(rxn_i, old_sccs_rxn_gra[idx], prev_rxn_lst):
-                    if True:
-                        check_ent = _enant_rxn(rxn_i)
-                        # check if this rxns enantiomers are also in the sccs
-                        if _is_ste_conn(check_ent, old_sccs_rxn_gra[idx], []):
-                            combo_allowed = False
-                            break
-                    else:
-                        combo_allowed = False
-                        break
+                # check if this set's enantiomers are also in the sccs
+                sccs_sides = set(
+                    side for rxn_i in old_sccs_rxn_gra[idx]
+                    for side in rxn_ids_dct[rxn_i][0])
+                combo_allowed = not any(
+                    set(rxn_ids_dct[rxn_i][1]) & sccs_sides
+                    for rxn_i in rxn_set)
                 if combo_allowed:
                     sccs_rxn_gra[len(sccs_rxn_gra)] = deepcopy(old_sccs_rxn_gra[idx]) + rxn_set
                     is_new_stereo = False
@@ -362,55 +392,6 @@ def _split_ste_ccs(ccs_rxn_gra):
                     considered_rxns, exp_rxns_lst)
         return sccs_rxn_gra, considered_rxns
 
-    def _find_allowed_sccs_combos(sccs_rxn_gra, spc_key_dct, idxs_lst, output_queue):
-        combo_lst = ()
-        for (idx_i, idx_j) in idxs_lst:
-            rxns_i = sccs_rxn_gra[idx_i]
-            rxns_j = sccs_rxn_gra[idx_j]
-            connects = False
-            enantiomeric = False
-            spcs = spc_key_dct[idx_i] + spc_key_dct[idx_j]
-            spcs = list(set(spcs))
-            for spc_a, spc_b in it.combinations(spcs, 2):
-                if automol.inchi.are_enantiomers(spc_a, spc_b):
-                    enantiomeric = True
-                    break
-            if enantiomeric:
-                continue
-            connects = True
-            # for rxn_i in rxns_i:
-            #     if _is_ste_conn(rxn_i, rxns_j, []):
-            #         connects = True
-            #         break
-            if connects:
-                print('combo attempt', idx_i, idx_j)
-                combo_lst += ((idx_i, idx_j,),)
-        output_queue.put(combo_lst)
-    def _check_combo_grps(combo_set, combo_idxs_grp_lst, output_queue):
-        full_combo_lst = ()
-        for combo_idxs_lst in combo_idxs_grp_lst:
-            #all_idxs = sorted(list(set(sum(combo_idxs_lst, ()))))
-            all_idxs = list(combo_idxs_lst)
-            print(all_idxs)
-            if any(check_idxs not in combo_set for check_idxs in it.combinations(all_idxs, 2)):
-                continue
-            else:
-                full_combo_lst += (tuple(all_idxs),)
-        output_queue.put(full_combo_lst)
-    def _add_idx_to_combo(combo_set, grp_idxs_lst, idxs, output_queue): 
-        added_idxs_lst = ()
-        print('idxs', idxs)
-        for idx_i in idxs:
-            print('doing idx_i', idx_i)
-            for grp_idxs in grp_idxs_lst:
-                if idx_i in grp_idxs:
-                    continue
-                all_idxs = sorted([idx_i, *grp_idxs])
-                if any(check_idxs not in combo_set for check_idxs in it.combinations(all_idxs, 2)):
-                    continue
-                else:
-                    added_idxs_lst += (tuple(all_idxs),)
-        output_queue.put(added_idxs_lst)
     def _combine_sccss(sccs_rxn_gra, idxs_lst):
         new_sccs_rxn_gra = {}
         for i, idxs in enumerate(idxs_lst):
@@ -419,6 +400,14 @@ def _split_ste_ccs(ccs_rxn_gra):
                 rxns += sccs_rxn_gra[idx]
             new_sccs_rxn_gra[i] = tuple(set(rxns))
         return new_sccs_rxn_gra
+
+    # index the enantiomers of all species and reactions of the ccs once
+    all_rxns = set(
+        rxn for _, exp_rxns in ccs_rxn_gra.values() for rxn in exp_rxns)
+    ent_idx = _enant_index(sorted(set(
+        ich for rxn in all_rxns for ich in rxn[0] + rxn[1])))
+    rxn_ids_dct = {rxn: _rxn_ids(rxn, ent_idx) for rxn in all_rxns}
+
     # initialize
     considered_rxns = []
 
@@ -447,7 +436,7 @@ def _split_ste_ccs(ccs_rxn_gra):
         print(erxn)
     considered_rxns.append(start_key)
     sccs_rxn_gra = {}
-    for idx, rxn_set in enumerate(_get_best_combo(exp_rxns_lst)):#, maxcombo=3)):
+    for idx, rxn_set in enumerate(_get_best_combo(exp_rxns_lst)):
         sccs_rxn_gra[idx] = rxn_set
 
     print('resulting in the following set of sccss')
@@ -499,186 +488,15 @@ def _split_ste_ccs(ccs_rxn_gra):
             spcs.extend([prd for prd in prds if prd not in spcs])
         spc_key_dct[idx] = spcs
 
-    # make all possible combinations of sub_sccs
-    # print('len of r=10', sum(1 for i in it.combinations(sccs_idxs_i, 10)))
-    # print('len of r=9', sum(1 for i in it.combinations(sccs_idxs_i, 9)))
-    # print('len of r=8', sum(1 for i in it.combinations(sccs_idxs_i, 8)))
-    # print('len of r=7', sum(1 for i in it.combinations(sccs_idxs_i, 7)))
-    #print('len of r=4', sum(1 for i in it.combinations(sccs_idxs_i, 4)))
-    #print('len of r=3', sum(1 for i in it.combinations(sccs_idxs_i, 3)))
+    # combine the sccss into maximal sets without enantiomeric species
     sccs_idxs_i = list(sccs_rxn_gra.keys())
-    idxs_lst = list(it.combinations(sccs_idxs_i, 2))
-    args = (sccs_rxn_gra, spc_key_dct)
-    allowed_combo_lst = execute_function_in_parallel(
-        _find_allowed_sccs_combos, idxs_lst, args, nprocs=30)
-    #two_idxs_lst = ()
-    #for (two_idxs, rxn_lst, spcs) in new_sccs_rxn_lst:
-    #    two_idxs = tuple(sorted(two_idxs))
-    #    two_idxs_lst += (two_idxs,)
-    #    sccs_rxn_gra[two_idxs] = rxn_lst
-    #    spc_key_dct[two_idxs] = spcs
-    #enant_lst = [idxs for idxs in idxs_lst if idxs not in two_idxs_lst]
-    # enant_lst = set(idxs_lst) - set(two_idxs_lst)
-    # three_idxs_lst = ()
-    # for idx_i in sccs_idxs_i:
-    #     for (idx_j, idx_k) in two_idxs_lst:
-    #         if idx_i == idx_j and idx_i == idx_k:
-    #             continue
-    #         if tuple(sorted((idx_i, idx_j,))) in enant_lst:
-    #             continue
-    #         if tuple(sorted((idx_i, idx_k,))) in enant_lst:
-    #             continue
-    #     three_idxs_lst += ((idx_i, (idx_j, idx_k,),),)
-    # print('three idxs', len(three_idxs_lst), three_idxs_lst)
-    # args = (sccs_rxn_gra, spc_key_dct)
-    # new_sccs_rxn_lst = execute_function_in_parallel(
-    #     _combine_sccss, three_idxs_lst, args, nprocs=30)
-    print('all combo list len', len(allowed_combo_lst))
-    full_combo_lst = ()
-    combo_set = frozenset(allowed_combo_lst)
-    allow_combo_dct = {}
-    for idx in sccs_idxs_i:
-       allow_combo_dct[idx] = []
-       for idx_i, idx_j in combo_set:
-            if idx_i == idx:
-                allow_combo_dct[idx] += [idx_j]
-            elif idx_j == idx:
-                allow_combo_dct[idx] += [idx_i]
-    print('hi', allow_combo_dct)
-   
-    all_best_combos = ()
-    for idx in allow_combo_dct:
-        allow_idxs = allow_combo_dct[idx]
-        allow_idxs = [allow_idx for allow_idx in allow_idxs if allow_idx > idx]
-        print(idx, allow_idxs)
-        better_r =  True
-        if idx < 10:
-            new_best_combos = ()
-            for r in range(2, 8):#len(allow_idxs)):
-                if not better_r:
-                    break
-                better_r = False
-                best_combos = deepcopy(new_best_combos)
-                new_best_combos = ()
-                print('trying r of', r)
-                combo_idxs_lst = it.combinations(allow_idxs, r)
-                for combo_idxs in combo_idxs_lst:
-                    all_idxs = sorted(combo_idxs)
-                    if any(check_idxs not in combo_set for check_idxs in it.combinations(all_idxs, 2)):
-                        continue
-                    else:
-                        better_r = True
-                        new_best_combos += ((idx,) + tuple(all_idxs),)
-        else:
-            best_combos = ()
-            combo_idxs_lst = it.combinations(allow_idxs, r)
-            for combo_idxs in combo_idxs_lst:
-                all_idxs = sorted(combo_idxs)
-                if any(check_idxs not in combo_set for check_idxs in it.combinations(all_idxs, 2)):
-                    continue
-                else:
-                    better_r = True
-                    best_combos += ((idx,) + tuple(all_idxs),)
-        all_best_combos += best_combos    
-        print('best idxs', idx, best_combos) 
-
-
-
-    #combo_idxs_grp_lst = list(it.combinations(allowed_combo_lst, 3))
-    # combo_idxs_grp_lst = list(it.combinations(sccs_idxs_i, 3))
-    # print('checking combo groups for r=3', len(combo_idxs_grp_lst))
-    # args = (combo_set,)
-    # full_combo_lst = execute_function_in_parallel(
-    #     _check_combo_grps, combo_idxs_grp_lst, args, nprocs=30)
-    # three_idxs_lst = ()
-    # args = (combo_set, combo_set,)
-    # print(sccs_idxs_i)
-    # three_idxs_lst = execute_function_in_parallel(
-    #     _add_idx_to_combo, sccs_idxs_i, args, nprocs=30)
-    # print('check length', len(three_idxs_lst))
-    # args = (combo_set, three_idxs_lst,)
-    # more_idxs_lst = execute_function_in_parallel(
-    #     _add_idx_to_combo, sccs_idxs_i, args, nprocs=30)
-    # print('check length', len(more_idxs_lst))
-    # args = (combo_set, more_idxs_lst,)
-    # more_idxs_lst = execute_function_in_parallel(
-    #     _add_idx_to_combo, sccs_idxs_i, args, nprocs=30)
-    # print('check length', len(more_idxs_lst))
-    # args = (combo_set, more_idxs_lst,)
-    # more_idxs_lst = execute_function_in_parallel(
-    #     _add_idx_to_combo, sccs_idxs_i, args, nprocs=30)
-    # print('check length', len(more_idxs_lst))
-    # #for idx_k in sccs_idxs_i:
-    # #    print('doing 3s for ', idx_k)
-    # #    for idx_i, idx_j in combo_set:
-    # #        if idx_i == idx_j and idx_i == idx_k:
-    # #            continue
-    # #        if not tuple(sorted((idx_i, idx_k,))) in combo_set:
-    # #            continue
-    # #        if not tuple(sorted((idx_j, idx_k,))) in combo_set:
-    # #            continue
-    # #        three_idxs_lst += ((idx_i, idx_j, idx_k,),)
-    # #four_idxs_lst = ()
-    # #for idx_l in sccs_idxs_i:
-    # #    print('doing 4s for ', idx_l)
-    # #    for idx_i, idx_j, idx_k in three_idxs_lst:
-    # #        if idx_l in [idx_i, idx_j, idx_k]:
-    # #            continue
-    # #        all_idxs = sorted([idx_i, idx_j, idx_k, idx_l])
-    # #        if any(check_idxs not in combo_set for check_idxs in it.combinations(all_idxs, 2)):
-    # #            continue
-    # #        else:
-    # #            four_idxs_lst += (tuple(all_idxs),)
-    # #print('check length', len(four_idxs_lst))
-    #    
-    # #print(len(full_combo_lst))
-    more_idxs_lst = all_best_combos
+    nbr_bits = _sccs_compat_bits(
+        [spc_key_dct[idx] for idx in sccs_idxs_i], ent_idx)
+    cliques = _max_cliques(nbr_bits)
+    print(f'{len(sccs_idxs_i)} sccss combine into {len(cliques)} sets')
     sccs_rxn_gra = _combine_sccss(
-        sccs_rxn_gra, more_idxs_lst)
-    sccs_idxs_i = list(sccs_rxn_gra.keys())
-    idxs_lst = list(it.combinations(sccs_idxs_i, 2))
-    spc_key_dct = {}
-    for idx, rxns in sccs_rxn_gra.items():
-        print(idx, len(sccs_rxn_gra[idx]))
-        spcs = []
-        for rcts, prds, _ in rxns:
-            spcs.extend([rct for rct in rcts if rct not in spcs])
-            spcs.extend([prd for prd in prds if prd not in spcs])
-        spc_key_dct[idx] = spcs
-    # make all possible combinations of sub_sccs
-    args = (sccs_rxn_gra, spc_key_dct)
-    allowed_combo_lst = execute_function_in_parallel(
-        _find_allowed_sccs_combos, idxs_lst, args, nprocs=30)
-    print('any further combos?', allowed_combo_lst)
-    #two_idxs_lst = ()
-    #sccs_rxn_gra, full_combo_lst)
-    #print('parallel list')
-    #print(len(new_sccs_rxn_lst))
-    # for idx_i in sccs_idxs_i:
-    #     sccs_idxs_j = list(sccs_rxn_gra.keys())
-    #     for idx_j in sccs_idxs_j:
-    #         if idx_i >= idx_j:
-    #             continue
-    #         print('combo attempt', idx_i, idx_j)
-    #         connects = False
-    #         rxns_i = sccs_rxn_gra[idx_i]
-    #         rxns_j = sccs_rxn_gra[idx_j]
-    #         enantiomeric = False
-    #         spcs = spc_key_dct[idx_i] + spc_key_dct[idx_j]
-    #         for spc_a, spc_b in it.combinations(spcs, 2):
-    #             if automol.inchi.are_enantiomers(spc_a, spc_b):
-    #                 enantiomeric = True
-    #                 break
-    #         if enantiomeric:
-    #             continue
-    #         for rxn_i in rxns_i:
-    #             if _is_ste_conn(rxn_i, rxns_j, []):
-    #                 connects = True
-    #                 break
-    #         if connects:
-    #             print('new length', len(rxns_i + rxns_j))
-    #             sccs_rxn_gra[len(sccs_rxn_gra)] = tuple(set(sorted(rxns_i + rxns_j)))
-    #             spc_key_dct[len(sccs_rxn_gra)-1] = spc_key_dct[idx_i] + spc_key_dct[idx_j]
+        sccs_rxn_gra,
+        [tuple(sccs_idxs_i[nidx] for nidx in clique) for clique in cliques])
     print('BEST NUMBER OF SCCS')
     max_len = max([len(lst) for lst in sccs_rxn_gra.values()])
     keep_sccs_rxn_gra = {}
@@ -693,6 +511,72 @@ def _split_ste_ccs(ccs_rxn_gra):
     return keep_sccs_rxn_gra
 
 
+def _sccs_compat_bits(spcs_lst, ent_idx):
+    """ Compatibility graph of sccss: two sccss are neighbors if none of
+        their species are enantiomers of each other
+
+        :param spcs_lst: species (ichs) of each sccs
+        :type spcs_lst: list [list [str]]
+        :param ent_idx: enantiomer index of the species (see _enant_index)
+        :type ent_idx: dict
+        :return nbr_bits: neighbors of each sccs, as bitsets
+        :rtype: list [int]
+    """
+    # species and their enantiomers as bitsets of species ids
+    spc_bits = [0] * len(spcs_lst)
+    sccs_ent_bits = [0] * len(spcs_lst)
+    for idx, spcs in enumerate(spcs_lst):
+        for spc in spcs:
+            ich_id, ent_id, _, _ = ent_idx[spc]
+            spc_bits[idx] |= 1 << ich_id
+            if ent_id != ich_id:
+                sccs_ent_bits[idx] |= 1 << ent_id
+
+    nbr_bits = [0] * len(spcs_lst)
+    for idx_i, idx_j in it.combinations(range(len(spcs_lst)), 2):
+        if not ((spc_bits[idx_i] | spc_bits[idx_j]) &
+                (sccs_ent_bits[idx_i] | sccs_ent_bits[idx_j])):
+            nbr_bits[idx_i] |= 1 << idx_j
+            nbr_bits[idx_j] |= 1 << idx_i
+    return nbr_bits
+
+
+def _max_cliques(nbr_bits):
+    """ All maximal cliques of a graph, by Bron-Kerbosch with pivoting
+
+        :param nbr_bits: neighbors of each node, as bitsets
+        :type nbr_bits: list [int]
+        :return cliques: cliques as sorted node indices, sorted
+        :rtype: list [tuple [int]]
+    """
+    cliques = []
+
+    def _expand(clique, cands, excls):
+        if not cands and not excls:
+            cliques.append(tuple(sorted(clique)))
+            return
+        # skip the neighbors of the pivot: their cliques are found from it
+        pivot = max(
+            _bit_idxs(cands | excls),
+            key=lambda idx: bin(nbr_bits[idx] & cands).count('1'))
+        for idx in _bit_idxs(cands & ~nbr_bits[pivot]):
+            _expand(clique + (idx,), cands & nbr_bits[idx],
+                    excls & nbr_bits[idx])
+            cands &= ~(1 << idx)
+            excls |= 1 << idx
+
+    _expand((), (1 << len(nbr_bits)) - 1, 0)
+    return sorted(cliques)
+
+
+def _bit_idxs(bits):
+    """ indices of the set bits of an int, in increasing order
+    """
+    while bits:
+        low_bit = bits & -bits
+        yield low_bit.bit_length() - 1
+        bits ^= low_bit
+
 def _pes_gra(noste_rxn_dct):
     """ seperates a list of reactions into graphs
         pes_gra: graph of a reaction (key)
@@ -770,6 +654,28 @@ def _noste_rxn(rxn_ichs):
     return noste_rxn, form1, form2
 
 
+def _noste_rxn_ichs(rxn_ich):
+    """ InChIs of the reactants and products without stereo, in order
+    """
+    return (
+        tuple(automol.chi.standard_form(ich, stereo=False)
+              for ich in rxn_ich[0]),
+        tuple(automol.chi.standard_form(ich, stereo=False)
+              for ich in rxn_ich[1])
+    )
+
+
+def _stereo_center_count(ich):
+    """ Number of stereo atoms and bonds given in the layers of an InChI;
+        used as an estimate of the cost of a stereo expansion
+    """
+    count = 0
+    for layer in ich.split('/')[1:]:
+        if layer[:1] in ('b', 't') and len(layer) > 1:
+            count += len(layer[1:].split(','))
+    return count
+
+
 def _rxns_noste_pes_dct(rxns, name_ich_dct):
     """Dictionary of dictionaries for FORMULA: {origanalRXN: RXnwithoutstereo}
     """
@@ -995,17 +901,19 @@ def _diastereomer_sccs_idxs(sccs_rxn_dct_lst, ccs_sccs_spc_dct,
     # Loop through diastereomer S-CCSs (start w/ max overlap) & grab any S-CCS
     # that has a species that is not enantiomeric with chosen ichs
     # e.g., if R,R first, grab R,S dias then ignore S,S and S,R enantiomers
-    final_dias_sccs_idxs, final_dias_ich_lst = (), ()
+    final_dias_sccs_idxs, final_dias_ids = (), set()
+    ent_idx = _enant_index(
+        sorted(set(ich for dias_rxn in dias_rxn_lst for ich in dias_rxn)))
     for (ccs_idx, sccs_idx), dias_rxn in zip(dias_sccs_idxs, dias_rxn_lst):
         # Assess if any species in the reaction are enantiomers with the
         # the species we have chosen to maintain from all S-CCSs
         is_enant = False
         for dias_ich in dias_rxn:
-            if any(automol.chi.are_enantiomers(dias_ich, ich)
-                   for ich in final_dias_ich_lst):
+            ich_id, ent_id, _, _ = ent_idx[dias_ich]
+            if ent_id != ich_id and ent_id in final_dias_ids:
                 is_enant = True
             else:
-                final_dias_ich_lst += (dias_ich,)
+                final_dias_ids.add(ich_id)
 
         if not is_enant:
             final_dias_sccs_idxs += ((ccs_idx, sccs_idx),)
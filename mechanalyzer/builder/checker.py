@@ -1,8 +1,8 @@
 """ Check mechanisms for various flaws/inconsistencies
 """
 
-from collections import Counter as counter
 from chemkin_io.writer._util import format_rxn_name
+from mechanalyzer.builder import mech_index
 
 
 def run_all_checks(rxn_param_dct, rxn_ktp_dct, k_thresholds,
@@ -30,6 +30,8 @@ def run_all_checks(rxn_param_dct, rxn_ktp_dct, k_thresholds,
         return '\n' + '+' * 100 + '\n'
 
     total_str = separator()
+    # Species-to-reaction index shared by the species checks
+    mech_idx = mech_index.from_rxn_param_dct(rxn_param_dct)
 
     # Large rate constants
     large_rxn_ktp_dcts = get_large_kts(rxn_ktp_dct, k_thresholds)
@@ -53,19 +55,21 @@ def run_all_checks(rxn_param_dct, rxn_ktp_dct, k_thresholds,
     #total_str += separator()
 
     # Lone species
-    lone_spcs = get_lone_spcs(rxn_param_dct, rxn_num_threshold)
+    lone_spcs = get_lone_spcs(
+        rxn_param_dct, rxn_num_threshold, mech_idx=mech_idx)
     total_str += write_lone_spcs(lone_spcs, rxn_num_threshold)
     total_str += separator()
 
     # Sources and sinks
-    source_spcs, sink_spcs = get_sources_and_sinks(rxn_param_dct)
+    source_spcs, sink_spcs = get_sources_and_sinks(
+        rxn_param_dct, mech_idx=mech_idx)
     total_str += write_sources_and_sinks(source_spcs, sink_spcs)
     total_str += separator()
 
     return total_str
 
 
-def get_sources_and_sinks(rxn_param_dct):
+def get_sources_and_sinks(rxn_param_dct, mech_idx=None):
     """ Get species that only appear as reactants (sources) or
         only appear as products (sinks). Output sources and sinks and
         the reaction keys for all reactions in which each species
@@ -74,6 +78,9 @@ def get_sources_and_sinks(rxn_param_dct):
         :param rxn_param_dct: rate constant parameters for a mechanism
         :type rxn_param_dct: dct
             {rxn1: (param_tuple1, param_tuple2, ...), rxn2: ...}
+        :param mech_idx: species-to-reaction index of rxn_param_dct;
+            built if not given
+        :type mech_idx: mech_index.MechIndex
         :return source_species: species that only appear
             as reactants and associated reactions
         :rtype: dct {spc1: [rxn1, rxn2, ...], spc2: ...}
@@ -82,23 +89,19 @@ def get_sources_and_sinks(rxn_param_dct):
         :rtype: dct {spc1: [rxn1, rxn2, ...], spc2: ...}
     """
 
+    if mech_idx is None:
+        mech_idx = mech_index.from_rxn_param_dct(rxn_param_dct)
+
     # Get lists of source and sink species
     # Sorted to make the writer test succeed
-    all_rcts, all_prds = _get_rcts_prds(rxn_param_dct)
-    sources = sorted(list(set(all_rcts) - set(all_prds)))
-    sinks = sorted(list(set(all_prds) - set(all_rcts)))
+    sources = sorted(mech_idx.sources())
+    sinks = sorted(mech_idx.sinks())
 
     # Store the reaction name(s) for each source or sink species
-    source_spcs = {spc: [] for spc in sources}
-    sink_spcs = {spc: [] for spc in sinks}
-    for spc in sources:
-        for rxn in rxn_param_dct.keys():
-            if spc in rxn[0]:
-                source_spcs[spc].append(rxn)
-    for spc in sinks:
-        for rxn in rxn_param_dct.keys():
-            if spc in rxn[1]:
-                sink_spcs[spc].append(rxn)
+    source_spcs = {spc: mech_idx.get_rxns(mech_idx.rxn_idxs([spc], 'rcts'))
+                   for spc in sources}
+    sink_spcs = {spc: mech_idx.get_rxns(mech_idx.rxn_idxs([spc], 'prds'))
+                 for spc in sinks}
 
     return source_spcs, sink_spcs
 
@@ -172,7 +175,7 @@ def get_negative_kts(rxn_ktp_dct):
     return negative_rxn_ktp_dct
 
 
-def get_lone_spcs(rxn_param_dct, threshold):
+def get_lone_spcs(rxn_param_dct, threshold, mech_idx=None):
     """ Get species that are considered "lone" species based on only
         being included in a small number of reactions
         (the cutoff for which is set by threshold).
@@ -186,27 +189,24 @@ def get_lone_spcs(rxn_param_dct, threshold):
         :param threshold: number of reactions at and below which
             a species is considered "lone"
         :type threshold: int
+        :param mech_idx: species-to-reaction index of rxn_param_dct;
+            built if not given
+        :type mech_idx: mech_index.MechIndex
         :return lone_spcs: dictionary containing
             each lone species and its reactions
         :rtype: dct {lone_spc1: [rxn1, rxn2, ...], lone_spc2: ...}
 
     """
 
-    # Get the number of reactions that each species participates in
-    all_rcts, all_prds = _get_rcts_prds(rxn_param_dct)
-    spc_counts = dict(counter(all_rcts + all_prds))
+    if mech_idx is None:
+        mech_idx = mech_index.from_rxn_param_dct(rxn_param_dct)
 
-    # Filter by the threshold
+    # Filter by the number of reactions that each species participates in,
+    # and store the reaction name(s) for each lone species
     lone_spcs = {}
-    for spc, count in spc_counts.items():
-        if count <= threshold:
-            lone_spcs[spc] = []
-
-    # Store the reaction name(s) for each lone species
-    for spc, dct in lone_spcs.items():
-        for rxn in rxn_param_dct.keys():
-            if spc in rxn[0] or spc in rxn[1]:  # whether spc in prds or rcts
-                dct.append(rxn)
+    for spc in mech_idx.spcs():
+        if mech_idx.count(spc) <= threshold:
+            lone_spcs[spc] = mech_idx.get_rxns(mech_idx.rxn_idxs([spc]))
 
     return lone_spcs
 
@@ -600,29 +600,6 @@ def _write_rxn_ktp_dct(rxn_ktp_dct):
     return output_str
 
 
-def _get_rcts_prds(rxn_param_dct):
-    """ Gets lists of all reactants and products in a mechanism
-        (both lists may contain duplicates)
-
-    :param rxn_param_dct: rate constant parameters for a mechanism
-    :return all_rcts: all reactants in the mechanism
-    :rtype: list [rct1, rct2, ...]
-    :return all_prds: all products in the mechanism
-    :rtype: list [prd1, prd2, ...]
-    """
-
-    all_rcts = []
-    all_prds = []
-    for rxn in rxn_param_dct.keys():
-        rcts, prds, _ = rxn
-        for rct in rcts:
-            all_rcts.append(rct)
-        for prd in prds:
-            all_prds.append(prd)
-
-    return all_rcts, all_prds
-
-
 def get_molecularity(rxn):
     """ Get the molecularity of a reaction
 
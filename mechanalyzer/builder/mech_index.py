@@ -0,0 +1,110 @@
+"""
+  Inverted index of a mechanism: the reactions in which each species is a
+  reactant or a product
+
+  Reactions are referred to by their position in the mechanism. Species
+  queries (the reactions of a set of species, sources and sinks, ...)
+  are unions and intersections of these positions, and do not rescan the
+  reactions.
+"""
+
+
+class MechIndex:
+    """ Reactions of each species of a mechanism, as reactant and as
+        product
+
+        :param rxns: reactions, in the order of the mechanism
+        :type rxns: tuple(((rct1, rct2, ...), (prd1, prd2, ...), (thrdbdy,)))
+    """
+
+    def __init__(self, rxns):
+        self.rxns = tuple(rxns)
+        # {spc: [rxn_idx, ...]}, one entry per occurrence of spc
+        self.rct_rxns = {}
+        self.prd_rxns = {}
+        for idx, (rcts, prds, *_) in enumerate(self.rxns):
+            for rct in rcts:
+                self.rct_rxns.setdefault(rct, []).append(idx)
+            for prd in prds:
+                self.prd_rxns.setdefault(prd, []).append(idx)
+
+    def __len__(self):
+        return len(self.rxns)
+
+    def spcs(self):
+        """ Species of the mechanism, in order of first appearance among
+            all reactants, then among all products
+
+            :rtype: tuple(str)
+        """
+        return tuple(self.rct_rxns) + tuple(
+            spc for spc in self.prd_rxns if spc not in self.rct_rxns)
+
+    def sources(self):
+        """ Species that only appear as reactants
+
+            :rtype: set(str)
+        """
+        return set(self.rct_rxns) - set(self.prd_rxns)
+
+    def sinks(self):
+        """ Species that only appear as products
+
+            :rtype: set(str)
+        """
+        return set(self.prd_rxns) - set(self.rct_rxns)
+
+    def count(self, spc):
+        """ Number of times a species appears in the mechanism, as reactant
+            or product
+
+            :rtype: int
+        """
+        return (len(self.rct_rxns.get(spc, ())) +
+                len(self.prd_rxns.get(spc, ())))
+
+    def rxn_idxs(self, spcs, side=None):
+        """ Positions of the reactions in which any of the species is a
+            reactant (side='rcts'), a product (side='prds') or either
+            (side=None)
+
+            :param spcs: species names
+            :type spcs: iterable(str)
+            :rtype: set(int)
+        """
+
+        idxs = set()
+        for spc_rxns in self._side_dcts(side):
+            for spc in spcs:
+                idxs.update(spc_rxns.get(spc, ()))
+
+        return idxs
+
+    def get_rxns(self, idxs):
+        """ Reactions at a set of positions, in mechanism order
+
+            :rtype: list
+        """
+        return [self.rxns[idx] for idx in sorted(idxs)]
+
+    def _side_dcts(self, side):
+        """ Inverted maps of one side, or of both
+        """
+        assert side in (None, 'rcts', 'prds'), (
+            f'side must be None, rcts or prds, not {side}')
+        if side == 'rcts':
+            return (self.rct_rxns,)
+        if side == 'prds':
+            return (self.prd_rxns,)
+        return (self.rct_rxns, self.prd_rxns)
+
+
+def from_rxn_param_dct(rxn_param_dct):
+    """ Builds the index of the reactions of a rxn_param_dct (or of any
+        dictionary keyed by reactions)
+
+        :param rxn_param_dct: rate constant parameters for a mechanism
+        :type rxn_param_dct: dict {rxn: params}
+        :rtype: MechIndex
+    """
+    return MechIndex(rxn_param_dct.keys())
@@ -7,6 +7,7 @@ import numpy as np
 from automol import amchi
 from automol import inchi
 from automol import chi
+from mechanalyzer import cache
 from mechanalyzer.builder import strip_ste
 from mechanalyzer.calculator import compare
 from autoreact import params as params_module
@@ -168,7 +169,7 @@ def strip_mech_spc_dct(mech_spc_dct):
     for spc, spc_dct in copy.deepcopy(mech_spc_dct).items():
         orig_ich = spc_dct['inchi']
         # Remove stereo from the inchi (if present)  (false keeps it as AmChI)
-        strpd_ich = chi.without_stereo(orig_ich, reassess_amchi=False)
+        strpd_ich = cache.without_stereo(orig_ich, reassess_amchi=False)
         # Get the smiles and inchikey without stereo
         strpd_smi = chi.smiles(strpd_ich)
         strpd_ichkey = chi.inchi_key(strpd_ich)
@@ -3,6 +3,7 @@
 
 import itertools
 import automol
+from mechanalyzer import cache
 from mechanalyzer.builder._update import update_spc_dct_from_reactions
 from mechanalyzer.builder._update import update_rxn_dct
 from mechanalyzer.builder._stereo import _add_third
@@ -177,7 +178,7 @@ def _radicals(ich_lst, name_lst):
     """
     rad_ichs, rad_names = (), ()
     for ich, name in zip(ich_lst, name_lst):
-        if automol.graph.is_radical_species(automol.chi.graph(ich)):
+        if automol.graph.is_radical_species(cache.graph(ich)):
             rad_ichs += (ich,)
             rad_names += (name,)
 
@@ -7,6 +7,7 @@ import sys
 import numpy
 import pandas as pd
 import automol
+from mechanalyzer import cache
 from mechanalyzer.parser._util import get_mult
 from mechanalyzer.calculator import formulas
 
@@ -278,9 +279,7 @@ def classify_graph(spc_dct, rct_names, prd_names):
 
     if automol.form.reac.is_valid_reaction(rct_fmls, prd_fmls):
         try:
-            rxn_objs = automol.reac.from_chis(
-                rct_ichs, prd_ichs)
-            rxn_classes = tuple(automol.reac.class_(obj) for obj in rxn_objs)
+            rxn_classes = cache.cached_call(_rxn_classes, rct_ichs, prd_ichs)
         except AssertionError:
             rxn_classes = ('AssertionError', )
         except TypeError:
@@ -301,6 +300,13 @@ def classify_graph(spc_dct, rct_names, prd_names):
     return rclass
 
 
+def _rxn_classes(rct_ichs, prd_ichs):
+    """ classes of all reactions automol finds between reactants and products
+    """
+    rxn_objs = automol.reac.from_chis(rct_ichs, prd_ichs)
+    return tuple(automol.reac.class_(obj) for obj in rxn_objs)
+
+
 def classify_ws(subpes_df, elem_reac_df, species_subpes, rxn):
     """ classifies well skipping channels of a given subpes
         WARNING: STILL UNDER CONSTRUCTION - SOME TEMPORARY FEATURES
@@ -19,12 +19,15 @@ from mechanalyzer.builder import submech
 from mechanalyzer.builder import rxnclass
 from mechanalyzer.builder import connect_rxn_df
 from mechanalyzer.builder import add_wellskip
+from mechanalyzer.builder._sort_util import conn_chn_df
+from mechanalyzer.builder._sort_util import names_csr
+from mechanalyzer.builder._sort_util import csr_append
+from mechanalyzer.builder._sort_util import csr_count
 from mechanalyzer.calculator import rates as calc_rates
 from mechanalyzer.calculator import thermo
 from mechanalyzer.calculator.ene_partition import phi_equip_fromdct
 from mechanalyzer.calculator import nonboltz
 from mechanalyzer.calculator import ktp_util
-from mechanalyzer.parser import pes
 from mechanalyzer.parser.spc import name_inchi_dct
 from mechanalyzer.parser._util import count_atoms
 from mechanalyzer.parser._util import order_rct_bystoich
@@ -52,21 +55,19 @@ def mech_info(rxn_param_dct, spc_dct):
         """ Assess if the reactant and product names provided in the
             rxn_param_dct exist in the spc_dct
         """
-        # extract third body names
+        all_mech_names = set()
+        for _rct_names, _prd_names in zip(rct_names, prd_names):
+            all_mech_names.update(_rct_names)
+            all_mech_names.update(_prd_names)
+
+        # add third body names
         # [('+M',), ('(+HE)',), ('(+M)',), (None,), (None,), ('(+M)',)]
-        thrdbdy_names = ()
         for thrd in thrdbdy_lst:
             for el in thrd:
                 if el is not None:
                     thrdbd = el.split('+')[-1].strip().split(')')[0].strip()
-                    if thrdbd != 'M' and thrdbd not in thrdbdy_names:
-                        thrdbdy_names += (thrdbd, )
-
-        all_mech_names = ()
-        for _rct_names, _prd_names in zip(rct_names, prd_names):
-            all_mech_names += _rct_names
-            all_mech_names += _prd_names
-        all_mech_names = set(all_mech_names + thrdbdy_names)
+                    if thrdbd != 'M':
+                        all_mech_names.add(thrdbd)
 
         missing_names = all_mech_names - all_spc_names
         if missing_names:
@@ -172,60 +173,6 @@ def cmts_string(name, label, cltype):
     return rxnclass
 
 
-def conn_chn_df(mech_df): # moved outside of the class - taken for granted: classification always includes pes, subpes, chnl
-    """ Identifies connected channels and assigns them to the same subpes
-        Generate pes dictionary for each reaction and save for later use
-
-    :param self.mech_df: dataframe with mech info (contains all reactions)
-    :param conn_chn_df: empty dataframe df[subpes][rxn]
-
-    :returns: conn_chn_df dataframe[subpes][rxn]
-    :rtype: dataframe[int][tuple]
-    """
-    conn_chn_df = pd.DataFrame(
-            index = mech_df.index, columns=['subpes'])
-    
-    pes_dct_df = pd.DataFrame(
-        index=mech_df.index,
-        columns=['chnl', 'pes_chnl_tuple'],
-        # columns=['pes_dct', 'pes_chnl_tuple', 'pes_chnl'],
-        dtype=object)
-
-    for _, peslist in mech_df.groupby('pes'):
-        idx_start = 0
-        # Set the names lists for the rxns and species needed below
-        # print(peslist)
-        peslist = peslist.sort_values(by=['rxn_names'])
-        pes_rct_names_lst = peslist['rct_names_lst'].values
-        pes_prd_names_lst = peslist['prd_names_lst'].values
-        pes_rxn_name_lst = peslist.index
-        connchnls = pes.find_conn_chnls(
-            pes_rct_names_lst, pes_prd_names_lst, pes_rxn_name_lst)
-        # print(connchnls)
-        # Write subpes in conn_chn_df
-        for key, value in connchnls.items():
-            rxns = peslist.iloc[value].sort_values(
-                by=['rxn_names'], ascending=False).index
-
-            # conn_chn_df['subpes'][rxns] = key+1
-            conn_chn_df.loc[rxns, 'subpes'] = key+1
-            # reorder by rxn name before assigning the channel index
-
-            for chnl_idx, rxn in enumerate(rxns):
-                rxn_name = tuple(
-                    (peslist['rct_names_lst'][rxn],
-                        peslist['prd_names_lst'][rxn]))
-                pes_dct_df.at[rxn, 'chnl'] = chnl_idx+idx_start+1
-
-                pes_dct_df.at[rxn, 'pes_chnl_tuple'] = (
-                    chnl_idx+idx_start, rxn_name)
-
-            idx_start += len(rxns)
-        
-    conn_chn_df = pd.concat([conn_chn_df, pes_dct_df], axis=1)
-
-    return conn_chn_df
-
 class SortMech:
     """ class of methods to organize the mechanism according to given criteria
     """
@@ -273,20 +220,21 @@ class SortMech:
                      'N_of_prods', 'pes_fml', 'formulas', 'isthrdbdy',
                      'thrdbdy', 'param_vals', 'rxn_names'], dtype=object)
 
-        # reindex pes
-        df_pes = pd.DataFrame(
-            index=self.mech_df.index, columns=['pes'])
-        pes_index = 1
-        for _, pes_fml in self.mech_df.groupby('pes_fml'):
-            rxns = pes_fml.index
-            df_pes.loc[rxns,'pes'] = pes_index
-            pes_index += 1
-        # Concatenate the new portion of dataframe
-        self.mech_df = pd.concat([self.mech_df, df_pes], axis=1)
+        # reindex pes: pes numbered by sorted formula
+        self.mech_df['pes'] = (
+            self.mech_df.groupby('pes_fml').ngroup() + 1).astype(object)
         # add subpes and chnl once and for all
         self.mech_df = pd.concat(
             [self.mech_df, conn_chn_df(self.mech_df)], axis=1)  # add subpes
 
+        # intern species and reactions to integer ids: the reactants and
+        # products of reaction rxn_id are stored as CSR arrays of species ids
+        self.spc_names = numpy.array(sorted(spc_dct.keys()), dtype=object)
+        self.spc_idx = {name: idx for idx, name in enumerate(self.spc_names)}
+        self.rct_csr = names_csr(rct_names_lst, self.spc_idx)
+        self.prd_csr = names_csr(prd_names_lst, self.spc_idx)
+        self.mech_df['rxn_id'] = numpy.arange(len(rxn_index))
+
         self.spc_dct = spc_dct  # set for later use
         # empty list for initialization (otherwise pylint warning)
         self.species_subset_df = ()
@@ -460,13 +408,49 @@ class SortMech:
             #elif isinhierarchy == False:
                 # do nothing - this is a placeholder
 
-            self.mech_df_full = copy.deepcopy(self.mech_df)
-            self.spc_dct_full = copy.deepcopy(self.spc_dct)
+            self.mech_df_full = self.mech_df.copy()
+            self.spc_dct_full = dict(self.spc_dct)
 
             self.mech_df, self.spc_dct = self.filter_byspecies(
                 species_list, filtertype)
             self.species_list = species_list
 
+    def _intern_rxns(self, rct_names_lst, prd_names_lst):
+        """ Adds reactions to the CSR arrays of reactant and product ids
+
+        :param rct_names_lst: reactant names of the new reactions
+        :param prd_names_lst: product names of the new reactions
+
+        :returns: integer ids of the new reactions
+        :rtype: numpy.ndarray(int)
+        """
+        nrxns = len(self.rct_csr[0]) - 1
+        self.rct_csr = csr_append(
+            self.rct_csr, names_csr(rct_names_lst, self.spc_idx))
+        self.prd_csr = csr_append(
+            self.prd_csr, names_csr(prd_names_lst, self.spc_idx))
+
+        return numpy.arange(nrxns, nrxns + len(rct_names_lst))
+
+    def _count_spcs(self, rxn_ids, species_list):
+        """ Counts the reactants and products of each reaction that are
+            in species_list
+
+        :param rxn_ids: integer ids of the reactions
+        :type rxn_ids: numpy.ndarray(int)
+        :param species_list: list of species
+        :type species_list: list(str)
+
+        :returns: N of selected reactants, N of selected products
+        :rtype: numpy.ndarray(int), numpy.ndarray(int)
+        """
+        spc_mask = numpy.zeros(len(self.spc_names), dtype=bool)
+        spc_mask[[self.spc_idx[sp] for sp in species_list
+                  if sp in self.spc_idx]] = True
+
+        return (csr_count(self.rct_csr, spc_mask)[rxn_ids],
+                csr_count(self.prd_csr, spc_mask)[rxn_ids])
+
     def filter_byspecies(self, species_list, filtertype):
         """ Find all reactions involving species of the species_list given as input
             Provides a new mechanism of the reactions of the selected subset
@@ -486,8 +470,7 @@ class SortMech:
             # reset the classification 
             self.mech_df_full[['submech_prompt', 'rxn_ped']] = ''
 
-        # deepcopy
-        mech_df = copy.deepcopy(self.mech_df_full)
+        mech_df = self.mech_df_full.copy()
         # check that all species selected are in the species dictionary
         try:
             [self.spc_dct_full[sp] for sp in species_list]
@@ -495,91 +478,64 @@ class SortMech:
             raise KeyError('Error in ISOLATE_SPECIES: ',
                   'not all species are in the species list. Exiting') from err
 
-        # For all reactions in dataframe: check if species in selected list.
-        # Otherwise remove the reaction
-        spc_list = []
-        for rxn in mech_df.index:
-            rcts = list(mech_df['rct_names_lst'][rxn])
-            prds = list(mech_df['prd_names_lst'][rxn])
-            # Check if one species in the list is among reactants or products
-            # of the reaction considered
-            if filtertype in ['submech', 'submech_prompt']:
-                _rchk = any(
-                    rct == _spc for _spc in species_list for rct in rcts)
-                _pchk = any(
-                    prd == _spc for _spc in species_list for prd in prds)
-                chk = int(_rchk or _pchk)
-                
-            elif filtertype in ['submech_del', 'submech_ext']:
-                
-                _rchk = int(all(any(rct == _spc for _spc in species_list)
-                               for rct in rcts))
-                _pchk = int(all(any(prd == _spc for _spc in species_list)
-                               for prd in prds))
-                
-                if filtertype == 'submech_del':
-                    chk = int(_rchk and _pchk)
-                    # all species of reactants and products have to be in the list
-                elif filtertype == 'submech_ext':
-                    # filter out bimol/bimol reactions if some bimol rcts/prds are not in the species list
-                    # equivalent to saying: at least all reactants (also single react works) or all products
-                    # must be in the species list
-                    chk = int(_rchk or _pchk)
-                    
-            if chk >= 1 and filtertype != 'submech_prompt':
-                spc_list.extend(rcts)
-                spc_list.extend(prds)
-                  
-            elif chk >= 1 and filtertype == 'submech_prompt':
-                for sp in species_list:
-                    if len(rcts) == 2 and any(rct == sp for rct in rcts) and len(prds) <= 2:
-                        mech_df.at[rxn, 'submech_prompt'] = 'RAD_GEN_{}'.format(
-                            sp)
-                        mech_df.at[rxn, 'rxn_ped'] = '{}={}'.format(
-                            rxn[0].split('=')[-1], rxn[0].split('=')[0])
-                    elif len(prds) == 2 and any(prd == sp for prd in prds):
-                        mech_df.at[rxn, 'submech_prompt'] = 'RAD_GEN_{}'.format(
-                            sp)
-                        mech_df.at[rxn, 'rxn_ped'] = rxn[0]
-
-                    elif len(prds) > 2 and any(prd == sp for prd in prds):
-                        mech_df.at[rxn, 'submech_prompt'] = 'PROMPT_LUMPED_{}'.format(
-                            sp)
-                    # rxn is unimol deco/formation of the radical
-                    elif ((len(rcts) == 1 and rcts[0] == sp and len(prds) <= 2) or
-                          (len(prds) == 1 and prds[0] == sp and len(rcts) <= 2)):
-                        mech_df.at[rxn, 'submech_prompt'] = 'RAD_DECO_{}'.format(
-                            sp)
-                    elif (len(rcts) == 1 and rcts[0] == sp and len(prds) > 2):
-                        mech_df.at[rxn, 'submech_prompt'] = 'RAD_DECO_LUMPED_{}'.format(
-                            sp)
-                   
-                    if len(mech_df.at[rxn, 'submech_prompt']) > 0:
-                        break
+        # For all reactions in dataframe: count the reactants and products
+        # in the selected list
+        rxn_ids = mech_df['rxn_id'].values.astype(int)
+        nrcts = numpy.diff(self.rct_csr[0])[rxn_ids]
+        nprds = numpy.diff(self.prd_csr[0])[rxn_ids]
+        rct_hits, prd_hits = self._count_spcs(rxn_ids, species_list)
+        # Check if one species in the list is among reactants or products
+        # of the reaction considered
+        if filtertype in ['submech', 'submech_prompt']:
+            chk = (rct_hits > 0) | (prd_hits > 0)
+        elif filtertype in ['submech_del', 'submech_ext']:
+            _rchk = rct_hits == nrcts
+            _pchk = prd_hits == nprds
+            if filtertype == 'submech_del':
+                # all species of reactants and products have to be in the list
+                chk = _rchk & _pchk
+            elif filtertype == 'submech_ext':
+                # filter out bimol/bimol reactions if some bimol rcts/prds are not in the species list
+                # equivalent to saying: at least all reactants (also single react works) or all products
+                # must be in the species list
+                chk = _rchk | _pchk
+
+        if filtertype != 'submech_prompt':
+            # reactions filtered out
+            mech_df = mech_df[chk]
+            spc_list = list(self._rxn_spcs(rxn_ids[chk]))
 
-            elif chk == 0 and filtertype != 'submech_prompt':  # reaction filtered out
-                # don't filter for submech_prompt - you'll need it later to check for wellskipping channels
-                mech_df = mech_df.drop(index=[rxn]) 
-                        
-        if filtertype == 'submech_prompt':
-            mech_df_new = pd.DataFrame(columns = mech_df.columns, dtype=object)
-            # submech_prompt: if RAD_GEN/RAD_DECO in list, keep the rxns
-            for _, subpes_df in mech_df.groupby(['pes', 'subpes']):
-                if any('RAD' in CHECK or 'PROMPT' in CHECK   # if len > 1, value was assigned
+        else:
+            # don't filter for submech_prompt - you'll need it later to check for wellskipping channels
+            mech_df = self._label_prompt(mech_df, species_list, chk)
+
+            # submech_prompt: if RAD_GEN/RAD_DECO in list, keep the subpes
+            is_prompt = mech_df['submech_prompt'].str.contains('RAD|PROMPT')
+            keep = is_prompt.groupby(
+                [mech_df['pes'], mech_df['subpes']]).transform('any')
+            mech_df_lst, spc_list = [], []
+            rxns_checkdup = set()
+            for _, subpes_df in mech_df[keep.values].groupby(['pes', 'subpes']):
+                spc_list.extend(
+                    self._rxn_spcs(subpes_df['rxn_id'].values.astype(int)))
+                mech_df_lst.append(subpes_df)
+                rxns_checkdup.update(zip(subpes_df['rct_names_lst_ord'].values,
+                                         subpes_df['prd_names_lst_ord'].values))
+                # add wellskipping channels that might be missing
+                if any('RAD_GEN' in CHECK
                        for CHECK in subpes_df['submech_prompt'].values):
-                    [spc_list.extend(list(rcts_tup))
-                     for rcts_tup in subpes_df['rct_names_lst'].values]
-                    [spc_list.extend(list(prds_tup))
-                     for prds_tup in subpes_df['prd_names_lst'].values]
-                    mech_df_new = pd.concat([mech_df_new, subpes_df], axis=0)
-                    # add wellskipping channels that might be missing
-                    if any('RAD_GEN' in CHECK
-                           for CHECK in subpes_df['submech_prompt'].values):
-                        added_rxns_df = self.add_wellskipping(subpes_df, mech_df_new)
-                        mech_df_new = pd.concat([mech_df_new, added_rxns_df], axis=0)
-
-            mech_df = copy.deepcopy(mech_df_new)
-    
+                    added_rxns_df = self.add_wellskipping(
+                        subpes_df, rxns_checkdup)
+                    mech_df_lst.append(added_rxns_df)
+                    rxns_checkdup.update(zip(
+                        added_rxns_df['rct_names_lst_ord'].values,
+                        added_rxns_df['prd_names_lst_ord'].values))
+
+            if mech_df_lst:
+                mech_df = pd.concat(mech_df_lst, axis=0)
+            else:
+                mech_df = pd.DataFrame(columns=mech_df.columns, dtype=object)
+
         # filter spc_list: unique elements
         spc_list = sorted(list(set(spc_list)))
         if filtertype == 'submech_del':
@@ -591,12 +547,87 @@ class SortMech:
 
         return mech_df, spc_dct
 
-    def add_wellskipping(self, subpes_df, mech_df_checkdup):
+    def _rxn_spcs(self, rxn_ids):
+        """ Species taking part to a set of reactions
+
+        :param rxn_ids: integer ids of the reactions
+        :type rxn_ids: numpy.ndarray(int)
+
+        :returns: names of the reactants and products, sorted
+        :rtype: numpy.ndarray(str)
+        """
+        rxn_mask = numpy.zeros(len(self.rct_csr[0])-1, dtype=bool)
+        rxn_mask[rxn_ids] = True
+        spc_ids = [ids[rxn_mask[numpy.repeat(numpy.arange(len(ptr)-1),
+                                             numpy.diff(ptr))]]
+                   for ptr, ids in (self.rct_csr, self.prd_csr)]
+
+        return self.spc_names[numpy.unique(numpy.concatenate(spc_ids))]
+
+    def _label_prompt(self, mech_df, species_list, chk):
+        """ Labels the reactions generating or decomposing the radicals of
+            species_list. Assignment is hierarchical: the first species of
+            species_list found determines the label of the reaction
+
+        :param mech_df: dataframe with mech info, with empty columns
+            'submech_prompt' and 'rxn_ped'
+        :param species_list: list of radicals
+        :param chk: reactions involving any species of species_list
+        :type chk: numpy.ndarray(bool)
+
+        :returns: mech_df with 'submech_prompt' and 'rxn_ped' assigned
+        :rtype: dataframe
+        """
+        rxn_ids = mech_df['rxn_id'].values.astype(int)
+        rct_ptr, rct_ids = self.rct_csr
+        prd_ptr, prd_ids = self.prd_csr
+        nrcts = numpy.diff(rct_ptr)[rxn_ids]
+        nprds = numpy.diff(prd_ptr)[rxn_ids]
+        # first reactant and product (sides are never empty)
+        rct0 = rct_ids[rct_ptr[rxn_ids]]
+        prd0 = prd_ids[prd_ptr[rxn_ids]]
+        labels = mech_df['submech_prompt'].values.copy()
+        peds = mech_df['rxn_ped'].values.copy()
+        rxn_names = numpy.array(
+            [rxn[0] for rxn in mech_df.index], dtype=object)
+
+        for sp in species_list:
+            todo = chk & (labels == '')
+            if not todo.any():
+                break
+            sp_id = self.spc_idx[sp]
+            rct_hits, prd_hits = self._count_spcs(rxn_ids, [sp])
+            deco = (nrcts == 1) & (rct0 == sp_id)
+            form = (nprds == 1) & (prd0 == sp_id)
+            case = numpy.select(
+                [(nrcts == 2) & (rct_hits > 0) & (nprds <= 2),
+                 (nprds == 2) & (prd_hits > 0),
+                 (nprds > 2) & (prd_hits > 0),
+                 (deco & (nprds <= 2)) | (form & (nrcts <= 2)),
+                 deco & (nprds > 2)],
+                [1, 2, 3, 4, 5], default=0) * todo
+            labels[(case == 1) | (case == 2)] = 'RAD_GEN_{}'.format(sp)
+            peds[case == 1] = [
+                '{}={}'.format(name.split('=')[-1], name.split('=')[0])
+                for name in rxn_names[case == 1]]
+            peds[case == 2] = rxn_names[case == 2]
+            labels[case == 3] = 'PROMPT_LUMPED_{}'.format(sp)
+            # rxn is unimol deco/formation of the radical
+            labels[case == 4] = 'RAD_DECO_{}'.format(sp)
+            labels[case == 5] = 'RAD_DECO_LUMPED_{}'.format(sp)
+
+        mech_df['submech_prompt'] = labels
+        mech_df['rxn_ped'] = peds
+
+        return mech_df
+
+    def add_wellskipping(self, subpes_df, rxns_checkdup):
         """ check channels for a radical generation subset
             add temporary bimol or unimol wellskiping reactions generating the radical
             so they will be considered in the generation of prompt channels
             but removed in the final reaction list
-            mech_df_checkdup is needed to check that the reaction is not for some reason already present in the mech
+            rxns_checkdup is the set of (rcts, prds) already in the mech, needed to check
+            that the reaction is not for some reason already present
         """
 
         # identify radical(s) generating
@@ -617,28 +648,25 @@ class SortMech:
         # get reaction names
         rxn_list_ordered = list(
             zip(subpes_df['rct_names_lst_ord'].values, subpes_df['prd_names_lst_ord'].values))
-        existing_rxn_list_ordered = list(
-            zip(mech_df_checkdup['rct_names_lst_ord'].values, mech_df_checkdup['prd_names_lst_ord'].values))
 
         # get reactivity matrix for subpes
         connected_rxns_df = connect_rxn_df(rxn_list_ordered)
         # generate new reactions for the radicals
         new_wskip_rxns = []
         for rad_bim in rad_bimol:
-            new_wskip_rxns.extend(add_wellskip(connected_rxns_df, rad_bim))
-
-        new_wellskipping_idxs = []
-        for rcts in new_wskip_rxns:
-            # check that rxn is not already present in the inlet dataframe: if so, remove from list
-            if tuple(rcts) in existing_rxn_list_ordered or tuple([rcts[1], rcts[0]]) in existing_rxn_list_ordered:
-                # print('found {}'.format(rcts))
-                continue
-            # if not found, continue
-            rxn = '{}={}'.format(
-                '+'.join(rcts[0]), '+'.join(rcts[1]))
-            new_wellskipping_idxs.append((rxn, (None,)))
-            
-        #print(subpes_df, '\n', rad_list, rad_bimol, '\n')
+            for rcts in add_wellskip(connected_rxns_df, rad_bim):
+                # check that rxn is not already present in the inlet dataframe: if so, remove from list
+                if (tuple(rcts) in rxns_checkdup
+                        or (rcts[1], rcts[0]) in rxns_checkdup):
+                    continue
+                new_wskip_rxns.append(rcts)
+
+        new_wellskipping_idxs = [
+            ('{}={}'.format('+'.join(rcts[0]), '+'.join(rcts[1])), (None,))
+            for rcts in new_wskip_rxns]
+        rct_names_lst = [rcts[0] for rcts in new_wskip_rxns]
+        prd_names_lst = [rcts[1] for rcts in new_wskip_rxns]
+
         wellskipp_rxns_df = pd.DataFrame(
             index=new_wellskipping_idxs, columns=subpes_df.columns, dtype=object)
         # common values
@@ -648,16 +676,18 @@ class SortMech:
         wellskipp_rxns_df['thrdbdy'] = [(None,)]*len(wellskipp_rxns_df.index)
 
         # add to dataframe
-        for idx, rxn in enumerate(new_wellskipping_idxs):
-            rad = sorted(list(set(rad_list).intersection(new_wskip_rxns[idx][1])))[0]
-
-            wellskipp_rxns_df.at[rxn, 'submech_prompt'] = 'RAD_GEN_{}'.format(rad)
-            wellskipp_rxns_df.at[rxn, 'rxn_ped'] = rxn[0]
-            wellskipp_rxns_df.at[rxn, 'rct_names_lst'] = new_wskip_rxns[idx][0]
-            wellskipp_rxns_df.at[rxn, 'prd_names_lst'] = new_wskip_rxns[idx][1]
-            wellskipp_rxns_df.at[rxn, 'rct_names_lst_ord'] = new_wskip_rxns[idx][0]
-            wellskipp_rxns_df.at[rxn, 'prd_names_lst_ord'] = new_wskip_rxns[idx][1]
-            # print('ok for ', idx, rxn, rad_list, new_wskip_rxns[idx], '\n')
+        wellskipp_rxns_df['submech_prompt'] = [
+            'RAD_GEN_{}'.format(sorted(list(set(rad_list).intersection(prds)))[0])
+            for prds in prd_names_lst]
+        wellskipp_rxns_df['rxn_ped'] = [rxn for rxn, _ in new_wellskipping_idxs]
+        for col, names_lst in zip(
+                ['rct_names_lst', 'prd_names_lst',
+                 'rct_names_lst_ord', 'prd_names_lst_ord'],
+                [rct_names_lst, prd_names_lst, rct_names_lst, prd_names_lst]):
+            wellskipp_rxns_df[col] = pd.Series(
+                names_lst, index=wellskipp_rxns_df.index, dtype=object)
+        wellskipp_rxns_df['rxn_id'] = self._intern_rxns(
+            rct_names_lst, prd_names_lst)
 
         return wellskipp_rxns_df
 
@@ -677,15 +707,14 @@ class SortMech:
 
         # if species list is not found: do nothing, species entry remain empty
         if len(self.species_list) > 0:
-            for rxn in reac_sp_df.index:
-                rcts = list(self.mech_df['rct_names_lst'][rxn])
-                prds = list(self.mech_df['prd_names_lst'][rxn])
-                # check species hierarchically
-                for sp_i in self.species_list:
-                    if ((any(sp_i == rct for rct in rcts) or
-                         any(sp_i == prd for prd in prds))
-                            and isinstance(reac_sp_df['species'][rxn], float)):
-                        reac_sp_df.at[rxn, 'species'] = sp_i
+            rxn_ids = self.mech_df['rxn_id'].values.astype(int)
+            species = numpy.full(len(rxn_ids), numpy.nan, dtype=object)
+            # check species hierarchically
+            for sp_i in self.species_list:
+                rct_hits, prd_hits = self._count_spcs(rxn_ids, [sp_i])
+                species[((rct_hits + prd_hits) > 0)
+                        & pd.isna(species)] = sp_i
+            reac_sp_df['species'] = species
         return reac_sp_df
 
     def group_submech(self, submech_df):
@@ -732,19 +761,20 @@ class SortMech:
                 
             return group
             
-        for rxn in submech_df.index:
-            rcts = list(self.mech_df['rct_names_lst'][rxn])
-            prds = list(self.mech_df['prd_names_lst'][rxn])
-            spcs = rcts + prds
+        species_set = set(self.species_list)
+        spcs_grps = []
+        for rcts, prds in zip(self.mech_df['rct_names_lst'].values,
+                              self.mech_df['prd_names_lst'].values):
+            spcs = list(rcts) + list(prds)
             # check if rcts and prds are in species list. if so, check spc type
             species_subset = []
             for spc in spcs:
-                if spc in self.species_list:
+                if spc in species_set:
                     species_subset.append(self.species_subset_df[spc])
-                    
-            spcs_grp = assign_group(species_subset)
+
             # check species hierarchically (hierarchy fixed in species list)
-            submech_df.at[rxn, lbl_col] = spcs_grp
+            spcs_grps.append(assign_group(species_subset))
+        submech_df[lbl_col] = numpy.array(spcs_grps, dtype=object)
 
         return submech_df
 
@@ -791,11 +821,12 @@ class SortMech:
                     peds = []
                     grp_dct['hot'].append([])
                     grp_dct['idxs'].append('{}:{}'.format(pes, subpes))
-                    rxns = subpesdf.sort_values(by=['rxn_names'], ascending=False).index #ordered like the channels
-                    for rxn in rxns:
-                        peds.append(subpesdf['rxn_ped'][rxn])
+                    subpesdf = subpesdf.sort_values(by=['rxn_names'], ascending=False) #ordered like the channels
+                    for ped, label in zip(subpesdf['rxn_ped'].values,
+                                          subpesdf['submech_prompt'].values):
+                        peds.append(ped)
                         # deal with hotspecies
-                        sp = subpesdf['submech_prompt'][rxn].split('_')[-1]
+                        sp = label.split('_')[-1]
                         hotpes = self.species_deco_dct[sp]
                         if hotpes in hotspc_dct.keys():
                             hotspc_dct[hotpes].append(sp)
@@ -1134,11 +1165,9 @@ class SortMech:
         :rtype: dataframe[str][tuple]
         """
         # assign multiplicity values to each reactant
-        for rxn in reac_mult_df.index:
-            mult = 1
-            rcts = self.mech_df['rct_names_lst'][rxn]
-            mult = get_mult(rcts, self.spc_dct)
-            reac_mult_df.at[rxn, 'mult'] = str(mult)
+        reac_mult_df['mult'] = numpy.array(
+            [str(get_mult(rcts, self.spc_dct))
+             for rcts in self.mech_df['rct_names_lst'].values], dtype=object)
 
         return reac_mult_df
 
@@ -1154,14 +1183,14 @@ class SortMech:
             dataframe[class][rxn]
         :rtype: dataframe[str][tuple]
         """
-        for rxn in rxncl_broad_df.index:
-            rcts = self.mech_df['rct_names_lst_ord'][rxn]
-            prds = self.mech_df['prd_names_lst_ord'][rxn]
-            _smol = (self.mech_df['molecularity'][rxn] == 1)
-            _tbody = (self.mech_df['molecularity'][rxn] == 2
-                      and self.mech_df['isthrdbdy'][rxn] == 1)
-
-            if _smol or _tbody:
+        molecularity = self.mech_df['molecularity'].values
+        isthrdbdy = self.mech_df['isthrdbdy'].values
+        _unimol = (molecularity == 1) | ((molecularity == 2) & (isthrdbdy == 1))
+        rxn_classes_broad = []
+        for rcts, prds, unimol in zip(self.mech_df['rct_names_lst_ord'].values,
+                                      self.mech_df['prd_names_lst_ord'].values,
+                                      _unimol):
+            if unimol:
                 # unimolecular reaction classification
                 rxn_class_broad = rxnclass.classify_unimol(
                     rcts, prds, self.spc_dct)
@@ -1169,8 +1198,9 @@ class SortMech:
                 # bimolecular reaction classification
                 rxn_class_broad = rxnclass.classify_bimol(
                     rcts, prds, self.spc_dct)
-            rxncl_broad_df.at[rxn, 'rxn_class_broad'] = rxn_class_broad
-            # (rxncl_broad_df.loc[[rxn], 'rxn_class_broad']) # technicall
+            rxn_classes_broad.append(rxn_class_broad)
+        rxncl_broad_df['rxn_class_broad'] = numpy.array(
+            rxn_classes_broad, dtype=object)
 
         return rxncl_broad_df
 
@@ -1193,7 +1223,11 @@ class SortMech:
         # self.mech_df = pd.concat([self.mech_df, self.chnl('')], axis=1)
 
         # 2. Graph classification or each subpes
-        for _, subpes_df in self.mech_df.groupby(['pes', 'subpes']):
+        # rxns are referred to by row position
+        rxn_classes = numpy.full(
+            len(self.mech_df.index), numpy.nan, dtype=object)
+        for _, subpes_df in self.mech_df.reset_index(drop=True).groupby(
+                ['pes', 'subpes']):
             # sort by molecularity: analyze first unimolecular isomerizations,
             # unimolecular decompositions, and then bimolecular reactions
             subpes_df = subpes_df.sort_values(
@@ -1213,11 +1247,12 @@ class SortMech:
                 columns=species_subpes)
 
             # graph classification
-            for rxn in subpes_df.index:
-                rct_names = subpes_df['rct_names_lst'][rxn]
-                prd_names = subpes_df['prd_names_lst'][rxn]
-                rct_names_ord = subpes_df.at[rxn, 'rct_names_lst_ord']
-                prd_names_ord = subpes_df.at[rxn, 'prd_names_lst_ord']
+            rxn_lst = zip(subpes_df.index,
+                          subpes_df['rct_names_lst'].values,
+                          subpes_df['prd_names_lst'].values,
+                          subpes_df['rct_names_lst_ord'].values,
+                          subpes_df['prd_names_lst_ord'].values)
+            for rxn, rct_names, prd_names, rct_names_ord, prd_names_ord in rxn_lst:
                 # Exclude rxns with more than 2 rcts or prds (not elementary!)
                 if len(rct_names) < 3 and len(prd_names) < 3:
 
@@ -1226,7 +1261,7 @@ class SortMech:
 
                 else:
                     rclass = 'unclassified - lumped'
-                rxncl_graph_df.at[rxn, 'rxn_class_graph'] = rclass
+                rxn_classes[rxn] = rclass
 
                 # store values in the elementary reactivity matrix
                 # (for now contaminated with isomerizations)
@@ -1236,14 +1271,16 @@ class SortMech:
             # 3. classify well skipping channels
             # reclassify the unclassified reactions A->B+C, B+C->D, B+C->E+F
             for rxn in subpes_df.index:
-                if rxncl_graph_df['rxn_class_graph'][rxn] == 'unclassified':
+                if rxn_classes[rxn] == 'unclassified':
 
                     # call external function for WS channel classification
 
                     rxn_type_ws = rxnclass.classify_ws(
                         subpes_df, elem_reac_df, species_subpes, rxn)
                     if rxn_type_ws is not None:
-                        rxncl_graph_df.at[rxn, 'rxn_class_graph'] = rxn_type_ws
+                        rxn_classes[rxn] = rxn_type_ws
+
+        rxncl_graph_df['rxn_class_graph'] = rxn_classes
 
         return rxncl_graph_df
 
@@ -1257,10 +1294,10 @@ class SortMech:
         :rtype: dataframe[float][tuple]
         """
         # extract maximum value for each ktp dictionary
-        for rxn in rxn_maxvals_df.index:
-            param_vals_dct = self.mech_df['param_vals'][rxn]
-            max_val = ktp_util.get_max_aligned_values(param_vals_dct)
-            rxn_maxvals_df.at[rxn, 'rxn_max_vals'] = max_val
+        rxn_maxvals_df['rxn_max_vals'] = numpy.array(
+            [ktp_util.get_max_aligned_values(param_vals_dct)
+             for param_vals_dct in self.mech_df['param_vals'].values],
+            dtype=object)
 
         return rxn_maxvals_df
 
@@ -1275,13 +1312,13 @@ class SortMech:
         :rtype: dataframe[float][tuple]
         """
         # extract maximum ratio for each set ktp dictionary
-        for rxn in rxn_maxratio_df.index:
-            param_vals_dct = self.mech_df['param_vals'][rxn]
+        max_vals = []
+        for param_vals_dct in self.mech_df['param_vals'].values:
             # get the ratio:
             param_ratio_dct = ktp_util.get_aligned_rxn_ratio_dct(
                 param_vals_dct)
-            max_val = ktp_util.get_max_aligned_values(param_ratio_dct)
-            rxn_maxratio_df.at[rxn, 'rxn_max_ratio'] = max_val
+            max_vals.append(ktp_util.get_max_aligned_values(param_ratio_dct))
+        rxn_maxratio_df['rxn_max_ratio'] = numpy.array(max_vals, dtype=object)
 
         return rxn_maxratio_df
 
@@ -1306,12 +1343,9 @@ class SortMech:
         if 'cmts_inline' in self.mech_df.columns and 'cmts_top' in self.mech_df.columns:
             self.mech_df = self.mech_df.drop(
                 ['cmts_inline', 'cmts_top'], axis=1)
-        # df for comments_top and comments_inline
-        ept_df = numpy.zeros((len(self.mech_df.index), 1), dtype=str)
-        df_cmts_top = pd.DataFrame(
-            ept_df, index=self.mech_df.index, columns=['cmts_top'])
-        df_cmts_inline = pd.DataFrame(
-            ept_df, index=self.mech_df.index, columns=['cmts_inline'])
+        # comments_top and comments_inline, filled by row position
+        cmts_top = numpy.full(len(self.mech_df.index), '', dtype=object)
+        cmts_inline = numpy.full(len(self.mech_df.index), '', dtype=object)
 
         try:
             n_headers = int(hierarchy[-1])
@@ -1320,31 +1354,36 @@ class SortMech:
                 '*ERROR: Last line of sorting options is the N ',
                 'of criteria to use for class headers') from err
 
+        def _groups(crit):
+            """ (name, row positions) of the groups of rxns by crit
+            """
+            for name, pos in self.mech_df.groupby(crit).indices.items():
+                yield (name if isinstance(name, tuple) else (name,)), pos
+
+        top_labels = labels[hierarchy[:n_headers]]
+        inline_labels = labels[hierarchy[n_headers:-1]]
         # Write topheader comments
         if n_headers > 0:
-            for name, rdf in self.mech_df.groupby(hierarchy[:n_headers]):
+            for name, pos in _groups(hierarchy[:n_headers]):
                 # Write rxn class as top header comments
-                rxnclass = cmts_string(
-                    name, labels[hierarchy[:n_headers]], 'class_head')
-                idx0 = rdf.index[0]
-                df_cmts_top.at[idx0, 'cmts_top'] = rxnclass
-
-                # Write inline comments if necessary
-                if n_headers < len(hierarchy)-1:
-                    for name2, rdf2 in rdf.groupby(hierarchy[n_headers:-1]):
-                        rxnclass = cmts_string(
-                            name2, labels[hierarchy[n_headers:-1]], 'subclass')
-                        df_cmts_inline.loc[rdf2.index, 'cmts_inline'] = rxnclass
+                rxnclass = cmts_string(name, top_labels, 'class_head')
+                cmts_top[pos.min()] = rxnclass
+
+            # Write inline comments if necessary
+            if n_headers < len(hierarchy)-1:
+                for name, pos in _groups(hierarchy[:-1]):
+                    rxnclass = cmts_string(
+                        name[n_headers:], inline_labels, 'subclass')
+                    cmts_inline[pos] = rxnclass
         else:
             # Write only inline comments
-            for name, rdf in self.mech_df.groupby(hierarchy[n_headers:-1]):
-                rxnclass = cmts_string(
-                    name, labels[hierarchy[n_headers:-1]], 'class')
-                df_cmts_inline.loc[rdf.index, 'cmts_inline'] = rxnclass
+            for name, pos in _groups(hierarchy[n_headers:-1]):
+                rxnclass = cmts_string(name, inline_labels, 'class')
+                cmts_inline[pos] = rxnclass
 
-        # Concatenate DFs
-        self.mech_df = pd.concat(
-            [self.mech_df, df_cmts_top, df_cmts_inline], axis=1)
+        # Add the comment columns
+        self.mech_df = self.mech_df.assign(
+            cmts_top=cmts_top, cmts_inline=cmts_inline)
 
     # OUTPUT DATAFRAMES and DICTIONARIES #
     def return_mech_df(self):
@@ -3,8 +3,10 @@
 """
 
 import copy
+from mechanalyzer import cache
 from mechanalyzer.calculator import compare
 from mechanalyzer.calculator import rates
+from mechanalyzer.calculator import ktp_arr
 from mechanalyzer.calculator.rates import check_p_t
 from mechanalyzer.builder import _names as names
 from ratefit.fit import _fit as fit
@@ -422,7 +424,7 @@ def strip_mech_spc_dct(mech_spc_dct, canon_ent=False):
         else:
             orig_ich = copy.copy(spc_dct['inchi'])
         print('orig_ich: ', orig_ich)
-        strpd_ich = chi.without_stereo(orig_ich)
+        strpd_ich = cache.without_stereo(orig_ich)
         #try:
             #strpd_ich = inchi.without_stereo(orig_ich)
         #except:
@@ -525,10 +527,6 @@ def _sum_ktp_list(ktp_dct_lst):
         :rtype: dict
     """
 
-    for idx, ktp_dct in enumerate(ktp_dct_lst):
-        if idx == 0:
-            summed_ktp_dct = copy.deepcopy(ktp_dct)
-        else:
-            summed_ktp_dct = rates.add_ktp_dcts(summed_ktp_dct, ktp_dct)
+    summed_ktp_dct = ktp_arr.sum_ktp_dcts(ktp_dct_lst)
 
     return summed_ktp_dct
@@ -0,0 +1,144 @@
+"""
+  Memoization of automol functions that are called many times on the same
+  InChIs (stereo expansion, graphs, instability products, ...) and of the
+  parsing of MESS files that are read many times (prompt dissociation)
+
+  Results are kept in a size-bounded, least-recently-used dictionary in
+  memory and, if a cache file is set (see set_cache_path, or the
+  MECHANALYZER_CACHE environment variable), in an SQLite database on disk,
+  so that repeated runs over the same species skip the work entirely.
+  Entries are content-addressed: the key is a hash of the function name and
+  of its arguments.
+"""
+
+import os
+import pickle
+import sqlite3
+import hashlib
+import collections
+import automol
+
+MAXSIZE = 10000  # maximum number of results held in memory
+ENV_VAR = 'MECHANALYZER_CACHE'
+
+_MEM_CACHE = collections.OrderedDict()
+_DISK = {'path': os.environ.get(ENV_VAR), 'pid': None, 'conn': None}
+_MAXSIZE = [MAXSIZE]
+
+
+# Wrappers of the automol functions
+def expand_stereo(ich, enant=True):
+    """ automol.chi.expand_stereo, memoized
+    """
+    return cached_call(automol.chi.expand_stereo, ich, enant=enant)
+
+
+def is_complete(ich):
+    """ automol.chi.is_complete, memoized
+    """
+    return cached_call(automol.chi.is_complete, ich)
+
+
+def without_stereo(ich, **kwargs):
+    """ automol.chi.without_stereo, memoized
+    """
+    return cached_call(automol.chi.without_stereo, ich, **kwargs)
+
+
+def graph(ich, stereo=True):
+    """ automol.chi.graph, memoized
+    """
+    return cached_call(automol.chi.graph, ich, stereo=stereo)
+
+
+def instability_product_inchis(ich, stereo=True):
+    """ automol.reac.instability_product_inchis, memoized
+    """
+    return cached_call(
+        automol.reac.instability_product_inchis, ich, stereo=stereo)
+
+
+# Cache machinery
+def cached_call(fxn, *args, **kwargs):
+    """ Calls a function, or gets its result from the memory or disk cache
+
+        Results must be picklable; exceptions are raised and not cached.
+
+        :param fxn: function to be called; must be importable by name
+        :type fxn: function
+        :return: the output of fxn(*args, **kwargs)
+    """
+
+    key = _cache_key(fxn, args, kwargs)
+    if key in _MEM_CACHE:
+        _MEM_CACHE.move_to_end(key)
+        return _MEM_CACHE[key]
+
+    conn = _disk_connection()
+    found = False
+    if conn is not None:
+        row = conn.execute(
+            'SELECT value FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is not None:
+            val, found = pickle.loads(row[0]), True
+
+    if not found:
+        val = fxn(*args, **kwargs)
+        if conn is not None:
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)',
+                    (key, pickle.dumps(val)))
+
+    _MEM_CACHE[key] = val
+    while len(_MEM_CACHE) > _MAXSIZE[0]:
+        _MEM_CACHE.popitem(last=False)
+
+    return val
+
+
+def set_cache_path(path, maxsize=MAXSIZE):
+    """ Sets the file of the on-disk cache; None turns the disk cache off
+
+        :param path: path to the SQLite database file
+        :type path: str
+        :param maxsize: maximum number of results held in memory
+        :type maxsize: int
+    """
+
+    if _DISK['conn'] is not None and _DISK['pid'] == os.getpid():
+        _DISK['conn'].close()
+    _DISK.update({'path': path, 'pid': None, 'conn': None})
+    _MAXSIZE[0] = maxsize
+    clear_memory_cache()
+
+
+def clear_memory_cache():
+    """ Empties the in-memory cache (the disk cache is kept)
+    """
+    _MEM_CACHE.clear()
+
+
+def _cache_key(fxn, args, kwargs):
+    """ Hash of the function name and its arguments
+    """
+    name = f'{fxn.__module__}.{fxn.__qualname__}'
+    data = pickle.dumps((name, args, sorted(kwargs.items())), protocol=4)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _disk_connection():
+    """ Gets the connection to the disk cache, opening a new one in each
+        process (connections cannot be shared by forked processes)
+    """
+
+    if _DISK['path'] is None:
+        return None
+    if _DISK['pid'] != os.getpid():
+        conn = sqlite3.connect(_DISK['path'], timeout=60.0)
+        conn.execute('CREATE TABLE IF NOT EXISTS cache '
+                     '(key TEXT PRIMARY KEY, value BLOB)')
+        conn.commit()
+        _DISK.update({'pid': os.getpid(), 'conn': conn})
+
+    return _DISK['conn']
@@ -9,6 +9,7 @@ from mechanalyzer.calculator import compare
 from mechanalyzer.calculator import ene_partition
 from mechanalyzer.calculator import ene_util
 from mechanalyzer.calculator import ktp_util
+from mechanalyzer.calculator import ktp_arr
 from mechanalyzer.calculator import bf
 from mechanalyzer.calculator import nonboltz
 from mechanalyzer.calculator import formulas
@@ -22,6 +23,7 @@ __all__ = [
     'ene_partition',
     'ene_util',
     'ktp_util',
+    'ktp_arr',
     'bf',
     'nonboltz',
     'formulas',
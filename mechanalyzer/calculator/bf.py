@@ -119,6 +119,46 @@ def bf_tp_df_full(ped_df, hotbf_df):
                 dataframe(series(float))
     """
 
+    temps, pressures, allspecies, bf_arr, filled = bf_tp_arr(
+        ped_df, hotbf_df)
+
+    # if the BFs are missing at any pressure: delete the temperature
+    temps_ok = filled.all(axis=1)
+    temps = temps[temps_ok]
+    bf_arr = bf_arr[temps_ok]
+
+    bf_tp_df = pd.DataFrame(index=temps, columns=pressures, dtype=object)
+    for idx_t, temp in enumerate(temps):
+        for idx_p, pressure in enumerate(pressures):
+            bf_tp_df.at[temp, pressure] = pd.Series(
+                bf_arr[idx_t, idx_p], index=allspecies)
+
+    return bf_tp_df
+
+
+def bf_tp_arr(ped_df, hotbf_df):
+    """ Compute the branching fractions of each product of the PES
+        as an array over temperature, pressure and species
+
+        For each T, P the hot branching fractions of all species are
+        interpolated on the energies of the ped with one call, and
+        all the integrals over the energy are done at once
+
+        :param ped_df: dataframe[P][T] with the
+            Series of energy distrib [en: prob(en)]
+        :type ped_df: dataframe(series(float))
+        :param hotbf_df: hot branching fractions for hotspecies
+        :type hotbf_df: df[P][T]:df[allspecies][energies]}
+        :return temps, pressures: temperatures and pressures of ped_df
+        :rtype: pandas.Index, pandas.Index
+        :return allspecies: product species
+        :rtype: pandas.Index
+        :return bf_arr: branching fractions, nan where unavailable
+        :rtype: numpy.ndarray(len(temps), len(pressures), len(allspecies))
+        :return filled: whether the BFs were computed at each T, P
+        :rtype: numpy.ndarray(len(temps), len(pressures)) of bool
+    """
+
     # sort indexes
     ped_df = ped_df.sort_index()
     hotbf_df = hotbf_df.sort_index()
@@ -130,9 +170,10 @@ def bf_tp_df_full(ped_df, hotbf_df):
     temps, pressures = [ped_df.index, ped_df.columns]
     allspecies = hotbf_df[pressures[0]][temps[0]].columns  # extract species
     # for each T, P: compute BF
-    bf_tp_df = pd.DataFrame(index=temps, columns=pressures, dtype=object)
-    for temp in temps:
-        for pressure in pressures:
+    bf_arr = np.full((len(temps), len(pressures), len(allspecies)), np.nan)
+    filled = np.zeros((len(temps), len(pressures)), dtype=bool)
+    for idx_t, temp in enumerate(temps):
+        for idx_p, pressure in enumerate(pressures):
             # extract ped and hoten by increasing index
 
             try:
@@ -144,33 +185,28 @@ def bf_tp_df_full(ped_df, hotbf_df):
 
             # reduce the energy range of hoten and ped
             hoten = hoten[(ped.index[0] <= hoten)*(hoten <= ped.index[-1])]
-            # ped = ped[(min_en <= ped.index)*(ped.index <= max_en)]
             if len(hoten) > 3:
                 ene_vect = ped.index
                 ped_vect = ped.values
-                # Series to allocate
-                bf_series = pd.Series(0, index=allspecies, dtype=float)
-                for spc in allspecies:
-                    hoten_spc = hotbf_df[pressure][temp][spc][hoten]
-                    f_hoten = interp1d(
-                        hoten_spc.index, hoten_spc.values, bounds_error=False,
-                        kind='cubic', fill_value=(hoten_spc.values[0], hoten_spc.values[-1]))
-                    hoten_vect = f_hoten(ene_vect)
-                    # recompute in an appropriate range
-                    bf_series[spc] = np.trapz(ped_vect*hoten_vect, x=ene_vect)
-                # renormalize for all species and put in dataframe
-                if any(bf_series.values < 0):
+                # hot bfs of all species: array(len(hoten), len(allspecies))
+                hoten_arr = hotbf_df[pressure][temp].loc[
+                    hoten, allspecies].values
+                f_hoten = interp1d(
+                    hoten, hoten_arr, axis=0, bounds_error=False,
+                    kind='cubic', fill_value=(hoten_arr[0], hoten_arr[-1]))
+                hoten_vect = f_hoten(ene_vect)
+                # recompute in an appropriate range
+                bf_vect = np.trapz(
+                    ped_vect[:, None]*hoten_vect, x=ene_vect, axis=0)
+                # renormalize for all species
+                if any(bf_vect < 0):
                     print('Warning: found negative BFs at {:1.0f} K and {:1.1e} atm'
                           .format(temp, pressure))
-                    bf_series = abs(bf_series)
-                    #bf_series = abs(bf_series * np.array(bf_series > 0, dtype=int))
-                bf_tp_df.at[temp, pressure] = bf_series/np.sum(bf_series.values)
-                
-        # if any nan: delete column
-        if any(bf_tp_df.loc[temp].isnull()):
-            bf_tp_df = bf_tp_df.drop(index=[temp])
+                    bf_vect = abs(bf_vect)
+                bf_arr[idx_t, idx_p] = bf_vect/np.sum(bf_vect)
+                filled[idx_t, idx_p] = True
 
-    return bf_tp_df
+    return temps, pressures, allspecies, bf_arr, filled
 
 
 def bf_tp_df_todct(bf_tp_df, bf_threshold = 1e-2, savefile=False, rxn='', model=''):
@@ -196,37 +232,33 @@ def bf_tp_df_todct(bf_tp_df, bf_threshold = 1e-2, savefile=False, rxn='', model=
     # get species
     temps, pressures = bf_tp_df.index, bf_tp_df.columns
     allspecies = bf_tp_df.iloc[0, 0].index
+    # bfs of all species: array(len(temps), len(pressures), len(allspecies))
+    bf_arr = np.array(
+        [[bf_tp_df[pressure][temp][allspecies].values
+          for pressure in pressures] for temp in temps], dtype=float)
+    # avoid too small values and 1 to avoid discontinuities
+    bf_ok = (bf_arr < 1) * (bf_arr >= 1e-30)
+    # check if values are high enough
+    bf_highenough = (bf_arr >= bf_threshold).any(axis=(0, 1))
     bf_tp_dct_out = {}
     # fill the dictionary:
-    for spc in allspecies:
-        num_data_highenough = 0
+    for idx_s, spc in enumerate(allspecies):
+        if not bf_highenough[idx_s]:
+            continue
+
         bf_tp_dct_i = {}
-        bf_df_sp_i = pd.DataFrame(
-            np.zeros((len(temps), len(pressures))),
-            index=temps, columns=pressures)
-
-        for pressure in pressures:
-            bf_temp = []
-            temp_new = []
-            for temp in temps:
-                bfrac = bf_tp_df[pressure][temp][spc]
-                if 1 > bfrac >= 1e-30:
-                    # avoid too small values and 1 to avoid discontinuities
-                    temp_new.append(temp)
-                    bf_temp.append(bfrac)
-                    bf_df_sp_i.at[temp, pressure] = bfrac
-                # check if values is high enough
-                if bfrac >= bf_threshold:
-                    num_data_highenough += 1
-                # condition on BF and temperature
-            if bf_temp:
-                bf_tp_dct_i[pressure] = (np.array(temp_new), np.array(bf_temp))
-
-        if num_data_highenough > 0:
-            bf_tp_dct_out[spc] = bf_tp_dct_i
+        for idx_p, pressure in enumerate(pressures):
+            temp_ok = bf_ok[:, idx_p, idx_s]
+            if any(temp_ok):
+                bf_tp_dct_i[pressure] = (
+                    np.array(temps[temp_ok]), bf_arr[temp_ok, idx_p, idx_s])
+        bf_tp_dct_out[spc] = bf_tp_dct_i
 
         # write file with the BFs
-        if num_data_highenough > 0 and savefile:
+        if savefile:
+            bf_df_sp_i = pd.DataFrame(
+                np.where(bf_ok[..., idx_s], bf_arr[..., idx_s], 0.),
+                index=temps, columns=pressures)
             bf_df_sp_i = bf_df_sp_i.reset_index()
             bf_df_sp_i = bf_df_sp_i.rename(columns = {'index': 0})
             header_label = np.array(sorted(bf_df_sp_i.columns[1:]), dtype=str)
@@ -76,9 +76,12 @@ def comb_dcts(dct1, dct2, rename_instr, target_type='rxn', ste_dct=None):
     renamed_dct2, _ = compare.rename_species(dct2, rename_instr, target_type)
 
     # Remove any instances in dct2 that are in dct1
+    if target_type == 'rxn':
+        rxn_idx2 = compare.rxn_index(renamed_dct2)
     for key in dct1.keys():  # key is either spc or rxn
         if target_type == 'rxn':
-            matching_rxn, _ = compare.assess_rxn_match(key, renamed_dct2)
+            matching_rxn, _ = compare.assess_rxn_match(
+                key, renamed_dct2, rxn_idx2=rxn_idx2)
             if key in ste_dct:
                 renamed_dct2.pop(key)
             elif matching_rxn:
@@ -3,13 +3,13 @@
 """
 
 import copy
-import itertools
 import numpy
 from phydat import phycon
 from chemkin_io.writer import _util as writer_util
 import ratefit
-from automol.chi import without_stereo
 from ioformat import pathtools
+from mechanalyzer import cache
+from mechanalyzer.calculator import thermo
 from mechanalyzer.parser import spc as spc_parser
 
 RC_CAL = phycon.RC_CAL  # universal gas constant in cal/mol-K
@@ -250,45 +250,91 @@ def get_rename_instr(mech_spc_dct1, mech_spc_dct2, strip_ste=True):
     """ Get instructions for renaming mech_spc_dct2 to be consistent with
         mech_spc_dct1
 
+        Species are joined through a fingerprint index of mech_spc_dct1 (see
+        spc_index), so each species in mech_spc_dct2 is matched with a single
+        lookup instead of a comparison against every species in
+        mech_spc_dct1
+
         :param mech_spc_dct1: the reference mech_spc_dct
         :type mech_spc_dct1: dct {spc1: ident_array1, spc2: ...}
         :param mech_spc_dct2: the mech_spc_dct to be renamed
         :type mech_spc_dct2: dct {spc1: ident_array1, spc2: ...}
+        :param strip_ste: whether or not to ignore stereo when comparing spcs
+        :type strip_ste: Bool
         :return rename_instr: instructions for renaming spcs in mech_spc_dct2
         :rtype: dct {spc_to_be_renamed1: new_name1, ...}
     """
 
-    rename_instr = {}
     rename_str = '-zz'
-    already_done = []
-
-    # Loop through each species in mech1
-    for spc1, spc_dct1 in mech_spc_dct1.items():
-        ich1, mlt1, chg1, exc1, fml1 = _read_spc_dct(spc_dct1)
-        # Strip stereo layer(s) if indicated
-        if strip_ste:
-            ich1 = without_stereo(ich1)
-        # Loop over each spc in mech_spc_dct2
-        for spc2, spc_dct2 in mech_spc_dct2.items():
-            # First, check if the species has already been done
-            if spc2 in already_done:
-                continue  # skip everything below and go to next spc2
-            # Check if species are identical
-            spc_same = are_spc_same(ich1, mlt1, chg1, exc1, fml1, spc_dct2, 
-                                    strip_ste=strip_ste)
-            # If species are identical
-            if spc_same:
-                if spc1 != spc2:  # if spc names different, add to rename_instr
-                    rename_instr[spc2] = spc1
-                    already_done.append(spc2)
-            # If species are different but have same name
-            elif spc1 == spc2:
-                rename_instr[spc2] = spc2 + rename_str
-                # Note: don't add to already_done; this works for now
+    spc_idx1 = spc_index(mech_spc_dct1, strip_ste=strip_ste)
+    spc_pos1 = {spc1: pos1 for pos1, spc1 in enumerate(mech_spc_dct1)}
+
+    # Loop over each spc in mech_spc_dct2 and look up its identical spcs
+    ordered_instr = []
+    for pos2, (spc2, spc_dct2) in enumerate(mech_spc_dct2.items()):
+        matches = spc_idx1.get(spc_fingerprint(spc_dct2, strip_ste=strip_ste),
+                               ())
+        # Identical spc with a different name in mech1; the first one wins
+        new_spc = next((spc1 for spc1 in matches if spc1 != spc2), None)
+        # Different spc that has the same name in mech1
+        same_name = spc2 in spc_pos1 and spc2 not in matches
+        if new_spc is not None:
+            pos1 = spc_pos1[new_spc]
+            if same_name:
+                pos1 = min(pos1, spc_pos1[spc2])
+            ordered_instr.append((pos1, pos2, spc2, new_spc))
+        elif same_name:
+            ordered_instr.append(
+                (spc_pos1[spc2], pos2, spc2, spc2 + rename_str))
+
+    # Order the instructions as if mech_spc_dct1 were looped over
+    rename_instr = {spc2: new_spc
+                    for _, _, spc2, new_spc in sorted(ordered_instr)}
 
     return rename_instr
 
 
+def spc_index(mech_spc_dct, strip_ste=True):
+    """ Builds an index of the species in a mech_spc_dct by fingerprint
+
+        :param mech_spc_dct: the mech_spc_dct to be indexed
+        :type mech_spc_dct: dct {spc1: ident_array1, spc2: ...}
+        :param strip_ste: whether or not to ignore stereo in the fingerprints
+        :type strip_ste: Bool
+        :return spc_idx: species names for each fingerprint, in mech order
+        :rtype: dct {fingerprint: [spc1, spc2, ...]}
+    """
+
+    spc_idx = {}
+    for spc, spc_dct in mech_spc_dct.items():
+        fprint = spc_fingerprint(spc_dct, strip_ste=strip_ste)
+        spc_idx.setdefault(fprint, []).append(spc)
+
+    return spc_idx
+
+
+def spc_fingerprint(spc_dct, strip_ste=True, canon_ent=False):
+    """ Gets a hashable key identifying a species; species with the same
+        fingerprint are considered the same by are_spc_same
+
+        :param spc_dct: identifying info for a single species
+        :type spc_dct: dct
+        :param strip_ste: whether or not to remove the stereo layers
+        :type strip_ste: Bool
+        :param canon_ent: whether or not to use the canonical enantiomer InChI
+        :type canon_ent: Bool
+        :return fprint: (inchi, mult, charge, exc_flag, formula)
+        :rtype: tuple
+    """
+
+    ich, mlt, chg, exc, fml = _read_spc_dct(spc_dct, canon_ent=canon_ent)
+    if strip_ste:
+        ich = cache.without_stereo(ich)
+    fml = tuple(sorted(fml.items()))
+
+    return ich, mlt, chg, exc, fml
+
+
 def are_spc_same(ich1, mlt1, chg1, exc1, fml1, spc_dct2, strip_ste=False, 
                  canon_ent=False):
     """ Compares two species dictionaries to see if they are the same
@@ -323,7 +369,7 @@ def are_spc_same(ich1, mlt1, chg1, exc1, fml1, spc_dct2, strip_ste=False,
 
     # Finally, (maybe) remove the stereo part of the inchi and compare inchis
     if strip_ste:
-        ich2 = without_stereo(ich2)  # this is expensive, so saving for last
+        ich2 = cache.without_stereo(ich2)  # this is expensive, so saving for last
     if ich1 != ich2:
         return False
     return True
@@ -340,30 +386,8 @@ def get_comb_mech_spc_dct(mech_spc_dct1, mech_spc_dct2):
         :rtype: dct {spc1: ident_array1, spc2: ...}
     """
 
-    rename_instr = get_rename_instr(mech_spc_dct1, mech_spc_dct2)
-    rename_str = '-zz'
     comb_mech_spc_dct = copy.deepcopy(mech_spc_dct1)  # deepcopy = no external changes
-    for spc2, spc_dct2 in mech_spc_dct2.items():
-        unique = True
-        ich2 = spc_dct2['inchi']
-        mlt2 = spc_dct2['mult']
-        chg2 = spc_dct2['charge']
-
-        for spc_dct1 in mech_spc_dct1.values():
-            ich1 = spc_dct1['inchi']
-            mlt1 = spc_dct1['mult']
-            chg1 = spc_dct1['charge']
-
-            if ich1 == ich2 and mlt1 == mlt2 and chg1 == chg2:
-                if spc2 in rename_instr:
-                    unique = False
-                break
-
-        if unique:
-            if spc2 in rename_instr:
-                comb_mech_spc_dct[spc2 + rename_str] = spc_dct2
-            else:
-                comb_mech_spc_dct[spc2] = spc_dct2
+    _add_unique_spcs(comb_mech_spc_dct, mech_spc_dct2)
 
     return comb_mech_spc_dct
 
@@ -376,14 +400,34 @@ def get_mult_comb_mech_spc_dct(mech_spc_dcts):
         :return comb_mech_spc_dct: mech_spc_dct with all unique species
         :rtype: dct {spc1: ident_array1, spc2: ...}
     """
-    num_combs = len(mech_spc_dcts) - 1  # n-1 combinations to do
+
     comb_mech_spc_dct = copy.deepcopy(mech_spc_dcts[0])
-    for idx in range(num_combs):
-        comb_mech_spc_dct = get_comb_mech_spc_dct(comb_mech_spc_dct, mech_spc_dcts[idx + 1])
+    for mech_spc_dct in mech_spc_dcts[1:]:  # n-1 combinations to do
+        _add_unique_spcs(comb_mech_spc_dct, mech_spc_dct)
 
     return comb_mech_spc_dct
 
 
+def _add_unique_spcs(comb_mech_spc_dct, mech_spc_dct2):
+    """ Adds to comb_mech_spc_dct (in place) any spcs unique to mech_spc_dct2
+    """
+
+    rename_instr = get_rename_instr(comb_mech_spc_dct, mech_spc_dct2)
+    rename_str = '-zz'
+    # Exact (i.e., with stereo) identities of the spcs already present
+    exact_keys1 = set((spc_dct1['inchi'], spc_dct1['mult'],
+                       spc_dct1['charge'])
+                      for spc_dct1 in comb_mech_spc_dct.values())
+    for spc2, spc_dct2 in mech_spc_dct2.items():
+        exact_key2 = (spc_dct2['inchi'], spc_dct2['mult'], spc_dct2['charge'])
+        unique = not (exact_key2 in exact_keys1 and spc2 in rename_instr)
+        if unique:
+            if spc2 in rename_instr:
+                comb_mech_spc_dct[spc2 + rename_str] = spc_dct2
+            else:
+                comb_mech_spc_dct[spc2] = spc_dct2
+
+
 def rename_species(target_dct, rename_instr, target_type='rxn'):
     """ Rename the species inside a rxn_ktp_dct, rxn_param_dct, or thermo_dct according to the
         instructions inside the rename_instr.
@@ -421,6 +465,7 @@ def rename_species(target_dct, rename_instr, target_type='rxn'):
 
     # If a rxn_ktp_dct
     if target_type == 'rxn':
+        renamed_idx = {}  # index of renamed_dct, updated as rxns are added
         for rcts, prds, third_bods in target_dct.keys():
             new_rcts = []
             new_prds = []
@@ -453,12 +498,15 @@ def rename_species(target_dct, rename_instr, target_type='rxn'):
             new_prds = tuple(new_prds)
             new_third_bods = tuple(new_third_bods)
             # See if new reaction is already in the renamed dct
-            match, _ = assess_rxn_match((new_rcts, new_prds, new_third_bods), renamed_dct)
+            match, _ = assess_rxn_match((new_rcts, new_prds, new_third_bods), renamed_dct,
+                                        rxn_idx2=renamed_idx)
             if match:
                 ste_dct[match].append((rcts, prds, third_bods))
             else:
                 renamed_dct[new_rcts, new_prds, new_third_bods] = target_dct[rcts, prds, third_bods]
                 ste_dct[new_rcts, new_prds, new_third_bods] = [(rcts, prds, third_bods),]
+                add_to_rxn_index(renamed_idx, (new_rcts, new_prds, new_third_bods),
+                                 len(renamed_dct) - 1)
 
         # Remove any rxns in ste_dct that only have one item in the list;
         # these are reactions without any stereo reactions
@@ -535,29 +583,39 @@ def reverse_rxn_ktp_dct(rxn_ktp_dct1, rxn_ktp_dct2, spc_therm_dct2, temps, rev_r
         :type rev_rates: Bool
     """
     rev_rxn_ktp_dct2 = copy.deepcopy(rxn_ktp_dct2)  # deepcopy to prevent external changes
+    rxn_idx2 = rxn_index(rxn_ktp_dct2)  # built once for all lookups
+    matches = []
     for rxn1 in rxn_ktp_dct1.keys():  # search through all rxns in rxn_ktp_dct1
-        rxn2, rev_rate = assess_rxn_match(rxn1, rxn_ktp_dct2)
+        rxn2, rev_rate = assess_rxn_match(rxn1, rxn_ktp_dct2, rxn_idx2=rxn_idx2)
         # Only do something if a match was found
         if rxn2 is not None:
-            # If the user indicated to reverse rates, check if they need to be
-            if rev_rates:
-                if rev_rate:
-                    ktp_dct2 = rxn_ktp_dct2[rxn2]
-                    rev_ktp_dct2 = reverse_ktp_dct(ktp_dct2, spc_therm_dct2, rxn2, temps)
-                    rev_rxn_ktp_dct2.pop(rxn2)
-                    rev_rxn_ktp_dct2[rxn1] = rev_ktp_dct2
-                # If a match was found that does not need to be reversed but has rcts and prds
-                # written differently, align rcts and prds
-                elif rxn1 != rxn2:
-                    rev_rxn_ktp_dct2[rxn1] = rev_rxn_ktp_dct2[rxn2]
-                    rev_rxn_ktp_dct2.pop(rxn2)
-
-            # Otherwise, rename rxn2 so that rcts and prds are in the same order (if not already)
-            # Only do so if the rxns should not be flipped!
-            elif rxn1 != rxn2 and not rev_rate:
+            matches.append((rxn1, rxn2, rev_rate))
+
+    # Reverse all rxns that need it at once
+    if rev_rates:
+        rev_ktp_dcts2 = reverse_ktp_dcts(
+            {rxn2: rxn_ktp_dct2[rxn2] for _, rxn2, rev_rate in matches
+             if rev_rate},
+            spc_therm_dct2, temps)
+
+    for rxn1, rxn2, rev_rate in matches:
+        # If the user indicated to reverse rates, check if they need to be
+        if rev_rates:
+            if rev_rate:
+                rev_rxn_ktp_dct2.pop(rxn2)
+                rev_rxn_ktp_dct2[rxn1] = rev_ktp_dcts2[rxn2]
+            # If a match was found that does not need to be reversed but has rcts and prds
+            # written differently, align rcts and prds
+            elif rxn1 != rxn2:
                 rev_rxn_ktp_dct2[rxn1] = rev_rxn_ktp_dct2[rxn2]
                 rev_rxn_ktp_dct2.pop(rxn2)
 
+        # Otherwise, rename rxn2 so that rcts and prds are in the same order (if not already)
+        # Only do so if the rxns should not be flipped!
+        elif rxn1 != rxn2 and not rev_rate:
+            rev_rxn_ktp_dct2[rxn1] = rev_rxn_ktp_dct2[rxn2]
+            rev_rxn_ktp_dct2.pop(rxn2)
+
     return rev_rxn_ktp_dct2
 
 
@@ -576,37 +634,54 @@ def reverse_ktp_dct(ktp_dct, spc_therm_dct, rxn, temps):
         :return rev_ktp_dct: k(T,P) dct of the reversed reaction
         :type ktp_dct: dict {pressure1: (temp_array1, rates_array1), pressure2: ...}
     """
-    [rcts, prds, _] = rxn
-    k_equils = _calculate_equilibrium_constant(spc_therm_dct, rcts, prds, temps)
-    rev_ktp_dct = {}
-    for pressure, (_, kts) in ktp_dct.items():
+    rev_ktp_dct = reverse_ktp_dcts({rxn: ktp_dct}, spc_therm_dct, temps)[rxn]
 
-        # Calculate density to handle units, if needed
+    return rev_ktp_dct
+
+
+def reverse_ktp_dcts(rxn_ktp_dct, spc_therm_dct, temps):
+    """ Reverse the rate constants of all reactions in a rxn_ktp_dct at once,
+        using equilibrium constants from the thermochemistry of the species.
+
+        :param rxn_ktp_dct: k(T,P) dcts of the reactions to be reversed
+        :type rxn_ktp_dct: dict {rxn1: ktp_dct1, rxn2: ...}
+        :param spc_therm_dct: thermochemical values for all species in mechanism
+        :type spc_therm_dct: dict {spc1: thermo_array1, spc2: ...}
+        :param temps: temperatures at which to do calculations (Kelvin)
+        :type temps: list [float]
+        :return rev_rxn_ktp_dct: k(T,P) dcts of the reversed reactions, under the
+            original rxn keys
+        :rtype: dict {rxn1: rev_ktp_dct1, rxn2: ...}
+    """
+    rxns = tuple(rxn_ktp_dct.keys())
+    k_equils = calculate_equilibrium_constants(rxns, spc_therm_dct, temps)
+
+    # Convert between concentration units if the molecularity changes
+    densities = ratefit.calc.p_to_m(1.0, numpy.array(temps, dtype=float))
+    factors = numpy.ones((len(rxns), len(densities)))
+    for rxn_idx, (rcts, prds, _) in enumerate(rxns):
         if len(rcts) > 1 and len(prds) == 1:
-            densities = ratefit.calc.p_to_m(1.0, temps)
-            kts *= densities
+            factors[rxn_idx] = densities
         elif len(rcts) == 1 and len(prds) > 1:
-            densities = ratefit.calc.p_to_m(1.0, temps)
-            kts /= densities
+            factors[rxn_idx] = 1.0 / densities
+    rev_factors = factors / k_equils
 
-        # Calculate the reverse rates with K_equil
-        rev_rates = []
-        for forw_k, k_equil in zip(kts, k_equils):
-            rev_rates.append(forw_k / k_equil)
+    rev_rxn_ktp_dct = {}
+    for rxn_idx, (rxn, ktp_dct) in enumerate(rxn_ktp_dct.items()):
+        rev_rxn_ktp_dct[rxn] = {}
+        for pressure, (_, kts) in ktp_dct.items():
+            rev_rxn_ktp_dct[rxn][pressure] = (temps, kts * rev_factors[rxn_idx])
 
-        # Add reversed rates to dict
-        rev_ktp_dct[pressure] = (temps, rev_rates)
+    return rev_rxn_ktp_dct
 
-    return rev_ktp_dct
 
-
-def assess_rxn_match(rxn1, rxn_ktp_dct2):
+def assess_rxn_match(rxn1, rxn_ktp_dct2, rxn_idx2=None):
     """ Assess whether the reaction should be flipped. Takes a rxn_name from mech1 and searches
-        through all of mech2 in search of a matching rxn. If a matching rxn is found, returns the
+        mech2 in search of a matching rxn. If a matching rxn is found, returns the
         matching rxn name and whether the rxn should be flipped
 
         Note: it is possible that a poorly constructed mechanism will have more than one instance
-        of the same reaction. This function will only return the first instance of any matching
+        of the same reaction. This function will only return the last instance of any matching
         reaction. However, it will print out a warning if duplicate matching reactions are
         found.
 
@@ -614,97 +689,146 @@ def assess_rxn_match(rxn1, rxn_ktp_dct2):
         :type rxn1: tuple (rcts, prds, third_bods)
         :param rxn_ktp_dct2: rxn_ktp_dct for mech2
         :type rxn_ktp_dct2: dict {rxn1: ktp_dct1, rxn2: ...}
+        :param rxn_idx2: index of the rxns in rxn_ktp_dct2 (see rxn_index); built
+            from rxn_ktp_dct2 if not given, so pass it in when doing many lookups
+        :type rxn_idx2: dict {canon_key: [(position, rxn2), ...]}
         :return matching_rxn: rxn key of matching reaction; None if no match
         :rtype: tuple (rcts, prds, third_bods)
         :return rev_rate: whether or not the rate should be reversed
         :rtype: Bool
     """
 
-    def check_third_bod(third_bod1, third_bod2):
-        """ Checks if two third bodies are the same. Accounts for the case
-            where one is None and the other is '(+M)' or '+M'
-        """
-
-        are_same = False
-        if third_bod1 == third_bod2:
-            are_same = True
-        #elif third_bod1 is None and third_bod2 == '(+M)':
-        elif third_bod1 is None and third_bod2 in ('(+M)', '+M'):
-            are_same = True
-        #elif third_bod1 == '(+M)' and third_bod2 is None:
-        elif third_bod1 in ('(+M)', '+M') and third_bod2 is None:
-            are_same = True
-
-        return are_same
-
-    # Get all possible orderings of the reactants and products for mech1
-    [rcts1, prds1, third_bods1] = rxn1
-    third_bod1 = third_bods1[0]
-    rcts1_perm = list(itertools.permutations(rcts1, len(rcts1)))
-    prds1_perm = list(itertools.permutations(prds1, len(prds1)))
-
-    matching_rxn_name = None
-    rev_rate = None
-    already_found = False
-    for rxn2 in rxn_ktp_dct2.keys():
-        [rcts2, prds2, third_bods2] = rxn2
-        third_bod2 = third_bods2[0]
-        same_third_bod = check_third_bod(third_bod1, third_bod2)
-        if rcts2 in rcts1_perm and prds2 in prds1_perm and same_third_bod:
-            matching_rxn_name = rxn2
-            rev_rate = False
-            if already_found:
-                rxn_name1 = writer_util.format_rxn_name(rxn1)
-                rxn_name2 = writer_util.format_rxn_name(rxn2)
-                print(f'For the reaction {rxn_name1}, more than one match was found: {rxn_name2}')
-                print('This will cause errors!')
-            else:
-                already_found = True
-
-        elif rcts2 in prds1_perm and prds2 in rcts1_perm and same_third_bod:
-            matching_rxn_name = rxn2
-            rev_rate = True
-            if already_found:
-                rxn_name1 = writer_util.format_rxn_name(rxn1)
-                rxn_name2 = writer_util.format_rxn_name(rxn2)
-                print(f'For the reaction {rxn_name1}, more than one match was found: {rxn_name2}')
-                print('This will cause errors!')
-            else:
-                already_found = True
+    if rxn_idx2 is None:
+        rxn_idx2 = rxn_index(rxn_ktp_dct2)
+
+    # Look up the forward and reverse canonical keys of rxn1
+    srt_rcts1, srt_prds1, third_bod_key1 = canon_rxn_key(rxn1)
+    third_bod1 = rxn1[2][0]
+    fwd_key = (srt_rcts1, srt_prds1, third_bod_key1)
+    rev_key = (srt_prds1, srt_rcts1, third_bod_key1)
+
+    # Only keep rxns still in rxn_ktp_dct2 whose third bodies truly match
+    matches = []
+    for pos, rxn2 in rxn_idx2.get(fwd_key, ()):
+        if rxn2 in rxn_ktp_dct2 and _same_third_bod(third_bod1, rxn2[2][0]):
+            matches.append((pos, rxn2, False))
+    if rev_key != fwd_key:  # A=A-type rxns are only forward matches
+        for pos, rxn2 in rxn_idx2.get(rev_key, ()):
+            if rxn2 in rxn_ktp_dct2 and _same_third_bod(third_bod1, rxn2[2][0]):
+                matches.append((pos, rxn2, True))
+    matches.sort(key=lambda match: match[0])  # order as in rxn_ktp_dct2
+
+    # Report any duplicate matches
+    for _, rxn2, _ in matches[1:]:
+        rxn_name1 = writer_util.format_rxn_name(rxn1)
+        rxn_name2 = writer_util.format_rxn_name(rxn2)
+        print(f'For the reaction {rxn_name1}, more than one match was found: {rxn_name2}')
+        print('This will cause errors!')
+
+    if matches:
+        _, matching_rxn_name, rev_rate = matches[-1]
+    else:
+        matching_rxn_name = None
+        rev_rate = None
 
     return matching_rxn_name, rev_rate
 
 
-def _calculate_equilibrium_constant(spc_therm_dct, rcts, prds, temps):
-    """ Calculate the equilibrium constant for a given reaction at
-        a set of temperatures using constituent species' thermochemistry.
+def rxn_index(rxn_dct):
+    """ Builds an index of the rxns in a rxn dct (e.g., a rxn_ktp_dct or
+        rxn_param_dct) that is keyed by a canonical form of each rxn (see
+        canon_rxn_key), so that forward and reverse matches of a rxn can be
+        found without scanning the whole dct.
+
+        :param rxn_dct: dct with rxn keys
+        :type rxn_dct: dict {rxn1: value1, rxn2: ...}
+        :return rxn_idx: rxns (and their position in rxn_dct) for each key
+        :rtype: dict {canon_key: [(position, rxn), ...]}
+    """
+
+    rxn_idx = {}
+    for pos, rxn in enumerate(rxn_dct.keys()):
+        add_to_rxn_index(rxn_idx, rxn, pos)
+
+    return rxn_idx
+
+
+def add_to_rxn_index(rxn_idx, rxn, pos):
+    """ Adds a rxn to an existing rxn_idx (in place)
+
+        :param rxn_idx: index made by rxn_index
+        :type rxn_idx: dict {canon_key: [(position, rxn), ...]}
+        :param rxn: rxn key
+        :type rxn: tuple (rcts, prds, third_bods)
+        :param pos: position of the rxn in the indexed dct
+        :type pos: int
+    """
+    rxn_idx.setdefault(canon_rxn_key(rxn), []).append((pos, rxn))
+
+
+def canon_rxn_key(rxn):
+    """ Gets a canonical key for a rxn: the sorted reactants, the sorted
+        products, and a normalized third body, where None, '(+M)', and '+M'
+        all map to '+M'. Rxns that match in assess_rxn_match share a key (the
+        reverse rxn has the reactants and products swapped).
+
+        :param rxn: rxn key
+        :type rxn: tuple (rcts, prds, third_bods)
+        :return canon_key: canonical key
+        :rtype: tuple (sorted rcts, sorted prds, third_bod)
+    """
+
+    rcts, prds, third_bods = rxn
+    third_bod = third_bods[0]
+    if third_bod in (None, '(+M)', '+M'):
+        third_bod = '+M'
+
+    return (tuple(sorted(rcts)), tuple(sorted(prds)), third_bod)
+
+
+def _same_third_bod(third_bod1, third_bod2):
+    """ Checks if two third bodies are the same. Accounts for the case
+        where one is None and the other is '(+M)' or '+M'
+    """
+
+    are_same = False
+    if third_bod1 == third_bod2:
+        are_same = True
+    elif third_bod1 is None and third_bod2 in ('(+M)', '+M'):
+        are_same = True
+    elif third_bod1 in ('(+M)', '+M') and third_bod2 is None:
+        are_same = True
+
+    return are_same
+
+
+def calculate_equilibrium_constants(rxns, spc_therm_dct, temps):
+    """ Calculate the equilibrium constants of a set of reactions at a set of
+        temperatures using constituent species' thermochemistry. The reaction
+        Gibbs energies are obtained at once from the stoichiometry matrix.
 
+        :param rxns: rxn keys
+        :type rxns: tuple ((rcts1, prds1, third_bods1), ...)
         :param spc_therm_dct: thermochemical values for all mechanism species
         :type spc_therm_dct: dict {spc1: thermo_array1, spc2: ...}
-        :param rcts: name(s) of reactant(s)
-        :type rcts: tuple (rct1, rct2, ...)
-        :param prds: name(s) of product(s)
-        :type prds: tuple (prd1, prd2, ...)
         :param temps: temperatures at which to do calculations (Kelvin)
         :type temps: list [float]
-        :return k_equils: equilibrium constant at each temperature
-        :rtype: list [float]
+        :return k_equils: equilibrium constant of each rxn at each temperature
+        :rtype: numpy.ndarray of shape (nrxn, ntemp)
     """
-    k_equils = []
-    for temp_idx, temp in enumerate(temps):
-        rct_gibbs = 0.0
-        for rct in rcts:
-            try:
-                rct_gibbs += spc_therm_dct[rct][4][temp_idx]  # [4] accesses Gibbs
-            except:
-                breakpoint()
-
-        prd_gibbs = 0.0
-        for prd in prds:
-            prd_gibbs += spc_therm_dct[prd][4][temp_idx]  # [4] accesses Gibbs
-
-        rxn_gibbs = prd_gibbs - rct_gibbs
-        k_equils.append(numpy.exp(-rxn_gibbs / (RC_CAL * temp)))
+    temps = numpy.array(temps, dtype=float)
+    spc_idx = {}
+    for rcts, prds, _ in rxns:
+        for spc in rcts + prds:
+            spc_idx.setdefault(spc, len(spc_idx))
+    smat = thermo.stoich_matrix(
+        [(rcts, prds) for rcts, prds, _ in rxns], spc_idx)
+    gibbs = numpy.zeros((len(spc_idx), len(temps)))
+    for spc, idx in spc_idx.items():
+        gibbs[idx] = spc_therm_dct[spc][4][:len(temps)]  # [4] accesses Gibbs
+
+    rxn_gibbs = smat @ gibbs
+    k_equils = numpy.exp(-rxn_gibbs / (RC_CAL * temps))
 
     return k_equils
 
@@ -197,6 +197,8 @@ class PEDModels:
         self.ene_dos0 = None
         self.f_rho_rovib_prod1 = None
         self.f_rho_rovib_prod2 = None
+        # P(E1|E) kernels: {(model, phi, grid): kernel}
+        self.kernel_dct = {}
 
         try:
             self.mw_dct = dof_info['mw']
@@ -333,65 +335,19 @@ class PEDModels:
                 pressure*101325,
                 temp, mass2=self.mw_dct[self.prod2])
 
-            # calculate rho_non1(ene1_vect)
-            rho_non1 = []
-            for idx in self.ene1_vect:
-                # first iter should be 0
-                # the sum of the energies in rhovib_prod2 and
-                # rho_trasl is always ene1
-                idx_ene_int = np.arange(0, idx+1, dtype=int)
-                idx_ene_minus_ene_int = idx_ene_int[::-1]
-                rho_non1_integrand = (
-                    rho_rovib_prod2[idx_ene_int] *
-                    rho_trasl[idx_ene_minus_ene_int]
-                )
-                try:
-                    rho_non1.append(np.trapz(rho_non1_integrand,
-                                             x=self.ene1_vect[idx_ene_int]))
-                except IndexError:
-                    continue
-                    #probably just missed 1 index
-                    #print(pressure, temp, self.ene1_vect, idx, idx_ene_int)
-
-            rho_non1 = np.array(rho_non1)
+            # calculate rho_non1(ene1_vect): all the convolution integrals
+            # int(rho_rovib_prod2(ene)*rho_trasl(ene1-ene)dene) at once
+            # the sum of the energies in rhovib_prod2 and
+            # rho_trasl is always ene1
+            rho_non1_conv = trapz_convolution(
+                rho_rovib_prod2, rho_trasl, self.ene1_vect)
+            # upper integration index for each ene1: first iter should be 0
+            idx_ene_int = np.ceil(np.asarray(self.ene1_vect) + 1).astype(int) - 1
+            rho_non1 = rho_non1_conv[
+                idx_ene_int[idx_ene_int < len(self.ene1_vect)]]
 
             return rho_rovib_prod1, rho_non1
 
-        def dos(idx_ene1, idx_ene_new):
-            """ Calculate density of states """
-
-            prob_ene1ene = []
-            # loops over total energy:
-            # loop over the idxs where you find enetot in ene1vect
-            for idx_ene in idx_ene_new:
-
-                if idx_ene1 == idx_ene:
-                    # rho1(ene1)*rhonon1(ene-ene1) = 0
-                    prob_ene1ene.append(0)
-                    continue
-                # index of ene1<ene (fixed ene)
-                idx_ene1_array = np.arange(0, idx_ene)
-                # index of ene-ene1 (fixed ene)
-                idx_ene_minus_ene1_array = idx_ene1_array[::-1]
-                rho1_ene1 = self.rho_rovib_prod1[idx_ene1]
-                rho_non1 = self.rho_non1[idx_ene_minus_ene1_array[idx_ene1]]
-                # rho1(ene1) with ene1<ene (fixed ene)
-                rho1_ene1_array = self.rho_rovib_prod1[idx_ene1_array]
-                # rhonon1(ene-ene1) with ene1<ene (fixed ene)
-                rho_non1_array = self.rho_non1[idx_ene_minus_ene1_array]
-                num = rho1_ene1 * rho_non1
-                den = np.trapz(rho1_ene1_array*rho_non1_array,
-                               x=self.ene1_vect[idx_ene1_array])
-                # if for some reason you get den=0: append 0 as value
-                if den == 0:
-                    prob_ene1ene.append(0)
-                else:
-                    prob_ene1ene.append(num/den)
-
-            prob_ene1ene = np.array(prob_ene1ene)
-            # print(prob_ene1ene)
-            return prob_ene1ene
-
         def dostherm_rhovibtrasl(idx_ene_vect, temp):
             """ Calculate density of states
                 include also translational density of states
@@ -432,9 +388,34 @@ class PEDModels:
 
             return f_Etot
 
+        def ped_kernel(idx_ene_vect, pressure, temp):
+            """ P(E1|E) kernel on the grid ene1_vect, with the trapezoid
+                weights of the integration over E: P(E1) = kernel @ PED(E)
+            """
+            if distr_type == 'dos':
+                # rho_trasl scales as temp/pressure, which cancels out
+                # in the normalized kernel: any T, P of the grid will do
+                self.rho_rovib_prod1, self.rho_non1 = init_dos(
+                    pressure, temp)
+                kernel = dos_kernel(
+                    self.rho_rovib_prod1, self.rho_non1,
+                    self.ene1_vect, idx_ene_vect)
+            else:  # 'phi'
+                # P(E1|E) for all E1, E; integration over E >= E1 only
+                ene1_vect = np.asarray(self.ene1_vect, dtype=float)
+                prob_ene1ene = norm_distr(
+                    ene1_vect[:, None], ene1_vect[None, idx_ene_vect],
+                    self.phi)
+                kernel = prob_ene1ene * trapz_tail_weights(
+                    ene1_vect, idx_ene_vect)
+
+            return kernel
+
         # preallocations
         ped_df_prod = pd.DataFrame(index=self.ped_df.index,
                                    columns=self.ped_df.columns, dtype=object)
+        # T, P sharing the same grid: {kernel key: [(T, P, PED(E))]}
+        grid_cells_dct = {}
 
         for pressure in self.ped_df.columns:
             for temp in self.ped_df.sort_index().index:
@@ -455,49 +436,23 @@ class PEDModels:
                             steps_to_zero+1)[1:-1]
 
                         # ^ includes enemax
-                        self.ene1_vect = np.sort(
+                        ene1_vect = np.sort(
                             np.concatenate((ene1_vect_low, ene)))
                     else:
-                        self.ene1_vect = ene
+                        ene1_vect_low = np.array([])
+                        ene1_vect = np.asarray(ene, dtype=float)
                     # idx_ene_vect: indices in ene1_vect corresponding to values
-                    # of ene: ene[0]=self.ene1_vect[idx_ene_vect[0]]
+                    # of ene: ene[0]=ene1_vect[idx_ene_vect[0]]
                     idx_ene_vect = np.arange(
-                        len(ene1_vect_low), len(self.ene1_vect))
+                        len(ene1_vect_low), len(ene1_vect))
                     # if idx_en and ped not the same length: drop 1 ped val
                     if len(idx_ene_vect) == len(ped_series.values)-1:
                         ped_series = ped_series.iloc[:-1]
 
-                    if distr_type == 'dos':
-                        self.rho_rovib_prod1, self.rho_non1 = init_dos(
-                            pressure, temp)
-
-                    prob_ene1_vect = []
-
-                    for idx_ene1, ene1 in enumerate(self.ene1_vect):
-                        # indexes from self.ene1_vect: almost identical
-                        # to energies in ene, but more consistent
-                        idx_ene_new = idx_ene_vect[idx_ene_vect >= idx_ene1]
-                        ene_new = self.ene1_vect[idx_ene_new]
-                        if distr_type == 'phi':
-                            prob_ene1ene = norm_distr(
-                                ene1, ene_new, self.phi)
-                        elif distr_type == 'dos':
-                            # elif distr_type == 'dos' or distr_type == 'therm':
-                            prob_ene1ene = dos(idx_ene1, idx_ene_new)
-
-                        # if distr_type != 'therm':
-                        prob_ene1ene_tot_pressure_ped = (
-                            prob_ene1ene *
-                            ped_series.values[idx_ene_vect >= idx_ene1]
-                        )
-
-                        prob_ene1 = np.trapz(
-                            prob_ene1ene_tot_pressure_ped, ene_new)
-                        prob_ene1_vect.append(prob_ene1)
-
-                    norm_factor_prob_ene1 = np.trapz(
-                        prob_ene1_vect, x=self.ene1_vect)
-                    prob_ene1_norm = prob_ene1_vect/norm_factor_prob_ene1
+                    kernel_key = (distr_type, self.phi, len(ene1_vect_low),
+                                  tuple(ene1_vect))
+                    grid_cells_dct.setdefault(kernel_key, []).append(
+                        (temp, pressure, ped_series.values))
 
                 # optn 2
                 elif distr_type == 'therm':
@@ -508,7 +463,27 @@ class PEDModels:
                     # self.rho_non1 = dos_trasl(
                     #    self.mw_dct[self.prod1], self.ene1_vect, pressure*101325, temp)
                     # prob_ene1_norm = dosthermtest(np.arange(0, len(self.ene1_vect)), temp).values
-
+                    ped_df_prod.at[temp, pressure] = pd.Series(
+                        prob_ene1_norm, index=self.ene1_vect)
+
+        # P(E1) = int(P(E1|E)*PED(E)dE) for all the T, P of each grid:
+        # one kernel and one matrix product per grid
+        for kernel_key, cells in grid_cells_dct.items():
+            self.ene1_vect = np.array(kernel_key[3])
+            idx_ene_vect = np.arange(kernel_key[2], len(self.ene1_vect))
+            if kernel_key not in self.kernel_dct:
+                temp, pressure, _ = cells[0]
+                self.kernel_dct[kernel_key] = ped_kernel(
+                    idx_ene_vect, pressure, temp)
+
+            ped_arr = np.column_stack([ped for _, _, ped in cells])
+            prob_ene1_arr = self.kernel_dct[kernel_key] @ ped_arr
+            norm_factor_prob_ene1 = np.trapz(
+                prob_ene1_arr, x=self.ene1_vect, axis=0)
+            prob_ene1_arr = prob_ene1_arr/norm_factor_prob_ene1
+
+            for (temp, pressure, _), prob_ene1_norm in zip(
+                    cells, prob_ene1_arr.T):
                 ped_df_prod.at[temp, pressure] = pd.Series(
                     prob_ene1_norm, index=self.ene1_vect)
 
@@ -696,6 +671,112 @@ def dos_trasl(mass1, ene_grid, pressure, temp, mass2=0):
 
     return rho_kcal_mol
 
+
+def trapz_weights(xvals):
+    """ Weights of the trapezoid rule on a grid:
+        np.trapz(yvals, x=xvals) = trapz_weights(xvals) @ yvals
+
+        :param xvals: grid points
+        :type xvals: array
+        :rtype: array
+    """
+    dxs = np.diff(np.asarray(xvals, dtype=float))
+    wts = np.zeros(len(xvals))
+    wts[:-1] += dxs/2
+    wts[1:] += dxs/2
+
+    return wts
+
+
+def trapz_convolution(gvals, hvals, xvals):
+    """ Trapezoid-rule convolution integrals for all upper indices at once:
+        conv[k] = np.trapz(gvals[:k+1]*hvals[k::-1], x=xvals[:k+1])
+        computed as a single discrete convolution instead of one np.trapz
+        per k. A direct (not FFT) convolution is used: densities of states
+        span many orders of magnitude, and FFT round-off would swamp the
+        small values.
+
+        :param gvals, hvals: functions on the grid (at least as long as it)
+        :type gvals, hvals: array
+        :param xvals: grid points
+        :type xvals: array
+        :return conv: convolution integrals, for k < min(len(xvals), len(hvals))
+        :rtype: array
+    """
+    npts = min(len(xvals), len(gvals), len(hvals))
+    xvals = np.asarray(xvals, dtype=float)[:npts]
+    gvals = np.asarray(gvals, dtype=float)[:npts]
+    hvals = np.asarray(hvals, dtype=float)[:npts]
+
+    # the weight of the last point of each integral is dx/2 smaller than the
+    # full trapezoid weight of that point
+    dxs = np.append(np.diff(xvals), 0.)
+    conv = (np.convolve(trapz_weights(xvals)*gvals, hvals)[:npts] -
+            dxs/2*gvals*hvals[0])
+
+    return conv
+
+
+def dos_kernel(rho1, rho_non1, ene1_vect, idx_ene_vect):
+    """ P(E1|E) kernel of the rovib_dos model for all (E1, E) pairs:
+        P(E1|E) = rho1(E1)*rho_non1(E-E1)/int_0^E(rho1(e)*rho_non1(E-e)de),
+        including the trapezoid weights of the integration over E, so that
+        P(E1) = dos_kernel(...) @ PED(E)
+
+        :param rho1: rovibrational dos of fragment 1 on ene1_vect
+        :type rho1: array
+        :param rho_non1: dos of the rest of the system on ene1_vect
+        :type rho_non1: array
+        :param ene1_vect: energy grid of fragment 1
+        :type ene1_vect: array
+        :param idx_ene_vect: indices in ene1_vect of the energies of the PED
+        :type idx_ene_vect: array(int)
+        :return kernel: kernel matrix
+        :rtype: array(len(ene1_vect), len(idx_ene_vect))
+    """
+    if len(rho_non1) < len(ene1_vect) - 1:
+        raise IndexError('rho_non1 does not span the energy grid')
+
+    # normalization integrals for each E: den(E) = den_conv[idx(E)-1]
+    den_conv = trapz_convolution(rho1, rho_non1, ene1_vect)
+
+    idx_ene1 = np.arange(len(ene1_vect))[:, None]
+    idx_ene = np.asarray(idx_ene_vect)[None, :]
+    idx_diff = idx_ene - 1 - idx_ene1
+    # rho1(E1)*rho_non1(E-E1) = 0 for E1 >= E
+    valid = idx_diff >= 0
+    num = rho1[:, None] * rho_non1[np.where(valid, idx_diff, 0)]
+    den = den_conv[np.maximum(idx_ene - 1, 0)]
+    # if for some reason you get den=0: the kernel value is 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kernel = np.where(valid & (den != 0), num/den, 0.)
+
+    return kernel * trapz_weights(np.asarray(ene1_vect)[idx_ene_vect])
+
+
+def trapz_tail_weights(xvals, idx_vect):
+    """ Trapezoid weights of the integrals over the tails x >= x[idx] of
+        the grid points idx_vect, for each idx in range(len(xvals)):
+        np.trapz(yvals[idx_vect >= idx], x=xvals[idx_vect[idx_vect >= idx]])
+        = trapz_tail_weights(xvals, idx_vect)[idx] @ yvals
+
+        :param xvals: grid points
+        :type xvals: array
+        :param idx_vect: consecutive indices of the integration points
+        :type idx_vect: array(int)
+        :rtype: array(len(xvals), len(idx_vect))
+    """
+    xtail = np.asarray(xvals, dtype=float)[idx_vect]
+    dxs = np.append(np.diff(xtail), 0.)
+
+    idx_start = np.maximum(np.arange(len(xvals)), idx_vect[0])[:, None]
+    # the first point of each tail only gets half of the following interval
+    tail_wts = np.where(idx_vect > idx_start, trapz_weights(xtail), 0.)
+    tail_wts += np.where(idx_vect == idx_start, dxs/2, 0.)
+
+    return tail_wts
+
+
 # helper functions for energy partition used in the sorter
 def phi_equip_fromdct(sp1, sp2, spc_dct):
     """ quick approximate function to estimate energy partition of sp1
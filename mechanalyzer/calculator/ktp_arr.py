@@ -0,0 +1,251 @@
+"""
+  Array-backed k(T,P)s for a set of reactions
+
+  A KTPArray holds the k(T,P)s of all reactions in one float64 block of
+  shape (nrxn, npressure, ntemp), on temperature and pressure axes shared
+  by all reactions ('high', if present, is the last pressure). Rates that
+  are not defined (a pressure or temperature missing for a reaction) are
+  nan. Converters to and from the usual dictionaries,
+  {rxn: {pressure: (temps, kts)}}, are provided.
+"""
+
+import numpy
+from mechanalyzer.calculator import rates
+
+
+class KTPArray:
+    """ k(T,P)s of a set of reactions on shared temperature and pressure
+        axes
+
+        :param rxns: reactions, in the order of the first axis
+        :type rxns: tuple
+        :param pressures: pressures (atm), can include 'high'
+        :type pressures: tuple
+        :param temps: temperatures (K)
+        :type temps: numpy.ndarray of shape (ntemp,)
+        :param kts: k(T,P)s, nan where not defined
+        :type kts: numpy.ndarray of shape (nrxn, npressure, ntemp)
+    """
+
+    def __init__(self, rxns, pressures, temps, kts):
+        self.rxns = tuple(rxns)
+        self.pressures = tuple(pressures)
+        self.temps = numpy.asarray(temps, dtype=float)
+        self.kts = numpy.asarray(kts, dtype=float)
+        self.rxn_idx = {rxn: idx for idx, rxn in enumerate(self.rxns)}
+        assert self.kts.shape == (
+            len(self.rxns), len(self.pressures), len(self.temps)), (
+            f'kts of shape {self.kts.shape} do not match the axes')
+
+    def __len__(self):
+        return len(self.rxns)
+
+    def __iter__(self):
+        return iter(self.rxns)
+
+    def __contains__(self, rxn):
+        return rxn in self.rxn_idx
+
+    def __getitem__(self, rxn):
+        """ k(T,P)s of a reaction: a view of shape (npressure, ntemp)
+        """
+        return self.kts[self.rxn_idx[rxn]]
+
+    def ktp_dct(self, rxn):
+        """ ktp_dct of a reaction; the arrays are views of the block where
+            all temperatures are defined
+
+            :rtype: dict {pressure: (temps, kts)}
+        """
+
+        ktp_dct = {}
+        for pidx, pressure in enumerate(self.pressures):
+            kts = self[rxn][pidx]
+            defined = ~numpy.isnan(kts)
+            if defined.all():
+                ktp_dct[pressure] = (self.temps, kts)
+            elif defined.any():
+                ktp_dct[pressure] = (self.temps[defined], kts[defined])
+
+        return ktp_dct
+
+    def to_dct(self):
+        """ Converts to a rxn_ktp_dct
+
+            :rtype: dict {rxn: {pressure: (temps, kts)}}
+        """
+        return {rxn: self.ktp_dct(rxn) for rxn in self.rxns}
+
+    def reindex(self, rxns=None, pressures=None, temps=None):
+        """ Puts the k(T,P)s on other axes; new entries are nan
+
+            :rtype: KTPArray
+        """
+
+        rxns = self.rxns if rxns is None else tuple(rxns)
+        pressures = self.pressures if pressures is None else tuple(pressures)
+        temps = self.temps if temps is None else numpy.asarray(temps, float)
+        if (rxns == self.rxns and pressures == self.pressures
+                and numpy.array_equal(temps, self.temps)):
+            return self
+
+        kts = numpy.full((len(rxns), len(pressures), len(temps)), numpy.nan)
+        ridxs_new, ridxs = _common_idxs(rxns, self.rxns)
+        pidxs_new, pidxs = _common_idxs(pressures, self.pressures)
+        tidxs_new, tidxs = _common_idxs(tuple(temps), tuple(self.temps))
+        kts[numpy.ix_(ridxs_new, pidxs_new, tidxs_new)] = (
+            self.kts[numpy.ix_(ridxs, pidxs, tidxs)])
+
+        return KTPArray(rxns, pressures, temps, kts)
+
+    def align(self, other):
+        """ Puts two KTPArrays on the union of their axes (the reactions of
+            self come first)
+
+            :rtype: (KTPArray, KTPArray)
+        """
+
+        rxns = self.rxns + tuple(
+            rxn for rxn in other.rxns if rxn not in self.rxn_idx)
+        pressures = sort_pressures(set(self.pressures) | set(other.pressures))
+        temps = numpy.union1d(self.temps, other.temps)
+
+        return (self.reindex(rxns, pressures, temps),
+                other.reindex(rxns, pressures, temps))
+
+    def __add__(self, other):
+        """ Adds the k(T,P)s of two KTPArrays, reaction by reaction; as in
+            rates.add_ktp_dcts, a rate defined in only one of them is kept
+        """
+
+        arr1, arr2 = self.align(other)
+        kts = numpy.where(
+            numpy.isnan(arr1.kts) & numpy.isnan(arr2.kts), numpy.nan,
+            numpy.nan_to_num(arr1.kts) + numpy.nan_to_num(arr2.kts))
+
+        return KTPArray(arr1.rxns, arr1.pressures, arr1.temps, kts)
+
+    def __mul__(self, factor):
+        """ Multiplies the k(T,P)s by a number, or by one number per
+            reaction
+        """
+
+        factor = numpy.asarray(factor, dtype=float)
+        if factor.ndim == 1:
+            factor = factor[:, None, None]
+
+        return KTPArray(self.rxns, self.pressures, self.temps,
+                        self.kts * factor)
+
+    __rmul__ = __mul__
+
+    def ratio(self, ref):
+        """ Ratios of the k(T,P)s to those of a reference KTPArray, for the
+            reactions of self; nan where either is not defined
+
+            :rtype: KTPArray
+        """
+
+        arr1, arr2 = self.align(ref)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            ratios = arr1.kts[:len(self)] / arr2.kts[:len(self)]
+
+        return KTPArray(self.rxns, arr1.pressures, arr1.temps, ratios)
+
+
+# Constructors
+def from_rxn_ktp_dct(rxn_ktp_dct):
+    """ Builds a KTPArray from a rxn_ktp_dct; the temperatures are the
+        union of those of all reactions and pressures
+
+        :param rxn_ktp_dct: k(T,P)s for each reaction
+        :type rxn_ktp_dct: dict {rxn: {pressure: (temps, kts)}}
+        :rtype: KTPArray
+    """
+
+    rxns = tuple(rxn_ktp_dct.keys())
+    pressures = sort_pressures(set().union(
+        *(ktp_dct.keys() for ktp_dct in rxn_ktp_dct.values())))
+    temps = numpy.unique(numpy.concatenate(
+        [numpy.asarray(temps, dtype=float)
+         for ktp_dct in rxn_ktp_dct.values()
+         for temps, _ in ktp_dct.values()] + [numpy.zeros(0)]))
+
+    pidx_dct = {pressure: pidx for pidx, pressure in enumerate(pressures)}
+    kts = numpy.full((len(rxns), len(pressures), len(temps)), numpy.nan)
+    for ridx, ktp_dct in enumerate(rxn_ktp_dct.values()):
+        for pressure, (ptemps, pkts) in ktp_dct.items():
+            tidxs = numpy.searchsorted(temps, numpy.asarray(ptemps, float))
+            kts[ridx, pidx_dct[pressure], tidxs] = pkts
+
+    return KTPArray(rxns, pressures, temps, kts)
+
+
+def from_rxn_param_dct(rxn_param_dct, temps, pressures, tref=1.0):
+    """ Evaluates the k(T,P)s of all reactions of a rxn_param_dct into a
+        KTPArray (see rates.eval_rxn_param_arr)
+
+        :param rxn_param_dct: rate parameters for all rxns in a mech
+        :type rxn_param_dct: dict {rxn: params}
+        :param temps: temperature array used at every pressure (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures (atm); can include 'high'
+        :type pressures: list
+        :rtype: KTPArray
+    """
+
+    rxns, kts, pmask = rates.eval_rxn_param_arr(
+        rxn_param_dct, temps, pressures, tref=tref)
+    kts[~pmask] = numpy.nan
+
+    return KTPArray(rxns, pressures, temps, kts)
+
+
+def sum_ktp_dcts(ktp_dct_lst):
+    """ Sums a list of ktp_dcts with one array operation; as in
+        rates.add_ktp_dcts, a rate defined in only some of them is the sum
+        of those
+
+        :param ktp_dct_lst: ktp_dcts to be added
+        :type ktp_dct_lst: list [{pressure: (temps, kts)}, ...]
+        :return summed_ktp_dct: summed ktp_dct
+        :rtype: dict {pressure: (temps, kts)}
+    """
+
+    ktp_arr = from_rxn_ktp_dct(dict(enumerate(ktp_dct_lst)))
+    undefined = numpy.isnan(ktp_arr.kts).all(axis=0)
+    kts = numpy.where(undefined, numpy.nan,
+                      numpy.nansum(ktp_arr.kts, axis=0))
+
+    return KTPArray(
+        ('sum',), ktp_arr.pressures, ktp_arr.temps, kts[None]).ktp_dct('sum')
+
+
+# Helpers
+def sort_pressures(pressures):
+    """ Sorts pressures by value, with 'high' last
+
+        :param pressures: pressures (atm), can include 'high'
+        :type pressures: iterable
+        :rtype: tuple
+    """
+
+    pressures = set(pressures)
+    high = ('high',) if 'high' in pressures else ()
+    pressures.discard('high')
+
+    return tuple(sorted(pressures)) + high
+
+
+def _common_idxs(vals1, vals2):
+    """ Positions in vals1 and in vals2 of the values found in both
+    """
+
+    idx_dct2 = {val: idx for idx, val in enumerate(vals2)}
+    idxs1, idxs2 = [], []
+    for idx1, val in enumerate(vals1):
+        if val in idx_dct2:
+            idxs1.append(idx1)
+            idxs2.append(idx_dct2[val])
+
+    return numpy.array(idxs1, dtype=int), numpy.array(idxs2, dtype=int)
@@ -9,6 +9,7 @@ from mess_io.reader import get_species
 from mess_io.reader import rates
 from mess_io.reader import ped_info
 from mess_io.reader import hot_info
+from mechanalyzer import cache
 from mechanalyzer import calculator
 from mechanalyzer.calculator import thermo
 from mechanalyzer.parser._util import remove_rev_rxns
@@ -26,18 +27,18 @@ def prompt_dissociation_ktp_dct(ped_inp_str, ped_out_str,
 
     # PED INFO
     ped_spc, ped_dct, \
-        dos_df, energy_dct = ped_info(
-            ped_inp_str, ped_ped_str, ped_ke_out_str)
-    dof_dct = calc_dof_dct(ped_inp_str, ped_spc)
+        dos_df, energy_dct = _cached_parse(
+            ped_info, ped_inp_str, ped_ped_str, ped_ke_out_str)
+    dof_dct = _cached_parse(calc_dof_dct, ped_inp_str, ped_spc)
     
     # HOTEN INFO
     hot_frag_dct, hot_spc_en, hoten_dct, fne_bf = \
-        hot_info(hot_inp_str, hot_log_str)
+        _cached_parse(hot_info, hot_inp_str, hot_log_str)
 
     # OBTAIN ALL OF THE RATE CONSTANTS FROM THE OUTPUT FILES
     # put dictionaries together
-    rxn_ktp_dct = rates.get_rxn_ktp_dct(
-        ped_out_str, filter_kts=True,
+    rxn_ktp_dct = _cached_parse(
+        rates.get_rxn_ktp_dct, ped_out_str, filter_kts=True,
         filter_reaction_types=('fake', 'self',
                                        'loss', 'capture'),
         relabel_reactions=True
@@ -132,7 +133,7 @@ def prompt_chain_ktp_dct(rxn_ktp_dct, ene_start_df_dct,
     """
     # HOTEN INFO
     hot_frag_dct, hot_spc_en, hoten_dct, fne_bf = \
-        hot_info(pedhot_inp_str, pedhot_log_str)
+        _cached_parse(hot_info, pedhot_inp_str, pedhot_log_str)
 
     # Derive Branching Fractions, Calculate Prompt Rates
     # Merge Prompt Rates with Thermal Rates
@@ -184,9 +185,9 @@ def build_pedhot_df_dct(hot_inp_str, hot_ped_str, hot_ke_out_str,
     pedhot_df_dct = {}
     ene_bw_dct = {}
     hot_ped_spc, hot_ped_dct, \
-        hot_dos_df, hot_energy_dct = ped_info(
-            hot_inp_str, hot_ped_str, hot_ke_out_str)
-    hot_dof_dct = calc_dof_dct(hot_inp_str, hot_ped_spc)
+        hot_dos_df, hot_energy_dct = _cached_parse(
+            ped_info, hot_inp_str, hot_ped_str, hot_ke_out_str)
+    hot_dof_dct = _cached_parse(calc_dof_dct, hot_inp_str, hot_ped_spc)
     # starting energy distribution
     starthot_df = starthotfrag_df
 
@@ -280,6 +281,16 @@ def calc_dof_dct(ped_inp_str, ped_spc):
     return dof_dct
 
 
+def _cached_parse(parse_fxn, *args, **kwargs):
+    """ Parse MESS file strings, or get the result of a previous parse
+        of the same strings from mechanalyzer.cache (also on disk, if a
+        cache file is set): the same files are read by every step of a
+        prompt chain and by every rerun with other models.
+        A copy is returned, so the cached result is never modified.
+    """
+    return copy.deepcopy(cache.cached_call(parse_fxn, *args, **kwargs))
+
+
 ###################### FUNCTIONS FOR THE SORTER #######################
 ################### these work with dataframes ########################
 def get_max_reactivity(hot_sp, hot_sp_df, therm_df, T0, Tref):
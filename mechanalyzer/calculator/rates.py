@@ -7,33 +7,137 @@ import copy
 import numpy
 import pandas
 from phydat import phycon
-from scipy.special import eval_chebyt
+from ratefit.calc import cheb_log_ktp
 from mechanalyzer.calculator import thermo
 
 RC = phycon.RC_CAL  # gas constant in cal/(mol.K)
 RC2 = phycon.RC_ATM  # gas constant in cm^3.atm/(mol.K)
 
 
-def eval_rxn_param_dct(rxn_param_dct, temps_lst, pressures, tref=1.0):
+def eval_rxn_param_dct(rxn_param_dct, temps_lst, pressures, tref=1.0,
+                       batch=True):
     """ Loops through all rxns in a rxn_param_dct and gets a ktp_dct for
         each one
 
+        If all pressures share the same temperature array, the whole
+        mechanism is evaluated at once with the batch engine
+        (see eval_rxn_param_arr); otherwise, each reaction is evaluated
+        in turn with eval_params.
+
         :param rxn_param_dct: rate parameters for all rxns in a mech
         :type rxn_param_dct: dict {rxn: params}
         :param temps_lst: list of temperature arrays used to get k(T,P)s (K)
         :type temps_lst: list [numpy.ndarray1, numpy.ndarray2, ...]
         :param pressures: pressures used to get k(T,P)s (atm)
         :type pressure: list
+        :param batch: whether to use the batch engine when possible
+        :type batch: bool
         :return rxn_ktp_dct: k(T,Ps) at all temps and pressures for each rxn
         :rtype: dict {rxn: ktp_dct}
     """
 
     temps_lst = check_p_t(temps_lst, pressures)  # enforce formatting rules
 
+    if batch and rxn_param_dct and _shared_temps(temps_lst):
+        temps = temps_lst[0]
+        rxns, ktp_arr, pmask = eval_rxn_param_arr(
+            rxn_param_dct, temps, pressures, tref=tref)
+        rxn_ktp_dct = ktp_arr_to_dct(rxns, ktp_arr, pmask, temps, pressures)
+    else:
+        rxn_ktp_dct = {}
+        for rxn, params in rxn_param_dct.items():
+            ktp_dct = eval_params(params, temps_lst, pressures, tref=tref)
+            rxn_ktp_dct[rxn] = ktp_dct
+
+    return rxn_ktp_dct
+
+
+def eval_rxn_param_arr(rxn_param_dct, temps, pressures, tref=1.0):
+    """ Evaluates k(T,P) for all rxns in a rxn_param_dct on a single,
+        shared temperature grid.
+
+        The params are sorted by functional form and their fitting
+        parameters are packed into arrays so that each form is evaluated
+        for every reaction at once. Contributions from multiple forms
+        (and duplicate fits) of one reaction are summed, as in eval_params.
+
+        :param rxn_param_dct: rate parameters for all rxns in a mech
+        :type rxn_param_dct: dict {rxn: params}
+        :param temps: temperature array used at every pressure (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures used to get k(T,P)s (atm); can
+            include 'high'
+        :type pressures: list
+        :return rxns: reactions, in the order of the first array axis
+        :rtype: tuple
+        :return ktp_arr: k(T,P)s for all rxns
+        :rtype: numpy.ndarray of shape (nrxn, npressure, ntemp)
+        :return pmask: whether each rxn has k(T)s at each pressure
+        :rtype: numpy.ndarray of bools with shape (nrxn, npressure)
+    """
+
+    temps = numpy.asarray(temps, dtype=float)
+    rxns = tuple(rxn_param_dct.keys())
+    ktp_arr = numpy.zeros((len(rxns), len(pressures), len(temps)))
+    pmask = numpy.zeros((len(rxns), len(pressures)), dtype=bool)
+
+    # Sort all (possibly duplicate) fits by functional form
+    form_dct = {'arr': [], 'plog': [], 'cheb': [], 'troe': [], 'lind': []}
+    for ridx, params in enumerate(rxn_param_dct.values()):
+        forms = params.get_existing_forms()
+        assert forms != (), f'The params object for {rxns[ridx]} is empty'
+        for form in forms:
+            form_dct[form].append((ridx, getattr(params, form)))
+        _, dup_counts = params.check_for_dups()
+        for form, dup_count in dup_counts.items():
+            if form != 'arr':  # Arrhenius dups are already in params.arr
+                dups = getattr(params, f'{form}_dups')
+                for dup_idx in range(dup_count):
+                    form_dct[form].append((ridx, dups[dup_idx]))
+
+    # Evaluate each form for all reactions and add to the full array
+    evaluators = {
+        'arr': _batch_arr,
+        'plog': _batch_plog,
+        'cheb': _batch_cheb,
+        'troe': _batch_falloff,
+        'lind': _batch_falloff,
+    }
+    for form, entries in form_dct.items():
+        if entries:
+            ridxs = numpy.array([entry[0] for entry in entries])
+            vals = [entry[1] for entry in entries]
+            kts, defined = evaluators[form](vals, temps, pressures, tref)
+            numpy.add.at(ktp_arr, ridxs, kts)
+            numpy.logical_or.at(pmask, ridxs, defined)
+
+    return rxns, ktp_arr, pmask
+
+
+def ktp_arr_to_dct(rxns, ktp_arr, pmask, temps, pressures):
+    """ Converts the dense k(T,P) array made by eval_rxn_param_arr into
+        a rxn_ktp_dct. Pressures that are not defined for a reaction are
+        left out of its ktp_dct.
+
+        :param rxns: reactions, in the order of the first array axis
+        :type rxns: tuple
+        :param ktp_arr: k(T,P)s for all rxns
+        :type ktp_arr: numpy.ndarray of shape (nrxn, npressure, ntemp)
+        :param pmask: whether each rxn has k(T)s at each pressure
+        :type pmask: numpy.ndarray of bools with shape (nrxn, npressure)
+        :param temps: temperature array used at every pressure (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures used to get k(T,P)s (atm)
+        :type pressures: list
+        :return rxn_ktp_dct: k(T,Ps) at all temps and pressures for each rxn
+        :rtype: dict {rxn: ktp_dct}
+    """
+
     rxn_ktp_dct = {}
-    for rxn, params in rxn_param_dct.items():
-        ktp_dct = eval_params(params, temps_lst, pressures, tref=tref)
-        rxn_ktp_dct[rxn] = ktp_dct
+    for ridx, rxn in enumerate(rxns):
+        rxn_ktp_dct[rxn] = {
+            pressure: (temps, ktp_arr[ridx, pidx])
+            for pidx, pressure in enumerate(pressures) if pmask[ridx, pidx]}
 
     return rxn_ktp_dct
 
@@ -298,52 +402,20 @@ def cheb(alpha, tlim, plim, temps_lst, pressures):
         :rtype: dict {pressure: (temps, kts)}
     """
 
-    def cheb_one_p(alpha, tlim, plim, temps, pressure):
-        """ Calculates T,P-dependent rate constants [k(T,P)]s using
-            a Chebyshev functional expression, at a single pressure,
-            across several temperatures.
-
-            :param temps: temperature array used to get k(T)s (K)
-            :type temps: numpy.ndarray
-            :return kts: k(T)s at the given pressure
-            :rtype: numpy.ndarray
-            (other inputs unchanged from parent function)
-        """
-
-        tmin, tmax = tlim
-        pmin, pmax = plim
-        logp = numpy.log10(pressure)
-        logpmin = numpy.log10(pmin)
-        logpmax = numpy.log10(pmax)
-        alpha_nrows, alpha_ncols = alpha.shape
-
-        kts = numpy.zeros(len(temps))
-        for i, temp in enumerate(temps):
-            ctemp = (
-                (2.0 * temp**(-1) - tmin**(-1) - tmax**(-1)) /
-                (tmax**(-1) - tmin**(-1)))
-            cpress = (
-                (2.0 * logp - logpmin - logpmax) /
-                (logpmax - logpmin))
-
-            log_kt = 0.0
-            for j in range(alpha_nrows):
-                for k in range(alpha_ncols):
-                    log_kt += (alpha[j][k] * eval_chebyt(j, ctemp) *
-                               eval_chebyt(k, cpress))
-
-            kts[i] = 10**(log_kt)
-
-        return kts
-
     # Remove 'high' from pressures and the corresponding temperature array
     temps_lst, pressures = remove_high(temps_lst, pressures)
 
+    # Build the T and P bases once if all pressures share one temp array
     ktp_dct = {}
-    for pidx, pressure in enumerate(pressures):
-        temps = temps_lst[pidx]
-        kts = cheb_one_p(alpha, tlim, plim, temps, pressure)
-        ktp_dct[pressure] = (temps, kts)
+    if temps_lst and _shared_temps(temps_lst):
+        kts_arr = 10**(cheb_log_ktp(alpha, tlim, plim, temps_lst[0], pressures))
+        for pidx, pressure in enumerate(pressures):
+            ktp_dct[pressure] = (temps_lst[pidx], kts_arr[:, pidx])
+    else:
+        for pidx, pressure in enumerate(pressures):
+            temps = temps_lst[pidx]
+            kts = 10**(cheb_log_ktp(alpha, tlim, plim, temps, [pressure])[:, 0])
+            ktp_dct[pressure] = (temps, kts)
 
     return ktp_dct
 
@@ -741,6 +813,210 @@ def _pr_term(highp_kts, lowp_kts, temps, pressure, collid_factor=1.0, rval=RC2):
     return pr_term
 
 
+# Helpers for the batch evaluation of many rxns at once (eval_rxn_param_arr)
+def _shared_temps(temps_lst):
+    """ Checks if every pressure in a temps_lst uses the same temp array
+    """
+    return all(numpy.array_equal(temps, temps_lst[0])
+               for temps in temps_lst[1:])
+
+
+def _float_pressures(pressures):
+    """ Gets the indices and values of all non-'high' pressures
+    """
+    fidxs = [pidx for pidx, pressure in enumerate(pressures)
+             if pressure != 'high']
+    fpress = numpy.array([pressures[pidx] for pidx in fidxs], dtype=float)
+
+    return fidxs, fpress
+
+
+def _batch_arr_sums(arr_tuples_lst, temps, tref, rval=RC):
+    """ Calculates k(T)s for many sets of Arrhenius tuples at once; each
+        set is summed as in arr
+
+        :param arr_tuples_lst: sets of Arrhenius fit parameters
+        :type arr_tuples_lst: list [((A1, n1, Ea1), (A2, n2, Ea2), ...), ...]
+        :return kts: k(T)s for each set
+        :rtype: numpy.ndarray of shape (nset, ntemp)
+    """
+
+    set_idxs, pars = [], []
+    for set_idx, arr_tuples in enumerate(arr_tuples_lst):
+        for arr_tuple in arr_tuples:
+            assert len(arr_tuple) == 3, (
+                f'Length of Arrhenius tuple should be 3, not {len(arr_tuple)}')
+            set_idxs.append(set_idx)
+            pars.append(arr_tuple)
+    a_par, n_par, ea_par = numpy.array(pars, dtype=float).reshape(-1, 3).T
+
+    terms = (a_par[:, None] * (temps / tref)[None, :]**n_par[:, None] *
+             numpy.exp(-ea_par[:, None] / (rval * temps)[None, :]))
+    kts = numpy.zeros((len(arr_tuples_lst), len(temps)))
+    numpy.add.at(kts, numpy.array(set_idxs, dtype=int), terms)
+
+    return kts
+
+
+def _batch_arr(arr_tuples_lst, temps, pressures, tref):
+    """ Batch Arrhenius evaluation; the k(T)s are placed at 'high' or, if
+        'high' is absent, at the last pressure
+    """
+
+    nent = len(arr_tuples_lst)
+    pidx = (pressures.index('high') if 'high' in pressures
+            else len(pressures) - 1)
+
+    kts = numpy.zeros((nent, len(pressures), len(temps)))
+    defined = numpy.zeros((nent, len(pressures)), dtype=bool)
+    kts[:, pidx] = _batch_arr_sums(arr_tuples_lst, temps, tref)
+    defined[:, pidx] = True
+
+    return kts, defined
+
+
+def _batch_plog(plog_dcts, temps, pressures, tref):
+    """ Batch PLOG evaluation; pressures outside the PLOG range are
+        clamped to the nearest PLOG pressure, as in plog
+    """
+
+    nent = len(plog_dcts)
+    fidxs, fpress = _float_pressures(pressures)
+
+    # Pack the sorted PLOG pressures, padded with inf, and their Arr sets
+    npmax = max(len(plog_dct) for plog_dct in plog_dcts)
+    ptab = numpy.full((nent, npmax), numpy.inf)
+    set_idxs = numpy.zeros((nent, npmax), dtype=int)
+    arr_tuples_lst = []
+    for eidx, plog_dct in enumerate(plog_dcts):
+        for jidx, plog_pressure in enumerate(sorted(plog_dct.keys())):
+            ptab[eidx, jidx] = plog_pressure
+            set_idxs[eidx, jidx] = len(arr_tuples_lst)
+            arr_tuples_lst.append(plog_dct[plog_pressure])
+    set_kts = _batch_arr_sums(arr_tuples_lst, temps, tref)
+
+    # Clamp pressures to the PLOG range of each entry
+    pmins = ptab[:, 0]
+    pmaxs = numpy.array([max(plog_dct.keys()) for plog_dct in plog_dcts],
+                        dtype=float)
+    pclamp = numpy.clip(fpress[None, :], pmins[:, None], pmaxs[:, None])
+
+    # Find the bracketing PLOG pressures, or the (last) matching one
+    close = numpy.isclose(pclamp[:, :, None], ptab[:, None, :], rtol=1.0e-2)
+    is_close = close.any(axis=2)
+    close_idx = npmax - 1 - numpy.argmax(close[:, :, ::-1], axis=2)
+    lo_idx = (ptab[:, None, :] < pclamp[:, :, None]).sum(axis=2) - 1
+    lo_idx = numpy.clip(lo_idx, 0, max(npmax - 2, 0))
+    hi_idx = numpy.minimum(lo_idx + 1, npmax - 1)
+    lo_idx = numpy.where(is_close, close_idx, lo_idx)
+    hi_idx = numpy.where(is_close, close_idx, hi_idx)
+
+    rows = numpy.arange(nent)[:, None]
+    kts_low = set_kts[set_idxs[rows, lo_idx]]
+    kts_high = set_kts[set_idxs[rows, hi_idx]]
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        plow, phigh = ptab[rows, lo_idx], ptab[rows, hi_idx]
+        pres_term = ((numpy.log10(pclamp) - numpy.log10(plow)) /
+                     (numpy.log10(phigh) - numpy.log10(plow)))
+        log_kts = (
+            numpy.log10(kts_low) +
+            ((numpy.log10(kts_high) - numpy.log10(kts_low)) *
+             pres_term[:, :, None])
+        )
+        fkts = numpy.where(is_close[:, :, None], kts_low, 10**log_kts)
+
+    kts = numpy.zeros((nent, len(pressures), len(temps)))
+    defined = numpy.zeros((nent, len(pressures)), dtype=bool)
+    kts[:, fidxs] = fkts
+    defined[:, fidxs] = True
+
+    return kts, defined
+
+
+def _batch_cheb(cheb_dcts, temps, pressures, _tref):
+    """ Batch Chebyshev evaluation; alpha matrices of reactions that share
+        the same tlim and plim are zero-padded to a common shape and
+        evaluated together
+    """
+
+    nent = len(cheb_dcts)
+    fidxs, fpress = _float_pressures(pressures)
+
+    # Group the entries by their T and P limits
+    grp_dct = {}
+    for eidx, cheb_dct in enumerate(cheb_dcts):
+        lims = (tuple(cheb_dct['tlim']), tuple(cheb_dct['plim']))
+        grp_dct.setdefault(lims, []).append(eidx)
+
+    fkts = numpy.zeros((nent, len(fpress), len(temps)))
+    for (tlim, plim), eidxs in grp_dct.items():
+        alphas = [numpy.asarray(cheb_dcts[eidx]['alpha'], dtype=float)
+                  for eidx in eidxs]
+        nrows = max(alpha.shape[0] for alpha in alphas)
+        ncols = max(alpha.shape[1] for alpha in alphas)
+        alpha_arr = numpy.zeros((len(eidxs), nrows, ncols))
+        for aidx, alpha in enumerate(alphas):
+            alpha_arr[aidx, :alpha.shape[0], :alpha.shape[1]] = alpha
+        log_kts = cheb_log_ktp(alpha_arr, tlim, plim, temps, fpress)
+        fkts[eidxs] = 10**(numpy.swapaxes(log_kts, 1, 2))
+
+    kts = numpy.zeros((nent, len(pressures), len(temps)))
+    defined = numpy.zeros((nent, len(pressures)), dtype=bool)
+    kts[:, fidxs] = fkts
+    defined[:, fidxs] = True
+
+    return kts, defined
+
+
+def _batch_falloff(falloff_dcts, temps, pressures, tref, rval=RC2):
+    """ Batch Troe or Lindemann evaluation; the dcts are Troe dcts if they
+        contain 'troe_params'
+    """
+
+    nent = len(falloff_dcts)
+    fidxs, fpress = _float_pressures(pressures)
+
+    highp_kts = _batch_arr_sums(
+        [dct['highp_arr'] for dct in falloff_dcts], temps, tref)
+    lowp_kts = _batch_arr_sums(
+        [dct['lowp_arr'] for dct in falloff_dcts], temps, tref)
+
+    # Reduced pressure terms of shape (nent, npressure, ntemp)
+    pr_term = ((lowp_kts / highp_kts)[:, None, :] *
+               p_to_m(fpress[:, None], temps[None, :], rval=rval)[None, :, :])
+    fkts = highp_kts[:, None, :] * (pr_term / (1.0 + pr_term))
+
+    if 'troe_params' in falloff_dcts[0]:
+        troe_arr = numpy.full((nent, 4), numpy.nan)
+        for eidx, dct in enumerate(falloff_dcts):
+            troe_params = [numpy.nan if par is None else par
+                           for par in dct['troe_params']]
+            troe_arr[eidx, :len(troe_params)] = troe_params
+        alpha, ts3, ts1, ts2 = (col[:, None] for col in troe_arr.T)
+
+        f_cent = ((1.0 - alpha) * numpy.exp(-temps[None, :] / ts3) +
+                  alpha * numpy.exp(-temps[None, :] / ts1))
+        f_cent += numpy.where(
+            numpy.isnan(ts2), 0.0, numpy.exp(-ts2 / temps[None, :]))
+        log_fcent = numpy.log10(f_cent)[:, None, :]
+        c_val = -0.4 - 0.67 * log_fcent
+        n_val = 0.75 - 1.27 * log_fcent
+        d_val = 0.14
+        val = ((numpy.log10(pr_term) + c_val) /
+               (n_val - d_val * (numpy.log10(pr_term) + c_val)))**2
+        fkts *= 10**((1.0 + val)**(-1) * log_fcent)
+
+    kts = numpy.zeros((nent, len(pressures), len(temps)))
+    defined = numpy.zeros((nent, len(pressures)), dtype=bool)
+    kts[:, fidxs] = fkts
+    defined[:, fidxs] = True
+    if 'high' in pressures:
+        kts[:, pressures.index('high')] = highp_kts
+        defined[:, pressures.index('high')] = True
+
+    return kts, defined
+
+
 def read_rxn_ktp_dct(rxn_ktp_dct, rxn, pressure, val):
     """ Reads the entries of a rxn_ktp_dct for a single rxn and single pressure
 
@@ -824,10 +1100,10 @@ def get_bw_ktp_dct(ktp_dct_entry, rcts, prds, therm_df):
     returns: ktp_dct_entry_bw
     """
     ktp_dct_entry_bw = {}
+    dg_rxn = thermo.extract_deltaX_therm(therm_df, rcts, prds, 'G')
     for P, vals in ktp_dct_entry.items():
         Tvect, k = vals
         kt_series = pandas.Series(k, index=Tvect)
-        dg_rxn = thermo.extract_deltaX_therm(therm_df, rcts, prds, 'G')
         kt_series_bw = get_bw_rate(kt_series, rcts, prds, dg_rxn)
         ktp_dct_entry_bw[P] = (Tvect, kt_series_bw.values)
 
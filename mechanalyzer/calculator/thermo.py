@@ -3,6 +3,7 @@
 
 import numpy
 import pandas
+from scipy import sparse
 from phydat import phycon
 
 RC = phycon.RC_CAL  # gas constant in cal/(mol.K)
@@ -23,38 +24,113 @@ def create_spc_therm_dct(spc_nasa7_dct, temps, rval=RC):
         :rtype: dct {spc1: therm_array1, spc2: ...}
     """
 
+    spcs, temps, therm_arr = create_spc_therm_arr(
+        spc_nasa7_dct, temps, rval=rval)
+
+    # Each entry is a view into the rows of the thermo array
     spc_therm_dct = {}
-    for spc, nasa7_params in spc_nasa7_dct.items():
-        h_t, cp_t, s_t, g_t, lnq_t, = [], [], [], [], []
-        for temp in temps:
-            h_t.append(enthalpy(nasa7_params, temp, rval=rval))
-            cp_t.append(heat_capacity(nasa7_params, temp, rval=rval))
-            s_t.append(entropy(nasa7_params, temp, rval=rval))
-            g_t.append(gibbs(nasa7_params, temp, rval=rval))
-            lnq_t.append(lnpf(nasa7_params, temp, rval=rval))
-
-            if not all((h_t[-1], cp_t[-1], s_t[-1], g_t[-1], lnq_t[-1])):
-                print(f'Failed to calculate thermo at {temp} K for {spc} due '
-                      'to an invalid temp.')
-
-        # Convert to numpy arrays
-        temps = numpy.array(temps, dtype=float)
-        h_t = numpy.array(h_t, dtype=float)
-        cp_t = numpy.array(cp_t, dtype=float)
-        s_t = numpy.array(s_t, dtype=float)
-        g_t = numpy.array(g_t, dtype=float)
-        lnq_t = numpy.array(lnq_t, dtype=float)
-
-        spc_therm_dct[spc] = (temps, h_t, cp_t, s_t, g_t, lnq_t)
+    for spc_idx, spc in enumerate(spcs):
+        for temp in temps[numpy.isnan(therm_arr[spc_idx, 0])]:
+            print(f'Failed to calculate thermo at {temp} K for {spc} due '
+                  'to an invalid temp.')
+        spc_therm_dct[spc] = (temps,) + tuple(therm_arr[spc_idx])
 
     return spc_therm_dct
 
 
+def create_spc_therm_arr(spc_nasa7_dct, temps, rval=RC):
+    """ Calculate h, cp, s, g and lnq for all species on a temperature grid
+        at once. The low-T or high-T coefficients are chosen for each
+        species and temperature with a mask; temperatures outside the valid
+        range of a species' NASA-7 polynomial give NaN.
+
+        :param spc_nasa7_dct: NASA-7 polynomial information for each species
+        :type spc_nasa7_dct: dct {spc1: nasa7_dct1, spc2: ...}
+        :param temps: temperatures at which to do calculations (K)
+        :type temps: numpy.ndarray
+        :param rval: universal gas constant (units decided by the user)
+        :type rval: float
+        :return spcs: species names, in the order of the array rows
+        :rtype: tuple
+        :return temps: temperatures at which calculations were done (K)
+        :rtype: numpy.ndarray of shape (ntemp,)
+        :return therm_arr: h, cp, s, g and lnq for each species
+        :rtype: numpy.ndarray of shape (nspc, 5, ntemp)
+    """
+
+    spcs, cfts_arr, tlim_arr = nasa7_coeff_arr(spc_nasa7_dct)
+    temps = numpy.array(temps, dtype=float)
+
+    # Pick the coefficients for each species and temperature
+    tlow, tmid, thigh = (tlim_arr[:, [idx]] for idx in range(3))
+    low_mask = (tlow <= temps) & (temps <= tmid)
+    high_mask = (tmid < temps) & (temps <= thigh)
+    cfts = numpy.where(
+        low_mask[..., None], cfts_arr[:, None, 0], cfts_arr[:, None, 1])
+    cfts[~(low_mask | high_mask)] = numpy.nan
+    cfts = numpy.moveaxis(cfts, -1, 0)  # shape (7, nspc, ntemp)
+
+    h_t = (
+        cfts[0] +
+        ((cfts[1] * temps) / 2.0) +
+        ((cfts[2] * temps**2) / 3.0) +
+        ((cfts[3] * temps**3) / 4.0) +
+        ((cfts[4] * temps**4) / 5.0) +
+        (cfts[5] / temps)
+    ) * (rval * temps)
+    cp_t = (
+        cfts[0] +
+        (cfts[1] * temps) +
+        (cfts[2] * temps**2) +
+        (cfts[3] * temps**3) +
+        (cfts[4] * temps**4)
+    ) * rval
+    s_t = (
+        (cfts[0] * numpy.log(temps)) +
+        (cfts[1] * temps) +
+        ((cfts[2] * temps**2) / 2.0) +
+        ((cfts[3] * temps**3) / 3.0) +
+        ((cfts[4] * temps**4) / 4.0) +
+        (cfts[6])
+    ) * rval
+    g_t = h_t - (s_t * temps)
+    lnq_t = -g_t / (rval * temps)
+
+    therm_arr = numpy.stack((h_t, cp_t, s_t, g_t, lnq_t), axis=1)
+
+    return spcs, temps, therm_arr
+
+
+def nasa7_coeff_arr(spc_nasa7_dct):
+    """ Stacks the NASA-7 polynomial coefficients of all species
+
+        :param spc_nasa7_dct: NASA-7 polynomial information for each species
+        :type spc_nasa7_dct: dct {spc1: nasa7_dct1, spc2: ...}
+        :return spcs: species names, in the order of the array rows
+        :rtype: tuple
+        :return cfts_arr: low-T (index 0) and high-T (index 1) coefficients
+        :rtype: numpy.ndarray of shape (nspc, 2, 7)
+        :return tlim_arr: low, mid and high temperatures of each polynomial
+        :rtype: numpy.ndarray of shape (nspc, 3)
+    """
+
+    spcs = tuple(spc_nasa7_dct.keys())
+    cfts_arr = numpy.zeros((len(spcs), 2, 7), dtype=float)
+    tlim_arr = numpy.zeros((len(spcs), 3), dtype=float)
+    for spc_idx, nasa7_params in enumerate(spc_nasa7_dct.values()):
+        low_temp, high_temp, mid_temp = nasa7_params[3]  # order is odd
+        tlim_arr[spc_idx] = (low_temp, mid_temp, high_temp)
+        cfts_arr[spc_idx, 0] = nasa7_params[4][1]
+        cfts_arr[spc_idx, 1] = nasa7_params[4][0]
+
+    return spcs, cfts_arr, tlim_arr
+
+
 def spc_therm_dct_df(spc_therm_dct):
     """ converts therm dct into a dictionary of dataframes
         {spc: [index=[temps]][columns=[H, CP, S, G, lnQ]]}
     """
-    spc_therm_df = {}
+    spc_therm_df = SpcThermDf()
     for spc, vals in spc_therm_dct.items():
         matrix_data = numpy.array([vals[1], vals[2], vals[3], vals[4], vals[5]], dtype = float).T
         spc_therm_df[spc] = pandas.DataFrame(
@@ -63,28 +139,158 @@ def spc_therm_dct_df(spc_therm_dct):
         
     return spc_therm_df
 
+
+class SpcThermDf(dict):
+    """ Dictionary of thermo dataframes {spc: DataFrame}, as returned by
+        spc_therm_dct_df. The same values are also kept as
+        species-by-temperature matrices (built on first use), from which the
+        reaction thermo is obtained with a stoichiometry-matrix product and
+        memoized per reaction. Entries should not be modified once reaction
+        thermo has been requested.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._therm_mats = None
+        self._deltax_memo = {}
+
+    def therm_mats(self):
+        """ Gets the species-by-temperature matrices
+
+            :return spc_idx: row index of each species
+            :rtype: dct {spc1: idx1, spc2: ...}
+            :return temps: union of the temperatures of all species (K)
+            :rtype: numpy.ndarray of shape (ntemp,)
+            :return mat_dct: matrix for each thermo quantity
+            :rtype: dct {var: numpy.ndarray of shape (nspc, ntemp)}
+            :return tmask: whether each species has a value at each temp
+            :rtype: numpy.ndarray of shape (nspc, ntemp)
+        """
+
+        if self._therm_mats is None or len(self._therm_mats[0]) != len(self):
+            self._therm_mats = _therm_mats(self)
+            self._deltax_memo = {}
+
+        return self._therm_mats
+
+    def deltax(self, rcts, prds, var):
+        """ Gets (memoized) the change of a thermo quantity for a reaction
+
+            :return temps: temperatures (K)
+            :rtype: numpy.ndarray
+            :return deltax: change in the thermo quantity at each temp
+            :rtype: numpy.ndarray
+        """
+
+        key = (tuple(rcts), tuple(prds), var)
+        if key not in self._deltax_memo:
+            spc_idx, temps, mat_dct, tmask = self.therm_mats()
+            smat = stoich_matrix(((rcts, prds),), spc_idx)
+            # Keep the temps where any involved spc is defined; all must be
+            rows = smat.indices
+            has_temp = tmask[rows]
+            if not numpy.array_equal(has_temp.all(axis=0),
+                                     has_temp.any(axis=0)):
+                raise KeyError(temps[has_temp.any(axis=0)
+                                     & ~has_temp.all(axis=0)][0])
+            tidxs = numpy.flatnonzero(has_temp.any(axis=0))
+            deltax = smat.data @ mat_dct[var][rows][:, tidxs]
+            self._deltax_memo[key] = (temps[tidxs], deltax)
+
+        return self._deltax_memo[key]
+
+
+def _therm_mats(spc_therm_df):
+    """ Builds the species-by-temperature matrices of a SpcThermDf
+    """
+
+    spc_idx = {spc: idx for idx, spc in enumerate(spc_therm_df)}
+    temps = numpy.unique(numpy.concatenate(
+        [numpy.array(therm_df.index, dtype=float)
+         for therm_df in spc_therm_df.values()] + [numpy.zeros(0)]))
+    tmask = numpy.zeros((len(spc_idx), len(temps)), dtype=bool)
+    mat_dct = {var: numpy.full((len(spc_idx), len(temps)), numpy.nan)
+               for var in ('H', 'Cp', 'S', 'G', 'lnQ')}
+    for idx, therm_df in enumerate(spc_therm_df.values()):
+        tidxs = numpy.searchsorted(temps, numpy.array(therm_df.index,
+                                                      dtype=float))
+        tmask[idx, tidxs] = True
+        for var, mat in mat_dct.items():
+            mat[idx, tidxs] = therm_df[var].values
+
+    return spc_idx, temps, mat_dct, tmask
+
+
+def stoich_matrix(rxns, spc_idx):
+    """ Builds the sparse stoichiometry matrix of a set of reactions: the
+        entries are positive for products and negative for reactants
+
+        :param rxns: reactants and products of each reaction
+        :type rxns: list [(rcts1, prds1), (rcts2, prds2), ...]
+        :param spc_idx: column index of each species
+        :type spc_idx: dct {spc1: idx1, spc2: ...}
+        :return smat: stoichiometry matrix
+        :rtype: scipy.sparse.csr_matrix of shape (nrxn, nspc)
+    """
+
+    rxn_idxs, spc_idxs, coeffs = [], [], []
+    for rxn_idx, (rcts, prds) in enumerate(rxns):
+        for spcs, coeff in ((rcts, -1.0), (prds, 1.0)):
+            for spc in spcs:
+                if spc not in spc_idx:
+                    raise KeyError(spc)
+                rxn_idxs.append(rxn_idx)
+                spc_idxs.append(spc_idx[spc])
+                coeffs.append(coeff)
+    # Duplicate entries (e.g., 2 H) are summed
+    smat = sparse.csr_matrix((coeffs, (rxn_idxs, spc_idxs)),
+                             shape=(len(rxns), len(spc_idx)))
+    smat.sum_duplicates()
+
+    return smat
+
+
 def extract_deltaX_therm(therm_df, rcts, prds, var):
     """ extract from thermo file the DH/DG/DCP/DS of rxn rcts->prds
         at different T_vect
     """
-    # extract common indexes
-    T_vect = []
-    [T_vect.extend(list(therm_df[rct][var].index)) for rct in rcts]
-    [T_vect.extend(list(therm_df[prd][var].index)) for prd in prds]
-    T_vect = list(set(T_vect))
-
-    dX_series = pandas.Series(index=T_vect, dtype=float)
-    for T in T_vect:
-        dX_rcts = [therm_df[rct][var][T]
-                    for rct in rcts]
-        dX_prds = [therm_df[prd][var][T]
-                    for prd in prds]
-        dX_series[T] = sum(dX_prds) - sum(dX_rcts)
-
-    dX_series.sort_index()
+    if not isinstance(therm_df, SpcThermDf):
+        therm_df = SpcThermDf(
+            {spc: therm_df[spc] for spc in set(rcts) | set(prds)})
+    T_vect, dX_vals = therm_df.deltax(rcts, prds, var)
+    dX_series = pandas.Series(dX_vals, index=T_vect, dtype=float)
 
     return dX_series
 
+
+def extract_deltaX_therm_batch(therm_df, rxns, var):
+    """ extract from thermo file the DH/DG/DCP/DS of several rxns at once,
+        on the union of the temperatures of all species; values are NaN at
+        temperatures missing for any species of a reaction
+
+        :param therm_df: thermo dataframes, as from spc_therm_dct_df
+        :type therm_df: SpcThermDf
+        :param rxns: reactants and products of each reaction
+        :type rxns: list [(rcts1, prds1), (rcts2, prds2), ...]
+        :param var: thermo quantity: 'H', 'Cp', 'S', 'G' or 'lnQ'
+        :type var: str
+        :return T_vect: temperatures (K)
+        :rtype: numpy.ndarray of shape (ntemp,)
+        :return dX_arr: change in the thermo quantity for each reaction
+        :rtype: numpy.ndarray of shape (nrxn, ntemp)
+    """
+    if not isinstance(therm_df, SpcThermDf):
+        therm_df = SpcThermDf(therm_df)
+    spc_idx, T_vect, mat_dct, tmask = therm_df.therm_mats()
+    smat = stoich_matrix(rxns, spc_idx)
+    dX_arr = smat @ numpy.where(tmask, mat_dct[var], 0.0)
+    # Temps missing for any involved species (abs since coeffs may cancel)
+    missing = (abs(smat) @ (~tmask).astype(float)) > 0
+    dX_arr[missing] = numpy.nan
+
+    return T_vect, dX_arr
+
+
 def enthalpy(nasa7_params, temp, rval=RC):
     """ Calculate the enthalpy of a species using the
         coefficients of its NASA-7 polynomial.
@@ -86,8 +86,7 @@ def connected_channels_dct(pes_dct):
 
 def find_conn_chnls(pes_rct_lst, pes_prd_lst, pes_rxn_name_lst):
     """ Determine all of the connected reaction channels on a PES.
-        Information compiled in SUB-PES dictionaries:
-        conndct = {0: [['S1','S2'],['S3','S4'],[S5']], ..}
+        Information compiled in a SUB-PES dictionary:
         connchnls = {0: [0,1,2] , 1:[3,4,5]}...
     """
 
@@ -106,54 +105,55 @@ def find_conn_chnls(pes_rct_lst, pes_prd_lst, pes_rxn_name_lst):
         columns=['rcts', 'prds', 'N_rcts_prds'])
     # order by total number of species (N of reactants + N of products)
     pes_df = pes_df.sort_values(by=['N_rcts_prds', 'rcts', 'prds'])
-    # Split up channels into a connected sub-pes within a formula
-    subpes_idx = 0
-    conndct = {}
+    # Split up channels into a connected sub-pes within a formula:
+    # a channel joins every sub-pes that has one of its unimolecular species,
+    # or both of its bimolecular pairs (for bimol-bimol channels). Sub-pes
+    # merged into another (the one created first) are tracked by union-find
     connchnls = {}
+    parent = {}
+    spc_subpes = {}  # unimol species -> sub-pes
+    pair_subpes = {}  # bimol pair -> sub-pess that have it
+
+    def _find(subpes_idx):
+        root = subpes_idx
+        while parent[root] != root:
+            root = parent[root]
+        while parent[subpes_idx] != root:
+            parent[subpes_idx], subpes_idx = root, parent[subpes_idx]
+        return root
 
     for chnl_idx in pes_df.index:
-        connected_to = []
-        chnl_species = [list(pes_df['rcts'][chnl_idx]),
-                        list(pes_df['prds'][chnl_idx])]
-
-        for conn_chnls_idx, spc_lst in conndct.items():
-            for spc_pair in chnl_species:
-                if len(spc_pair) == 1 and spc_pair in spc_lst:
-                    # This works for unimol species
-                    # Need also to verify bimol wellskipping channels
-                    if conn_chnls_idx not in connected_to:
-                        connected_to.append(conn_chnls_idx)
-                elif (len(spc_pair) == 1 and
-                      spc_pair[::-1] in spc_lst):
-                    if conn_chnls_idx not in connected_to:
-                        connected_to.append(conn_chnls_idx)
-
-            if len(chnl_species[0]) == 2 and len(chnl_species[1]) == 2:
-                # bimol bimol reactions
-                if ((chnl_species[0] in spc_lst) and
-                        (chnl_species[1] in spc_lst) and
-                        (conn_chnls_idx not in connected_to)):
-                    connected_to.append(conn_chnls_idx)
+        chnl_species = (tuple(pes_df['rcts'][chnl_idx]),
+                        tuple(pes_df['prds'][chnl_idx]))
+
+        connected_to = set()
+        for spc_pair in chnl_species:
+            if len(spc_pair) == 1 and spc_pair in spc_subpes:
+                connected_to.add(_find(spc_subpes[spc_pair]))
+        if len(chnl_species[0]) == 2 and len(chnl_species[1]) == 2:
+            # bimol bimol reactions
+            connected_to |= (
+                set(map(_find, pair_subpes.get(chnl_species[0], ()))) &
+                set(map(_find, pair_subpes.get(chnl_species[1], ()))))
 
         if not connected_to:
-            conndct[subpes_idx] = chnl_species
+            subpes_idx = len(parent)
+            parent[subpes_idx] = subpes_idx
             connchnls[subpes_idx] = [chnl_idx]
-            subpes_idx += 1
         else:
-            conndct[connected_to[0]].extend(chnl_species)
-            connchnls[connected_to[0]].append(chnl_idx)
-            if len(connected_to) > 1:
-                for cidx, cval in enumerate(connected_to):
-                    if cidx > 0:
-                        conn_specs = conndct.pop(cval, None)
-                        conn_chnls = connchnls.pop(cval, None)
-                        conndct[connected_to[0]].extend(conn_specs)
-                        connchnls[connected_to[0]].extend(conn_chnls)
-            for cidx, spc_lst in conndct.items():
-                lst = sorted(spc_lst)
-                lst = [lst[i] for i in range(len(lst))
-                       if i == 0 or lst[i] != lst[i-1]]
-                conndct[cidx] = lst
+            # merge into the first sub-pes, keeping the channel order
+            connected_to = sorted(connected_to)
+            subpes_idx = connected_to[0]
+            connchnls[subpes_idx].append(chnl_idx)
+            for cval in connected_to[1:]:
+                parent[cval] = subpes_idx
+                connchnls[subpes_idx].extend(connchnls.pop(cval))
+
+        for spc_pair in chnl_species:
+            if len(spc_pair) == 1:
+                spc_subpes[spc_pair] = subpes_idx
+            else:
+                pair_subpes.setdefault(spc_pair, set()).add(subpes_idx)
 
     return connchnls
 
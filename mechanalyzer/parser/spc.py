@@ -15,6 +15,7 @@ import automol
 from autorun import timeout, execute_function_in_parallel
 import ioformat.pathtools as text_parser
 import thermfit
+from mechanalyzer import cache
 from mechanalyzer.parser.csv_ import csv_dct
 
 
@@ -222,8 +223,7 @@ def add_instability_products(mech_spc_dct, nprocs='auto', stereo=True):
     all_instab_ichs = ()
     for name, dct in mech_spc_dct.items():
         ich = dct['inchi']
-        instab_ichs = automol.reac.instability_product_inchis(
-            ich, stereo=stereo)
+        instab_ichs = cache.instability_product_inchis(ich, stereo=stereo)
         if instab_ichs is not None:
             print(f'Found instability for {name} = {ich}')
             print(f'- {instab_ichs}')
@@ -309,19 +309,19 @@ def _add_stereo_to_dct(init_dct, all_stereo, enant, names, output_queue):
         # print('expand_stereo inchi test:', automol.chi.expand_stereo(ich))
         if all_stereo:
             try:
-                if not automol.chi.is_complete(ich):
+                if not cache.is_complete(ich):
                     ret_ichs = (
-                         automol.chi.expand_stereo(ich, enant=enant))
+                         cache.expand_stereo(ich, enant=enant))
             except:  # noqa: E722
                 print(f'{name} timed out in stereo generation')
                 worked = False
         else: 
             try:
-                if not automol.chi.is_complete(ich):
+                if not cache.is_complete(ich):
                     ret_ichs = (
                         [automol.chi.add_stereo(ich)])
             except:  # noqa: E722
-                ich_attempt = automol.chi.expand_stereo(ich, enant=enant)
+                ich_attempt = cache.expand_stereo(ich, enant=enant)
                 if len(ich_attempt) > 0:
                     ret_ichs = [ich_attempt[0]]
                 else:   
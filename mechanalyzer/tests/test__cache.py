@@ -0,0 +1,59 @@
+""" Test the memoization of functions in mechanalyzer.cache
+"""
+
+import os
+import tempfile
+from mechanalyzer import cache
+
+CALLS = []
+
+
+def _formula_layer(ich, upper=False):
+    """ Stand-in for an expensive automol function
+    """
+    CALLS.append(ich)
+    fml = ich.split('/')[1]
+    return fml.upper() if upper else fml
+
+
+def test__memory_cache():
+    """ Test the in-memory cache
+    """
+    cache.set_cache_path(None, maxsize=2)
+    CALLS.clear()
+    assert cache.cached_call(_formula_layer, 'InChI=1S/CH4/h1H4') == 'CH4'
+    assert cache.cached_call(_formula_layer, 'InChI=1S/CH4/h1H4') == 'CH4'
+    assert len(CALLS) == 1
+
+    # Different arguments are different entries
+    assert cache.cached_call(
+        _formula_layer, 'InChI=1S/h2o/h1H2', upper=True) == 'H2O'
+    assert len(CALLS) == 2
+
+    # The least recently used entry is dropped once maxsize is exceeded
+    cache.cached_call(_formula_layer, 'InChI=1S/O2/c1-2')
+    cache.cached_call(_formula_layer, 'InChI=1S/CH4/h1H4')
+    assert len(CALLS) == 4
+
+    cache.set_cache_path(None)
+
+
+def test__disk_cache():
+    """ Test the on-disk cache
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache.set_cache_path(os.path.join(tmp_dir, 'cache.sqlite'))
+        CALLS.clear()
+        assert cache.cached_call(_formula_layer, 'InChI=1S/CH4/h1H4') == 'CH4'
+
+        # A new run (empty memory) reads the result from the disk
+        cache.clear_memory_cache()
+        assert cache.cached_call(_formula_layer, 'InChI=1S/CH4/h1H4') == 'CH4'
+        assert len(CALLS) == 1
+
+        cache.set_cache_path(None)
+
+
+if __name__ == '__main__':
+    test__memory_cache()
+    test__disk_cache()
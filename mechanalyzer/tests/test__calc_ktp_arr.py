@@ -0,0 +1,90 @@
+"""
+Test the mechanalyzer.calculator.ktp_arr functions
+"""
+
+import numpy as np
+from mechanalyzer.calculator import rates
+from mechanalyzer.calculator import ktp_arr
+
+
+RXN1 = (('H', 'O2'), ('OH', 'O'), (None,))
+RXN2 = (('H2', 'O'), ('OH', 'H'), (None,))
+RXN3 = (('H2O2',), ('OH', 'OH'), ('(+M)',))
+RXN_KTP_DCT1 = {
+    RXN1: {
+        1.0: (np.array([500., 1000.]), np.array([1.0, 2.0])),
+        10.0: (np.array([500., 1000.]), np.array([3.0, 4.0])),
+        'high': (np.array([500., 1000.]), np.array([5.0, 6.0]))},
+    RXN2: {
+        1.0: (np.array([1000., 1500.]), np.array([7.0, 8.0]))}
+}
+RXN_KTP_DCT2 = {
+    RXN2: {
+        1.0: (np.array([500., 1000.]), np.array([1.0, 2.0])),
+        10.0: (np.array([500., 1000.]), np.array([3.0, 4.0]))},
+    RXN3: {
+        1.0: (np.array([500., 1000.]), np.array([5.0, 6.0]))}
+}
+
+
+def test_convert():
+    """ Test the conversion to and from a rxn_ktp_dct
+    """
+
+    ktps = ktp_arr.from_rxn_ktp_dct(RXN_KTP_DCT1)
+    assert ktps.rxns == (RXN1, RXN2)
+    assert ktps.pressures == (1.0, 10.0, 'high')
+    assert np.allclose(ktps.temps, [500., 1000., 1500.])
+    assert ktps.kts.shape == (2, 3, 3)
+    assert np.allclose(ktps[RXN1][2, :2], [5.0, 6.0])
+
+    rxn_ktp_dct = ktps.to_dct()
+    for rxn, ktp_dct in RXN_KTP_DCT1.items():
+        assert set(rxn_ktp_dct[rxn]) == set(ktp_dct)
+        for pressure, (temps, kts) in ktp_dct.items():
+            assert np.allclose(rxn_ktp_dct[rxn][pressure][0], temps)
+            assert np.allclose(rxn_ktp_dct[rxn][pressure][1], kts)
+
+
+def test_add():
+    """ Test the addition of KTPArrays against rates.add_ktp_dcts
+    """
+
+    ktps = (ktp_arr.from_rxn_ktp_dct(RXN_KTP_DCT1) +
+            ktp_arr.from_rxn_ktp_dct(RXN_KTP_DCT2))
+    assert ktps.rxns == (RXN1, RXN2, RXN3)
+
+    ref_ktp_dct = rates.add_ktp_dcts(RXN_KTP_DCT1[RXN2], RXN_KTP_DCT2[RXN2])
+    ktp_dct = ktps.ktp_dct(RXN2)
+    assert set(ktp_dct) == set(ref_ktp_dct)
+    for pressure, (temps, kts) in ref_ktp_dct.items():
+        assert np.allclose(ktp_dct[pressure][0], temps)
+        assert np.allclose(ktp_dct[pressure][1], kts)
+
+    summed_ktp_dct = ktp_arr.sum_ktp_dcts(
+        [RXN_KTP_DCT1[RXN2], RXN_KTP_DCT2[RXN2]])
+    assert np.allclose(summed_ktp_dct[1.0][1], [1.0, 9.0, 8.0])
+
+
+def test_mult_ratio():
+    """ Test the scaling of KTPArrays and the ratios between them
+    """
+
+    ktps = ktp_arr.from_rxn_ktp_dct(RXN_KTP_DCT1)
+    assert np.allclose((ktps * 0.5)[RXN1][0, :2], [0.5, 1.0])
+    assert np.allclose((ktps * [2.0, 3.0])[RXN2][0, 1:], [21.0, 24.0])
+
+    ratios = (ktps * 2.0).ratio(ktps)
+    assert np.allclose(ratios[RXN1][:, :2], 2.0)
+    assert np.isnan(ratios[RXN1][:, 2]).all()
+
+    ratios = ktps.ratio(ktp_arr.from_rxn_ktp_dct(RXN_KTP_DCT2))
+    assert ratios.rxns == (RXN1, RXN2)
+    assert np.isnan(ratios[RXN1]).all()
+    assert np.allclose(ratios[RXN2][0, 1], 3.5)
+
+
+if __name__ == '__main__':
+    test_convert()
+    test_add()
+    test_mult_ratio()
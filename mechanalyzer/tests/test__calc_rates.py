@@ -146,6 +146,35 @@ def test_dup_plog():
     assert np.allclose(calc_rates, 2*PLOG_0_3ATM_KTS, rtol=1e-3)
 
 
+def test_batch():
+    """ Test the batch evaluation against the reaction-by-reaction one
+    """
+    rxn_param_dct = {
+        ('arr',): ARR_PARAMS, ('dup_arr',): DUP_ARR_PARAMS,
+        ('plog',): PLOG_PARAMS, ('dup_plog',): DUP_PLOG_PARAMS,
+        ('cheb',): CHEB_PARAMS, ('troe',): TROE_PARAMS,
+        ('lind',): LIND_PARAMS}
+    for pressures in (PRESSURES, PRESSURES_NO_HIGH):
+        ref_rxn_ktp_dct = rates.eval_rxn_param_dct(
+            rxn_param_dct, TEMPS2, pressures, batch=False)
+        rxn_ktp_dct = rates.eval_rxn_param_dct(
+            rxn_param_dct, TEMPS2, pressures)
+        for rxn, ref_ktp_dct in ref_rxn_ktp_dct.items():
+            assert set(rxn_ktp_dct[rxn]) == set(ref_ktp_dct)
+            for pressure, (_, ref_kts) in ref_ktp_dct.items():
+                assert np.allclose(
+                    rxn_ktp_dct[rxn][pressure][1], ref_kts, rtol=1e-8)
+
+    # Check the dense array and its reaction index
+    rxns, ktp_arr, pmask = rates.eval_rxn_param_arr(
+        rxn_param_dct, TEMPS[0], PRESSURES)
+    assert ktp_arr.shape == (7, len(PRESSURES), len(TEMPS[0]))
+    assert np.allclose(
+        ktp_arr[rxns.index(('arr',)), PRESSURES.index('high')],
+        ARRHENIUS_KTS, rtol=1e-3)
+    assert not pmask[rxns.index(('plog',)), PRESSURES.index('high')]
+
+
 def test_check_p_t():
     """ Test the enforcement of the P and T array rules
     """
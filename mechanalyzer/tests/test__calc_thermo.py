@@ -54,6 +54,44 @@ def test__invalid_temps():
     assert np.isnan(calc_g[2])
 
 
+def test__therm_arr():
+    """ Test the array-backed thermo calculator
+    """
+    spcs, temps, therm_arr = thermo.create_spc_therm_arr(
+        SPC_NASA7_DCT, BAD_TEMPS)
+    assert spcs == ('N2O',)
+    assert np.allclose(temps, BAD_TEMPS)
+    assert therm_arr.shape == (1, 5, len(BAD_TEMPS))
+    assert np.allclose(therm_arr[0, :4, :2], (CORR_H[:2], CORR_CP[:2],
+                                              CORR_S[:2], CORR_G[:2]),
+                       rtol=1e-3)
+    assert np.all(np.isnan(therm_arr[0, :, 2]))
+
+    # The spc_therm_dct is a view of the same values
+    spc_therm_dct = thermo.create_spc_therm_dct(SPC_NASA7_DCT, BAD_TEMPS)
+    assert np.allclose(spc_therm_dct['N2O'][1:], therm_arr[0], equal_nan=True)
+
+
+def test__deltax_therm():
+    """ Test the reaction thermo calculators
+    """
+    spc_therm_dct = thermo.create_spc_therm_dct(SPC_NASA7_DCT, TEMPS)
+    spc_therm_dct['N2O_2'] = spc_therm_dct['N2O']
+    therm_df = thermo.spc_therm_dct_df(spc_therm_dct)
+
+    dg_rxn = thermo.extract_deltaX_therm(therm_df, ['N2O', 'N2O'], ['N2O_2'],
+                                         'G')
+    assert np.allclose(dg_rxn.index, TEMPS)
+    assert np.allclose(dg_rxn.values, -CORR_G, rtol=1e-3)
+
+    temps, dg_arr = thermo.extract_deltaX_therm_batch(
+        therm_df, ((['N2O', 'N2O'], ['N2O_2']), (['N2O'], ['N2O_2'])), 'G')
+    assert np.allclose(temps, TEMPS)
+    assert np.allclose(dg_arr, ((-CORR_G), (0.0, 0.0, 0.0)), rtol=1e-3)
+
+
 if __name__ == '__main__':
     test__valid_temps()
     test__invalid_temps()
+    test__therm_arr()
+    test__deltax_therm()
@@ -287,6 +287,75 @@ def test_align_rxn_ktp_dcts():
         )
 
 
+def test_assess_rxn_match():
+    """ Test the indexed assess_rxn_match function
+    """
+    rxn_idx = compare.rxn_index(RXN_KTP_DCT1)
+
+    # Forward match with reactants and products written in another order
+    match, rev_rate = compare.assess_rxn_match(
+        (('O', 'H2'), ('H', 'OH'), (None,)), RXN_KTP_DCT1, rxn_idx2=rxn_idx)
+    assert match == (('H2', 'O'), ('OH', 'H'), (None,)) and not rev_rate
+
+    # Reverse match
+    match, rev_rate = compare.assess_rxn_match(
+        (('OH', 'O'), ('O2', 'H'), (None,)), RXN_KTP_DCT1, rxn_idx2=rxn_idx)
+    assert match == (('H', 'O2'), ('OH', 'O'), (None,)) and rev_rate
+
+    # Third bodies: '+O(S)' only matches itself, while '(+M)' also matches None
+    match, _ = compare.assess_rxn_match(
+        (('OH',), ('H', 'O'), ('+O(S)',)), RXN_KTP_DCT1, rxn_idx2=rxn_idx)
+    assert match == (('H', 'O'), ('OH',), ('+O(S)',))
+    match, _ = compare.assess_rxn_match(
+        (('OH',), ('H', 'O'), ('+M',)), RXN_KTP_DCT1, rxn_idx2=rxn_idx)
+    assert match == (('H', 'O'), ('OH',), (None,))
+
+    # No match
+    match, rev_rate = compare.assess_rxn_match(
+        (('H2', 'O2'), ('HO2', 'H'), (None,)), RXN_KTP_DCT1, rxn_idx2=rxn_idx)
+    assert match is None and rev_rate is None
+
+
+def test_spc_index():
+    """ Test the spc_index function
+    """
+    spc_idx = compare.spc_index(SPC_IDENT_DCT1)
+    assert len(spc_idx) == len(SPC_IDENT_DCT1)  # O and O(S) differ by mult
+    fprint = compare.spc_fingerprint(SPC_IDENT_DCT2['OV'])
+    assert spc_idx[fprint] == ['O']
+
+    # The index of a combined dct has one entry per unique species
+    comb_spc_dct = compare.get_mult_comb_mech_spc_dct(
+        [SPC_IDENT_DCT1, SPC_IDENT_DCT2, SPC_IDENT_DCT3])
+    spc_idx = compare.spc_index(comb_spc_dct)
+    assert sorted(len(spcs) for spcs in spc_idx.values()) == [1] * 9
+
+
+def test_reverse_ktp_dcts():
+    """ Test the bulk reverse_ktp_dcts function
+    """
+    rev_rxn_ktp_dct = compare.reverse_ktp_dcts(
+        RXN_KTP_DCT1, SPC_THERM_DCT1, TEMPS)
+    assert tuple(rev_rxn_ktp_dct) == tuple(RXN_KTP_DCT1)
+
+    # Same result as reversing one reaction at a time
+    for rxn, ktp_dct in RXN_KTP_DCT1.items():
+        rev_ktp_dct = compare.reverse_ktp_dct(
+            ktp_dct, SPC_THERM_DCT1, rxn, TEMPS)
+        for pressure, (_, kts) in rev_ktp_dct.items():
+            assert np.allclose(rev_rxn_ktp_dct[rxn][pressure][1], kts)
+
+    # Reversing the reversed rates gives the original rates back
+    flipped_rxn_ktp_dct = {(prds, rcts, third_bods): rev_ktp_dct
+                           for (rcts, prds, third_bods), rev_ktp_dct
+                           in rev_rxn_ktp_dct.items()}
+    frw_rxn_ktp_dct = compare.reverse_ktp_dcts(
+        flipped_rxn_ktp_dct, SPC_THERM_DCT1, TEMPS)
+    for ktp_dct in frw_rxn_ktp_dct.values():
+        for _, kts in ktp_dct.values():
+            assert np.allclose(kts, KTS)
+
+
 if __name__ == '__main__':
     test_rename_spc_dct()
     test_get_comb_spc_dct()
@@ -295,3 +364,6 @@ if __name__ == '__main__':
     test_rename_dcts()
     test_reverse_rxn_ktp_dcts()
     test_align_rxn_ktp_dcts()
+    test_assess_rxn_match()
+    test_spc_index()
+    test_reverse_ktp_dcts()
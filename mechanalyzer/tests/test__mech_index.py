@@ -0,0 +1,32 @@
+"""
+Test the mechanalyzer.builder.mech_index functions
+"""
+
+from mechanalyzer.builder import mech_index
+
+
+RXN1 = (('H', 'O2'), ('OH', 'O'), (None,))
+RXN2 = (('H2', 'O'), ('OH', 'H'), (None,))
+RXN3 = (('OH', 'OH'), ('H2O2',), ('(+M)',))
+RXN_PARAM_DCT = {RXN1: None, RXN2: None, RXN3: None}
+
+
+def test_index():
+    """ Test the reactions of each species
+    """
+
+    mech_idx = mech_index.from_rxn_param_dct(RXN_PARAM_DCT)
+    assert mech_idx.spcs() == ('H', 'O2', 'H2', 'O', 'OH', 'H2O2')
+    assert mech_idx.sources() == {'O2', 'H2'}
+    assert mech_idx.sinks() == {'H2O2'}
+    assert mech_idx.count('OH') == 4
+    assert mech_idx.count('AR') == 0
+
+    assert mech_idx.rxn_idxs(['O2', 'H2O2']) == {0, 2}
+    assert mech_idx.rxn_idxs(['H'], 'prds') == {1}
+    assert mech_idx.rxn_idxs(['OH'], 'rcts') == {2}
+    assert mech_idx.get_rxns(mech_idx.rxn_idxs(['OH'])) == [RXN1, RXN2, RXN3]
+
+
+if __name__ == '__main__':
+    test_index()
@@ -5,7 +5,7 @@ import os
 import tempfile
 import numpy as np
 from ioformat import pathtools
-from mechanalyzer.parser.pes import pes_dictionary
+from mechanalyzer.parser.pes import pes_dictionary, find_conn_chnls
 from mechanalyzer.parser.spc import build_spc_dct
 
 CWD = os.path.dirname(os.path.realpath(__file__))
@@ -45,9 +45,27 @@ def test__pes_dictionary():
     for key, val in pes_dct.items():
         assert val == results_pes_dct[key]
 
+
+def test__find_conn_chnls():
+    """ test mechanalyzer.parser.pes.find_conn_chnls
+
+        A = B and C = D start two sub-pes that D = B merges; X = Y stays
+        apart, and so does E + F = P + Q since P + Q is nowhere else
+    """
+    rct_names_lst = [('A',), ('C',), ('X',), ('D',), ('A',),
+                     ('E', 'F'), ('B',), ('F', 'E')]
+    prd_names_lst = [('B',), ('D',), ('Y',), ('B',), ('E', 'F'),
+                     ('G', 'H'), ('H', 'G'), ('P', 'Q')]
+    rxn_name_lst = [f'rxn{idx}' for idx in range(len(rct_names_lst))]
+
+    connchnls = find_conn_chnls(rct_names_lst, prd_names_lst, rxn_name_lst)
+    assert connchnls == {0: [0, 3, 1, 4, 6, 5], 2: [2], 3: [7]}
+    assert list(connchnls) == [0, 2, 3]
+
     
 if __name__ == '__main__':
     test__pes_dictionary()
+    test__find_conn_chnls()
     #test__connected_channels_dct() #calls also find_conn_chnls
     #test__print_pes_channels()
     
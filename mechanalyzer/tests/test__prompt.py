@@ -4,6 +4,7 @@
 
 import os
 import numpy as np
+import pandas as pd
 from ioformat import pathtools, remove_comment_lines
 import autoparse.pattern as app
 import mess_io
@@ -192,6 +193,37 @@ def test_thermal():
     assert np.isclose(np.trapz(ped_2000.values, x=ped_2000.index), 1)
 
 
+def test_trapz_convolution():
+    """ test ene_partition.trapz_convolution
+    """
+
+    ene = np.concatenate((np.arange(0., 10., 0.5), np.arange(10., 40., 1.)))
+    rho1 = 1e-2*np.exp(0.3*ene) + 1.
+    rho2 = np.sqrt(ene)
+
+    conv = ene_partition.trapz_convolution(rho1, rho2, ene)
+    ref = [np.trapz(rho1[:idx+1]*rho2[idx::-1], x=ene[:idx+1])
+           for idx in range(len(ene))]
+    assert np.allclose(conv, ref, rtol=1e-12, atol=0.)
+    assert np.isclose(
+        np.trapz(rho1, x=ene), ene_partition.trapz_weights(ene) @ rho1)
+
+
+def test_trapz_tail_weights():
+    """ test ene_partition.trapz_tail_weights
+    """
+
+    ene = np.arange(0.5, 20., 0.5)
+    idx_ene_vect = np.arange(3, len(ene))
+    ped = np.exp(-(ene[idx_ene_vect]-10.)**2)
+
+    wts = ene_partition.trapz_tail_weights(ene, idx_ene_vect)
+    ref = [np.trapz(ped[idx_ene_vect >= idx],
+                    x=ene[idx_ene_vect[idx_ene_vect >= idx]])
+           for idx in range(len(ene))]
+    assert np.allclose(wts @ ped, ref, rtol=1e-12, atol=0.)
+
+
 def test_bf_from_phi1a():
     """ test calculator.bf.bf_tp_dct
         calls calculator.bf.bf_tp_df_full, bf_tp_df_todct
@@ -245,6 +277,33 @@ def test_bf_from_fne():
         np.array([1.42060802e-02, 5.47827434e-02]), atol=1e-3, rtol=1e-2)
 
 
+def test_bf_tp_arr():
+    """ test calculator.bf.bf_tp_arr
+    """
+
+    ene = np.arange(0., 30., 0.5)
+    ped_df = pd.DataFrame(index=[500., 1000.], columns=[1.], dtype=object)
+    hotbf_df = pd.DataFrame(index=[500., 1000.], columns=[1.], dtype=object)
+    for temp in ped_df.index:
+        ped_df.at[temp, 1.] = pd.Series(np.exp(-(ene-10.)**2), index=ene)
+        hotbf_df.at[temp, 1.] = pd.DataFrame(
+            {'A': 0.2 + 0.*ene, 'B': 0.8 + 0.*ene}, index=ene)
+
+    temps, pressures, allspecies, bf_arr, filled = bf.bf_tp_arr(
+        ped_df, hotbf_df)
+    assert list(temps) == [500., 1000.] and list(pressures) == [1.]
+    assert list(allspecies) == ['A', 'B']
+    assert np.allclose(bf_arr, [[[0.2, 0.8]], [[0.2, 0.8]]])
+    assert filled.all()
+
+    # a T, P without a ped is not filled, and its temperature is dropped
+    ped_df.at[500., 1.] = None
+    _, _, _, bf_arr, filled = bf.bf_tp_arr(ped_df, hotbf_df)
+    assert filled.tolist() == [[False], [True]]
+    assert np.isnan(bf_arr[0]).all()
+    assert list(bf.bf_tp_df_full(ped_df, hotbf_df).index) == [1000.]
+
+
 def test_new_ktp_dct():
     """ test calculator.bf.merge_bf_ktp
         calls calculator.bf.merge_bf_rates
@@ -318,7 +377,10 @@ if __name__ == '__main__':
     test_beta_phi2a()
     test_beta_phi3a()
     test_thermal()
+    test_trapz_convolution()
+    test_trapz_tail_weights()
     test_bf_from_phi1a()
     test_bf_from_fne()
+    test_bf_tp_arr()
     test_rovib_dos()
     test_new_ktp_dct()
@@ -0,0 +1,108 @@
+""" Test the reaction chains of the multi-PES prompt dissociation in
+    mechanalyzer.builder._prompt, on mock MESS file strings
+"""
+
+import numpy as np
+import mess_io
+from mechanalyzer import calculator
+from mechanalyzer.builder import _prompt
+
+TEMPS = np.array([500., 1000.])
+
+# Each mock input string is 'label|ped fragments|hot species'
+# PED PES P0 feeds the hot PESs H0 and H1; PED PES P1 feeds the PEDHOT
+# PES I0, whose products feed the hot PES H1
+PES_0 = [
+    {'inp': 'P0|R1+R3|', 'ktp_out': '', 'ped': '', 'ke_out': ''},
+    {'inp': 'P1|R2+Y|', 'ktp_out': '', 'ped': '', 'ke_out': ''}]
+PES_I = [
+    {'inp': 'I0|R3+Z|R2', 'log': '', 'ped': '', 'ke_out': ''}]
+PES_END = [
+    {'inp': 'H0||R1', 'log': ''},
+    {'inp': 'H1||R3', 'log': ''}]
+KS = {'H0': 1.0, 'H1': 2.0, 'I0': 4.0}
+
+
+def _ped_names(inp_str):
+    """ Stand-in for mess_io.reader.ped.ped_names
+    """
+    ped = inp_str.split('|')[1]
+    return ([[ped]] if ped else []), None
+
+
+def _get_hot_species(inp_str):
+    """ Stand-in for mess_io.reader.hoten.get_hot_species
+    """
+    hot = inp_str.split('|')[2]
+    return {hot: None} if hot else {}
+
+
+def _ktp_dct(rct, hot_inp_str):
+    """ Mock rates of a prompt step: one rxn of its own, and one shared by
+        all steps
+    """
+    hot = hot_inp_str.split('|')[0]
+    kts = KS[hot] * TEMPS
+    return {((rct,), (hot,), (None,)): {1.0: (TEMPS, kts)},
+            (('A',), ('B',), (None,)): {1.0: (TEMPS, kts)}}
+
+
+def _prompt_dissociation_ktp_dct(ped_inp_str, _ktp_out, _ped, _ke_out,
+                                 hot_inp_str, *_args, **_kwargs):
+    """ Stand-in for calculator.nonboltz.prompt_dissociation_ktp_dct
+    """
+    rct = ped_inp_str.split('|')[0]
+    return _ktp_dct(rct, hot_inp_str), {}, {}
+
+
+def _prompt_chain_ktp_dct(prompt_ktp_dct, _pednew_dct, hot_inp_str,
+                          *_args, **_kwargs):
+    """ Stand-in for calculator.nonboltz.prompt_chain_ktp_dct
+    """
+    rct = next(iter(prompt_ktp_dct))[1][0]
+    return _ktp_dct(rct, hot_inp_str), {}, {}
+
+
+def test__rxn_chains_calc():
+    """ test mechanalyzer.builder._prompt.rxn_chains_calc
+
+        the 'hot' and 'chain' tasks give the same merged rates in serial
+        and on a pool of processes
+    """
+    mocked = (
+        (mess_io.reader.ped, 'ped_names', _ped_names),
+        (mess_io.reader.hoten, 'get_hot_species', _get_hot_species),
+        (calculator.nonboltz, 'prompt_dissociation_ktp_dct',
+         _prompt_dissociation_ktp_dct),
+        (calculator.nonboltz, 'prompt_chain_ktp_dct', _prompt_chain_ktp_dct))
+    originals = [getattr(module, name) for module, name, _ in mocked]
+    try:
+        for module, name, mock in mocked:
+            setattr(module, name, mock)
+        rxn_ktp_dcts = [
+            _prompt.rxn_chains_calc(
+                PES_0, PES_I, PES_END, 'equip_simple', 0.01, nprocs=nprocs)
+            for nprocs in (1, 2)]
+    finally:
+        for (module, name, _), original in zip(mocked, originals):
+            setattr(module, name, original)
+
+    # P0: H0, then H1 (which replaces the shared rxn of H0);
+    # P1: I0, then H1 at the end of the chain (which replaces the shared
+    # rxn of I0), added to the shared rxn of P0
+    ref_ks = {
+        (('P0',), ('H0',), (None,)): 1.0,
+        (('A',), ('B',), (None,)): 4.0,
+        (('P0',), ('H1',), (None,)): 2.0,
+        (('P1',), ('I0',), (None,)): 4.0,
+        (('I0',), ('H1',), (None,)): 2.0}
+    for rxn_ktp_dct in rxn_ktp_dcts:
+        assert list(rxn_ktp_dct) == list(ref_ks)
+        for rxn, ref_k in ref_ks.items():
+            temps, kts = rxn_ktp_dct[rxn][1.0]
+            assert np.allclose(temps, TEMPS)
+            assert np.allclose(kts, ref_k * TEMPS)
+
+
+if __name__ == '__main__':
+    test__rxn_chains_calc()
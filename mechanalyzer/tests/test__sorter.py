@@ -7,6 +7,7 @@ import tempfile
 import numpy as np
 from ioformat import pathtools
 from mechanalyzer.builder import sorter
+from mechanalyzer.builder import _sort_util
 from mechanalyzer.parser import mech as mparser
 from mechanalyzer.parser import ckin_ as ckin_parser
 from mechanalyzer.parser import new_spc as sparser
@@ -718,6 +719,26 @@ def test__filter_pesgroups():
 
     assert results == pes_groups
 
+def test__names_csr():
+    """ test mechanalyzer.builder._sort_util.names_csr, csr_append
+        and csr_count
+
+        species of the reaction sides interned to CSR integer arrays
+    """
+    spc_idx = {'H': 0, 'O2': 1, 'OH': 2, 'O': 3}
+    ptr, ids = _sort_util.names_csr([('H', 'O2'), ('OH',), ('OH', 'OH')], spc_idx)
+    assert list(ptr) == [0, 2, 3, 5]
+    assert list(ids) == [0, 1, 2, 2, 2]
+
+    spc_mask = np.array([False, False, True, False])
+    assert list(_sort_util.csr_count((ptr, ids), spc_mask)) == [0, 1, 2]
+
+    ptr, ids = _sort_util.csr_append(
+        (ptr, ids), _sort_util.names_csr([('O',)], spc_idx))
+    assert list(ptr) == [0, 2, 3, 5, 6]
+    assert list(ids) == [0, 1, 2, 2, 2, 3]
+
+
 # Helper function
 
 
@@ -753,6 +774,7 @@ if __name__ == '__main__':
     test__sortby_submech_prompt()    
     test__sortby_submech_subpes_chnl()
     test__sortby_submech_class()
+    test__names_csr()
 
     # still to fix
     # test__sortby_submech_ext()
@@ -0,0 +1,78 @@
+""" Test the enantiomer index and the clique search used to assemble S-CCSs
+    in mechanalyzer.builder._stereo
+"""
+
+import itertools as it
+from mechanalyzer.builder import _stereo
+
+# (R)- and (S)-2-butanol, and ethanol
+R_ICH = 'InChI=1S/C4H10O/c1-3-4(2)5/h4-5H,3H2,1-2H3/t4-/m1/s1'
+S_ICH = 'InChI=1S/C4H10O/c1-3-4(2)5/h4-5H,3H2,1-2H3/t4-/m0/s1'
+ETOH_ICH = 'InChI=1S/C2H6O/c1-2-3/h3H,2H2,1H3'
+
+
+def _nbr_bits(nnodes, edges):
+    """ Bitset neighbors of a graph given by its edges
+    """
+    nbr_bits = [0] * nnodes
+    for idx_i, idx_j in edges:
+        nbr_bits[idx_i] |= 1 << idx_j
+        nbr_bits[idx_j] |= 1 << idx_i
+    return nbr_bits
+
+
+def test__max_cliques():
+    """ Test the maximal cliques of a few graphs
+    """
+
+    # Three enantiomer pairs: every clique takes one member of each pair
+    edges = [(idx_i, idx_j) for idx_i, idx_j in it.combinations(range(6), 2)
+             if idx_i // 2 != idx_j // 2]
+    cliques = _stereo._max_cliques(_nbr_bits(6, edges))
+    assert cliques == sorted(it.product((0, 1), (2, 3), (4, 5)))
+
+    # A triangle with a tail and an isolated node
+    cliques = _stereo._max_cliques(
+        _nbr_bits(5, [(0, 1), (0, 2), (1, 2), (2, 3)]))
+    assert cliques == [(0, 1, 2), (2, 3), (4,)]
+
+    # No nodes: the empty clique
+    assert _stereo._max_cliques([]) == [()]
+
+
+def test__sccs_compat_bits():
+    """ Test the compatibility graph of S-CCSs and its maximal cliques
+    """
+
+    # A and B are enantiomer pairs (ids 0/1 and 2/3), C has no enantiomer
+    ent_idx = {
+        'A': (0, 1, 0, True), 'A_ENT': (1, 0, 0, True),
+        'B': (2, 3, 2, True), 'B_ENT': (3, 2, 2, True),
+        'C': (4, 4, 4, False)}
+    spcs_lst = [['A', 'C'], ['B', 'C'], ['A', 'B'], ['A_ENT', 'B'],
+                ['A_ENT', 'B_ENT']]
+    nbr_bits = _stereo._sccs_compat_bits(spcs_lst, ent_idx)
+    assert nbr_bits == [0b00110, 0b01101, 0b00011, 0b00010, 0b00000]
+
+    # Two cliques that share S-CCS 1, and S-CCS 4 clashes with all others
+    assert _stereo._max_cliques(nbr_bits) == [(0, 1, 2), (1, 3), (4,)]
+
+
+def test__enant_index():
+    """ Test the species and reaction enantiomer index
+    """
+
+    ent_idx = _stereo._enant_index([R_ICH, ETOH_ICH])
+    assert ent_idx[R_ICH][:3] == (0, 1, 0)
+    assert ent_idx[S_ICH][:3] == (1, 0, 0)  # added as R_ICH's enantiomer
+    assert ent_idx[ETOH_ICH][:3] == (2, 2, 2)
+    assert ent_idx[R_ICH][3] and not ent_idx[ETOH_ICH][3]
+
+    rxn = ((R_ICH,), (ETOH_ICH,), (None,))
+    assert _stereo._rxn_ids(rxn, ent_idx) == (((0,), (2,)), ((1,), None))
+
+
+if __name__ == '__main__':
+    test__max_cliques()
+    test__sccs_compat_bits()
+    test__enant_index()
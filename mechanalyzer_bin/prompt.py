@@ -29,11 +29,15 @@ PAR.add_argument('-b', '--bf-threshold', default=0.01,
                  help='Minimum branching fraction to include in Prompt (0.1)')
 PAR.add_argument('-f', '--fit_method', default='plog',
                  help='method to fit the rates (plog, chebyshev)')
+PAR.add_argument('-c', '--cache', default=None,
+                 help='file to store the parsed MESS files for reruns (None)')
 
 OPTS = vars(PAR.parse_args())
 
 # Set path to current directory where MESS files exist
 CWD = os.getcwd()
+if OPTS['cache'] is not None:
+    mechanalyzer.cache.set_cache_path(os.path.join(CWD, OPTS['cache']))
 
 list_strs_dct = []
 # Read the input and output files for MESS calculation of 1st PES
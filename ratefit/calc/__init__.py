@@ -10,6 +10,10 @@ from ratefit.calc._rates import lindemann
 from ratefit.calc._rates import troe
 from ratefit.calc._rates import plog
 from ratefit.calc._rates import cheb
+from ratefit.calc._rates import cheb_log_ktp
+from ratefit.calc._rates import cheb_temp_basis
+from ratefit.calc._rates import cheb_pressure_basis
+from ratefit.calc._rates import cheb_basis
 from ratefit.calc._rates import p_to_m
 
 
@@ -22,5 +26,9 @@ __all__ = [
     'troe',
     'plog',
     'cheb',
+    'cheb_log_ktp',
+    'cheb_temp_basis',
+    'cheb_pressure_basis',
+    'cheb_basis',
     'p_to_m',
 ]
@@ -3,7 +3,6 @@ Calculate rates with various fitting functions
 """
 
 import numpy as np
-from scipy.special import eval_chebyt
 from phydat import phycon
 
 
@@ -382,43 +381,113 @@ def cheb(alpha, tlim, plim, temps, pressures):
         :rtype: dict[pressure: temps]
     """
 
-    def cheb_one_pressure(alpha, tlim, plim, temps, pressure):
-        """ Calculates T,P-dependent rate constants [k(T,P)]s using
-            a Chebyshev functional expression, at a given pressure,
-            across several temperatures.
-        """
+    log_ktps = cheb_log_ktp(alpha, tlim, plim, temps, pressures)
 
-        tmin, tmax = tlim
-        pmin, pmax = plim
-        alpha_nrows, alpha_ncols = alpha.shape
+    kp_dct = {}
+    for pidx, pressure in enumerate(pressures):
+        kp_dct[pressure] = 10**(log_ktps[:, pidx])
 
-        ktps = np.zeros(len(temps))
-        for i, temp in enumerate(temps):
-            ctemp = (
-                (2.0 * temp**(-1) - tmin**(-1) - tmax**(-1)) /
-                (tmax**(-1) - tmin**(-1)))
-            cpress = (
-                (2.0 * np.log10(pressure) - np.log10(pmin) - np.log10(pmax)) /
-                (np.log10(pmax) - np.log10(pmin)))
+    ktp_dct = _ktp_dct(kp_dct, temps)
 
-            logktp = 0.0
-            for j in range(alpha_nrows):
-                for k in range(alpha_ncols):
-                    logktp += (alpha[j][k] * eval_chebyt(j, ctemp) *
-                               eval_chebyt(k, cpress))
+    return ktp_dct
 
-            ktps[i] = 10**(logktp)
 
-        return ktps
+def cheb_log_ktp(alpha, tlim, plim, temps, pressures):
+    """ Calculates log10 k(T,P)s from a Chebyshev expression at all
+        temperatures and pressures at once, as Tbasis @ alpha @ Pbasis.T.
 
-    kp_dct = {}
-    for pressure in pressures:
-        kp_dct[pressure] = cheb_one_pressure(
-            alpha, tlim, plim, temps, pressure)
+        A stack of alpha matrices for several reactions that share the same
+        tlim and plim may be given, in which case the result is stacked
+        the same way.
 
-    ktp_dct = _ktp_dct(kp_dct, temps)
+        :param alpha: Chebyshev coefficient matrix (or matrices)
+        :type alpha: numpy.ndarray of shape (..., N, M)
+        :param tlim: minimum and maximum temperature of the model (K)
+        :type tlim: (float, float)
+        :param plim: minimum and maximum pressure of the model (atm)
+        :type plim: (float, float)
+        :param temps: temperatures at which to do calculations (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures at which to do calculations (atm)
+        :type pressures: list(float)
+        :return log_ktps: log10 k(T,P)s
+        :rtype: numpy.ndarray of shape (..., ntemp, npressure)
+    """
 
-    return ktp_dct
+    alpha = np.asarray(alpha, dtype=float)
+    tbasis = cheb_temp_basis(temps, tlim, alpha.shape[-2])
+    pbasis = cheb_pressure_basis(pressures, plim, alpha.shape[-1])
+
+    return tbasis @ alpha @ pbasis.T
+
+
+def cheb_temp_basis(temps, tlim, nterms):
+    """ Builds the Chebyshev basis matrix over the reduced inverse
+        temperatures of a Chebyshev expression.
+
+        :param temps: temperatures (K)
+        :type temps: numpy.ndarray
+        :param tlim: minimum and maximum temperature of the model (K)
+        :type tlim: (float, float)
+        :param nterms: number of basis functions (rows of alpha)
+        :type nterms: int
+        :return tbasis: T_j(ctemp) for all temps
+        :rtype: numpy.ndarray of shape (ntemp, nterms)
+    """
+
+    tmin, tmax = tlim
+    temps = np.asarray(temps, dtype=float)
+    ctemps = (
+        (2.0 * temps**(-1) - tmin**(-1) - tmax**(-1)) /
+        (tmax**(-1) - tmin**(-1)))
+
+    return cheb_basis(ctemps, nterms)
+
+
+def cheb_pressure_basis(pressures, plim, nterms):
+    """ Builds the Chebyshev basis matrix over the reduced log pressures
+        of a Chebyshev expression.
+
+        :param pressures: pressures (atm)
+        :type pressures: list(float)
+        :param plim: minimum and maximum pressure of the model (atm)
+        :type plim: (float, float)
+        :param nterms: number of basis functions (columns of alpha)
+        :type nterms: int
+        :return pbasis: T_k(cpress) for all pressures
+        :rtype: numpy.ndarray of shape (npressure, nterms)
+    """
+
+    pmin, pmax = plim
+    logps = np.log10(np.asarray(pressures, dtype=float))
+    cpresses = (
+        (2.0 * logps - np.log10(pmin) - np.log10(pmax)) /
+        (np.log10(pmax) - np.log10(pmin)))
+
+    return cheb_basis(cpresses, nterms)
+
+
+def cheb_basis(xvals, nterms):
+    """ Evaluates the first nterms Chebyshev polynomials of the first kind
+        at some points, using the recurrence T_n = 2x T_n-1 - T_n-2.
+
+        :param xvals: points in [-1, 1] at which to evaluate polynomials
+        :type xvals: numpy.ndarray
+        :param nterms: number of polynomials (T_0 to T_nterms-1)
+        :type nterms: int
+        :return basis: polynomial values
+        :rtype: numpy.ndarray of shape (*xvals.shape, nterms)
+    """
+
+    xvals = np.asarray(xvals, dtype=float)
+    basis = np.empty(xvals.shape + (nterms,))
+    basis[..., 0] = 1.0
+    if nterms > 1:
+        basis[..., 1] = xvals
+    for nidx in range(2, nterms):
+        basis[..., nidx] = 2.0 * xvals * basis[..., nidx-1] - basis[..., nidx-2]
+
+    return basis
 
 
 # Functions for calculating terms in certain P-dependent expressions
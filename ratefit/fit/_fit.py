@@ -1,11 +1,19 @@
 """ This is Clayton's new version
 """
 
+import io
+import os
 import copy
+import time
+import functools
+import traceback
+import contextlib
+import multiprocessing
 import numpy
 from ratefit.fit import arr
 from ratefit.fit import plog
 from ratefit.fit import cheb
+from ratefit.fit import err
 
 DEFAULT_PDEP = {
     'temps': (500.0, 1000, 2000.0),
@@ -36,9 +44,14 @@ ALLOWED_FIT_METHODS = (
 
 
 def fit_rxn_ktp_dct(rxn_ktp_dct, fit_method, pdep_dct=None, arrfit_dct=None,
-                    chebfit_dct=None, troefit_dct=None):
+                    chebfit_dct=None, troefit_dct=None, nprocs=1):
     """ Fits all reactions in a rxn_ktp_dct to some desired form
 
+        With nprocs > 1, reactions are fitted in chunks by a pool of
+        processes, and the output of each fit is printed in the order of the
+        reactions. Either way, each fit is timed, and a failed fit is
+        reported and skipped instead of stopping the whole set.
+
         :param rxn_ktp_dct: rate constants to be fitted, for multiple reactions
         :type rxn_ktp_dct: dict {rxn: ktp_dct}
         :param fit_method: desired fit form; 'arr', 'plog', 'cheb', or 'troe'
@@ -51,32 +64,115 @@ def fit_rxn_ktp_dct(rxn_ktp_dct, fit_method, pdep_dct=None, arrfit_dct=None,
         :type chebfit_dct: dict
         :param troefit_dct: instructions for Troe fitting
         :type troefit_dct: dict
+        :param nprocs: number of processes fitting reactions in parallel
+        :type nprocs: int or 'auto'
         :return rxn_param_dct: fitted parameters for each reaction
         :rtype: dict {rxn: params}
         :return rxn_err_dct: fitting errors for each reaction
         :rtype: dict {rxn: err_dct}
     """
-    def rxn_name_str(rxn, newline=False):
-        """ get a reaction name string
-        """
-        return ' = '.join((' + '.join(rxn[0]), ' + '.join(rxn[1])))
+
+    fit_kwargs = {'pdep_dct': pdep_dct, 'arrfit_dct': arrfit_dct,
+                  'chebfit_dct': chebfit_dct, 'troefit_dct': troefit_dct}
+    if nprocs == 'auto':
+        nprocs = os.cpu_count()
 
     rxn_param_dct = {}
     rxn_err_dct = {}
-    for rxn, ktp_dct in rxn_ktp_dct.items():
-        print(f'\nFitting Reaction: {rxn_name_str(rxn)}')
-        params, err_dct = fit_ktp_dct(ktp_dct, fit_method, pdep_dct=pdep_dct,
-                                      arrfit_dct=arrfit_dct,
-                                      chebfit_dct=chebfit_dct,
-                                      troefit_dct=troefit_dct)
-        if all(x is not None for x in (params, err_dct)):
-            rxn_param_dct[rxn] = params
-            rxn_err_dct[rxn] = err_dct
-        print('--------------------------------\n')
+    fit_fxn = functools.partial(
+        _fit_ktp_dct_logged, fit_method=fit_method, **fit_kwargs)
+    if nprocs == 1 or len(rxn_ktp_dct) < 2:
+        # print the output of each fit as it runs
+        for rxn, ktp_dct in rxn_ktp_dct.items():
+            print(f'\nFitting Reaction: {_rxn_name_str(rxn)}')
+            result = fit_fxn(ktp_dct, capture=False)
+            _add_fit_result(rxn, result, rxn_param_dct, rxn_err_dct)
+    else:
+        nprocs = min(nprocs, len(rxn_ktp_dct))
+        # a few chunks per process, to balance the load
+        chunksize = max(1, len(rxn_ktp_dct) // (4 * nprocs))
+        with multiprocessing.Pool(nprocs) as pool:
+            results = pool.imap(
+                fit_fxn, rxn_ktp_dct.values(), chunksize=chunksize)
+            for rxn, result in zip(rxn_ktp_dct, results):
+                print(f'\nFitting Reaction: {_rxn_name_str(rxn)}')
+                print(result[2], end='')
+                _add_fit_result(rxn, result, rxn_param_dct, rxn_err_dct)
+
+    if rxn_err_dct:
+        print(_err_report(rxn_err_dct))
 
     return rxn_param_dct, rxn_err_dct
 
 
+def _fit_ktp_dct_logged(ktp_dct, fit_method, capture=True, **fit_kwargs):
+    """ Runs fit_ktp_dct, keeping its wall time and, if it fails, the
+        traceback; with capture=True (in a worker process), its printed
+        output is kept as well instead of being printed
+
+        :return: params, err_dct, printed output, wall time (s), traceback
+        :rtype: (RxnParams, dict, str, float, str)
+    """
+
+    params, err_dct, error = None, None, None
+    start = time.time()
+    log = io.StringIO()
+    with (contextlib.redirect_stdout(log) if capture
+          else contextlib.nullcontext()):
+        try:
+            params, err_dct = fit_ktp_dct(ktp_dct, fit_method, **fit_kwargs)
+        # any failure of a single fit is reported, and the other reactions
+        # are still fitted
+        except Exception:  # pylint: disable=broad-exception-caught
+            error = traceback.format_exc()
+
+    return params, err_dct, log.getvalue(), time.time() - start, error
+
+
+def _add_fit_result(rxn, result, rxn_param_dct, rxn_err_dct):
+    """ Reports the outcome of the fit of a reaction and, if it succeeded,
+        adds its parameters and errors to the dictionaries
+    """
+
+    params, err_dct, _, fit_time, error = result
+    if error is not None:
+        print(f'*Error: fit failed after {fit_time:.2f} s, '
+              f'skipping the reaction\n{error}')
+    else:
+        print(f'Fit done in {fit_time:.2f} s')
+    if all(x is not None for x in (params, err_dct)):
+        rxn_param_dct[rxn] = params
+        rxn_err_dct[rxn] = err_dct
+    print('--------------------------------\n')
+
+
+def _err_report(rxn_err_dct):
+    """ Builds a table summarizing the fitting errors of all reactions
+
+        :param rxn_err_dct: fitting errors for each reaction
+        :type rxn_err_dct: dict {rxn: err_dct}
+        :rtype: str
+    """
+
+    rxns, max_errs, mean_errs, max_pressures, max_temps = err.get_err_stats(
+        rxn_err_dct)
+    lines = ['Summary of fitting errors (%)',
+             f'{"max":>10s} {"mean":>10s} {"P(max)":>10s} {"T(max)":>8s}'
+             '   reaction']
+    for rxn, max_err, mean_err, pressure, temp in zip(
+            rxns, max_errs, mean_errs, max_pressures, max_temps):
+        lines.append(f'{max_err:10.2f} {mean_err:10.2f} {str(pressure):>10s} '
+                     f'{temp:8.1f}   {_rxn_name_str(rxn)}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def _rxn_name_str(rxn):
+    """ get a reaction name string
+    """
+    return ' = '.join((' + '.join(rxn[0]), ' + '.join(rxn[1])))
+
+
 def fit_ktp_dct(ktp_dct, fit_method, pdep_dct=None, arrfit_dct=None,
                 chebfit_dct=None, troefit_dct=None):
     """ Fits a single ktp_dct to some desired form
@@ -12,7 +12,8 @@ RC = phycon.RC_CAL  # universal gas constant in cal/mol-K
 GUESS_BNDS = ((1, 1e4), (0.1, 20), (1, 100))  # guess bounds for double fitting
 
 
-def get_params(ktp_dct, dbltol=15, dbl_iter=1, tref=1.0):
+def get_params(ktp_dct, dbltol=15, dbl_iter=1, tref=1.0, sing_params=None,
+               sing_kts=None, dbl_guess=None):
     """ Gets the fitting parameters for an Arrhenius fit to rate constant data.
         Also gets the errors of that fit. Performs either a single or double
         Arrhenius fit.
@@ -25,6 +26,15 @@ def get_params(ktp_dct, dbltol=15, dbl_iter=1, tref=1.0):
         :type dbl_iter: int
         :param tref: reference temp for the modified Arrhenius form
         :type tref: float
+        :param sing_params: single Arrhenius fit, if already done (e.g., by
+            single_arr_batch); otherwise it is done here
+        :type sing_params: autoreact.RxnParams object
+        :param sing_kts: rate constants of the given single fit, used for its
+            errors (otherwise sing_params are evaluated)
+        :type sing_kts: numpy.ndarray of shape (num_temps,)
+        :param dbl_guess: double Arrhenius parameters to try first as the
+            initial guess of the double fit (e.g., from a nearby pressure)
+        :type dbl_guess: autoreact.RxnParams object
         :return params: fitted Arrhenius parameters
         :rtype: autoreact.RxnParams object
         :return err_dct: fitting errors
@@ -37,8 +47,14 @@ def get_params(ktp_dct, dbltol=15, dbl_iter=1, tref=1.0):
 
     # Perform single fit and assess its errors
     (temps, kts) = ktp_dct[pressure]  # read data
-    sing_params = single_arr(temps, kts)
-    sing_err_dct = err.get_err_dct(ktp_dct, sing_params)
+    if sing_params is None:
+        arr_params, (sing_kts,) = single_arr_batch(
+            [temps], [kts], return_kts=True)
+        sing_params = RxnParams(arr_dct={'arr_tuples': [list(arr_params[0])]})
+    if sing_kts is None:
+        sing_err_dct = err.get_err_dct(ktp_dct, sing_params)
+    else:
+        sing_err_dct = {pressure: (temps, err.get_errs(kts, sing_kts))}
     sing_max_err = err.get_max_err(sing_err_dct)
 
     # Put in checks to see if a single fit should be used
@@ -61,11 +77,12 @@ def get_params(ktp_dct, dbltol=15, dbl_iter=1, tref=1.0):
         print('Attempting double fit...')
 
         # Perfom a double fit
-        doub_params, guess_idx = double_arr(temps, kts, sing_params, tref=tref,
-                                            dbltol=dbltol, dbl_iter=dbl_iter)
+        doub_params, guess_idx, doub_errs = double_arr(
+            temps, kts, sing_params, tref=tref, dbltol=dbltol,
+            dbl_iter=dbl_iter, init_params=dbl_guess)
 
         # Assess errors
-        doub_err_dct = err.get_err_dct(ktp_dct, doub_params)
+        doub_err_dct = {pressure: (temps, doub_errs)}
         doub_max_err = err.get_max_err(doub_err_dct)
         print(f'Double fit obtained with max error of {doub_max_err:.1f}% '
               f'after {guess_idx + 1} iteration(s).')
@@ -101,41 +118,7 @@ def single_arr(temps, kts, tref=1.0):
         :rtype: autoreact.RxnParams object
     """
 
-    # Consider several cases depending on the number of valid rate constants
-    # no k is positive, so return all zeros
-    if kts.size == 0:
-        a_fit, n_fit, ea_fit = 0.0, 0.0, 0.0
-
-    # if num(k) is 1: set A = k
-    elif kts.size == 1:
-        a_fit, n_fit, ea_fit = kts[0], 0.0, 0.0
-
-    # if num(k) > 0 is 2,3: fit A and Ea
-    elif kts.size in (2, 3):
-        # Build vectors and matrices used for the fitting
-        a_vec = numpy.ones(len(temps))
-        ea_vec = (-1.0 / RC) * (1.0 / temps)
-        coeff_mat = numpy.array([a_vec, ea_vec], dtype=numpy.float64)
-        coeff_mat = coeff_mat.transpose()
-        k_vec = numpy.log(kts)
-        # Perform the least-squares fit
-        theta = numpy.linalg.lstsq(coeff_mat, k_vec, rcond=None)[0]
-        # Set the fitting parameters
-        a_fit, n_fit, ea_fit = numpy.exp(theta[0]), 0.0, theta[1]
-
-    # if num(k) > 0 is more than 3: fit A, n, and Ea
-    elif kts.size > 3:
-        # Build vectors and matrices used for the fitting
-        a_vec = numpy.ones(len(temps))
-        n_vec = numpy.log(temps / tref)
-        ea_vec = (-1.0 / RC) * (1.0 / temps)
-        coeff_mat = numpy.array([a_vec, n_vec, ea_vec], dtype=numpy.float64)
-        coeff_mat = coeff_mat.transpose()
-        k_vec = numpy.log(kts)
-        # Perform the least-squares fit
-        theta = numpy.linalg.lstsq(coeff_mat, k_vec, rcond=None)[0]
-        # Set the fitting parameters
-        a_fit, n_fit, ea_fit = numpy.exp(theta[0]), theta[1], theta[2]
+    a_fit, n_fit, ea_fit = single_arr_batch([temps], [kts], tref=tref)[0]
 
     # Pack the parameters into an arr_dct and instantiate RxnParams
     arr_dct = {'arr_tuples': [[a_fit, n_fit, ea_fit]]}
@@ -144,10 +127,109 @@ def single_arr(temps, kts, tref=1.0):
     return params
 
 
-def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
+def single_arr_batch(temps_lst, kts_lst, tref=1.0, return_kts=False):
+    """ Fits several sets of pressure-independent rate constants (e.g., many
+        reactions or PLOG pressures) to a single Arrhenius form. Sets that
+        share a temperature grid and the same positive k values are solved
+        with one least-squares call on a shared design matrix; only the
+        non-positive k values of each set are masked out.
+
+        :param temps_lst: temperatures at which rate constants are defined (K)
+        :type temps_lst: list [numpy.ndarray of shape (num_temps,), ...]
+        :param kts_lst: rate constants
+        :type kts_lst: list [numpy.ndarray of shape (num_temps,), ...]
+        :param tref: reference temp for the modified Arrhenius form
+        :type tref: float
+        :param return_kts: whether to also return the fitted rate constants
+        :type return_kts: bool
+        :return arr_params: fitted [A, n, Ea] of each set
+        :rtype: numpy.ndarray of shape (num_sets, 3)
+        :return fit_kts_lst: fitted rate constants of each set, at all of its
+            temperatures (only if return_kts)
+        :rtype: list [numpy.ndarray of shape (num_temps,), ...]
+    """
+
+    # Group the sets by temperature grid and by mask of positive k values
+    grid_dct = {}
+    for idx, (temps, kts) in enumerate(zip(temps_lst, kts_lst)):
+        temps = numpy.asarray(temps, dtype=numpy.float64)
+        kts = numpy.asarray(kts, dtype=numpy.float64)
+        assert temps.shape == kts.shape, (
+            f'{len(temps)} temperatures for {len(kts)} rate constants')
+        valid = kts > 0
+        key = (temps.tobytes(), valid.tobytes())
+        if key not in grid_dct:
+            grid_dct[key] = (temps, valid, [], [])
+        grid_dct[key][2].append(idx)
+        grid_dct[key][3].append(kts[valid])
+
+    arr_params = numpy.zeros((len(kts_lst), 3), dtype=numpy.float64)
+    fit_kts_lst = [None] * len(kts_lst)
+    for all_temps, valid, idxs, kts_sets in grid_dct.values():
+        temps = all_temps[valid]
+        k_mat = numpy.array(kts_sets).T  # shape (num_valid, num_sets)
+
+        # Consider several cases depending on the number of valid k values
+        # (if no k is positive, all params are kept as zeros)
+        # if num(k) is 1: set A = k
+        if temps.size == 1:
+            arr_params[idxs, 0] = k_mat[0]
+        # if num(k) > 0 is 2,3: fit A and Ea; otherwise fit A, n, and Ea
+        elif temps.size > 1:
+            fit_n = temps.size > 3
+            coeff_mat = design_matrix(temps, tref=tref, fit_n=fit_n)
+            theta = numpy.linalg.lstsq(
+                coeff_mat, numpy.log(k_mat), rcond=None)[0]
+            arr_params[idxs, 0] = numpy.exp(theta[0])
+            arr_params[idxs, 2] = theta[-1]
+            if fit_n:
+                arr_params[idxs, 1] = theta[1]
+
+        # Get the fitted rate constants of the whole group at once
+        if return_kts:
+            a_vec, n_vec, ea_vec = arr_params[idxs].T[:, :, None]
+            group_kts = a_vec * numpy.exp(
+                n_vec * numpy.log(all_temps / tref) - ea_vec / (RC * all_temps))
+            for idx, fit_kts in zip(idxs, group_kts):
+                fit_kts_lst[idx] = fit_kts
+
+    if return_kts:
+        return arr_params, fit_kts_lst
+    return arr_params
+
+
+def design_matrix(temps, tref=1.0, fit_n=True):
+    """ Builds the least-squares design matrix for a linearized single
+        Arrhenius fit, ln k = ln A + n ln(T/Tref) - Ea/(RT)
+
+        :param temps: temperatures at which rate constants are defined (K)
+        :type temps: numpy.ndarray of shape (num_temps,)
+        :param tref: reference temp for the modified Arrhenius form
+        :type tref: float
+        :param fit_n: whether to include the temperature exponent column
+        :type fit_n: bool
+        :return coeff_mat: design matrix, columns [1, (ln(T/Tref)), -1/(RT)]
+        :rtype: numpy.ndarray of shape (num_temps, 2 or 3)
+    """
+
+    a_vec = numpy.ones(len(temps))
+    ea_vec = (-1.0 / RC) * (1.0 / temps)
+    if fit_n:
+        n_vec = numpy.log(temps / tref)
+        coeff_mat = numpy.array([a_vec, n_vec, ea_vec], dtype=numpy.float64)
+    else:
+        coeff_mat = numpy.array([a_vec, ea_vec], dtype=numpy.float64)
+
+    return coeff_mat.transpose()
+
+
+def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1,
+               init_params=None):
     """ Fit a set of T-dependent rate constants to a double Arrhenius form; can
         do so by iterating across a range of guesses by modifying the provided
-        single Arrhenius fitting parameters
+        single Arrhenius fitting parameters. If init_params are given (e.g.,
+        the double fit at the previous PLOG pressure), they are tried first
+        and kept if they meet the tolerance.
 
         :param temps: temperatures at which rate constants are defined (K)
         :type temps: numpy.ndarray of shape (num_temps,)
@@ -161,35 +243,48 @@ def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
         :type dbltol: float
         :param dbl_iter: max number of iterations for double fitting
         :type dbl_iter: int
+        :param init_params: double Arrhenius parameters to try first
+        :type init_params: autoreact.RxnParams object
         :return params: fitted double Arrhenius parameters
         :rtype: autoreact.RxnParams object
         :return guess_idx: number of double fits performed
         :rtype: int
+        :return errs: fitting errors of the returned params
+        :rtype: numpy.ndarray of shape (num_temps,)
     """
 
-    def fit_doub_arr(temps, kts, sing_params, a_change, n_change, tref=1.0,
-                     allow_neg=False):
-        """ Performs one double Arrhenius fit by generating initial guesses
-            using changes to the single Arrhenius fit
+    # Get a new tref for the double fit: the logarithmic midpoint temp
+    doub_tref = numpy.sqrt(max(temps) / min(temps)) * min(temps)
+
+    def change_guess(sing_params, a_change, n_change):
+        """ Generates an initial guess (in the doub_tref basis) by varying
+            the single Arrhenius parameters
 
             :param a_change: amount by which to vary the A factor
             :type a_change: float
             :param n_change: amount by which to vary the temperature exponent
             :type n_change: float
-            :return params: fitted double Arrhenius parameters
-            :rtype: autoreact.RxnParams object
-            (all other inputs same as parent function)
+            :return init_guess: initial guess
+            :rtype: list [A1, n1, Ea1, A2, n2, Ea2]
         """
 
         sing_a, sing_n, sing_ea = sing_params.arr[0]  # get first (only) entry
+        sing_a = sing_a * (doub_tref / tref) ** sing_n  # convert to new basis
 
-        # Get a new tref for the double fit: the logarithmic midpoint temp
-        doub_tref = numpy.sqrt(max(temps) / min(temps)) * min(temps)
+        return [(sing_a * a_change), (sing_n + n_change), sing_ea,
+                (sing_a * (1 - a_change)), (sing_n - n_change), sing_ea]
 
-        # Generate guesses by varying single parameters
-        sing_a = sing_a * (doub_tref / tref) ** sing_n  # convert to new basis
-        init_guess = [(sing_a * a_change), (sing_n + n_change), sing_ea,
-                      (sing_a * (1 - a_change)), (sing_n - n_change), sing_ea]
+    def fit_doub_arr(temps, kts, init_guess, allow_neg=False):
+        """ Performs one double Arrhenius fit from an initial guess
+
+            :param init_guess: initial guess, in the doub_tref basis
+            :type init_guess: list [A1, n1, Ea1, A2, n2, Ea2]
+            :return params: fitted double Arrhenius parameters
+            :rtype: autoreact.RxnParams object
+            :return errs: fitting errors, from the final residual
+            :rtype: numpy.ndarray of shape (num_temps,)
+            (all other inputs same as parent function)
+        """
 
         # Set bounds: np.inf works better than setting e.g., 1e+300, but slower
         if allow_neg:  # no bounds
@@ -204,7 +299,8 @@ def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
         # Perform a least-squares fit
         # note: previous version scipy.optimize.leastsq (unbounded): used method='lm'
         # same or better results obtained with x_scale='jac' for new cases tested
-        plsq = least_squares(_resid_func, init_guess, bounds=bounds,
+        plsq = least_squares(_resid_func, init_guess, jac=_resid_jac,
+                             bounds=bounds,
                              args=(temps, kts, doub_tref), x_scale = 'jac', #method = 'lm',
                              ftol=1.0E-8, xtol=1.0E-8, max_nfev=100000)
 
@@ -217,7 +313,10 @@ def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
         arr_dct = {'arr_tuples': [raw_params[:3], raw_params[3:]]}
         params = RxnParams(arr_dct=arr_dct)
 
-        return params
+        # The residual is log10(k) - log10(k_fit)
+        errs = err.get_errs(kts, kts * 10 ** (-plsq.fun))
+
+        return params, errs
 
     # Create an array of predefined values to guess if the initial guess fails
     a_changes = [0.1, 0.3, 0.5, 0.7, 0.9]
@@ -227,9 +326,21 @@ def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
     # Make a maximum of dbl_iter attempts at a double fit
     max_errs = []
     prev_params = []
-    # Note: using 'high' here in place of the actual pressure; doesn't matter
-    # since this ref_ktp_dct never gets returned
-    ref_ktp_dct = {'high': (temps, kts)}  # used for err_dct later
+    prev_errs = []
+
+    # Try the given double parameters first, converted to the doub_tref basis
+    if init_params is not None:
+        init_guess = []
+        for arr_a, arr_n, arr_ea in init_params.arr:
+            init_guess += [arr_a * (doub_tref / tref) ** arr_n, arr_n, arr_ea]
+        params, errs = fit_doub_arr(temps, kts, init_guess)
+        max_err = max(abs(errs))
+        if max_err < dbltol:
+            return params, 0, errs
+        max_errs.append(max_err)
+        prev_params.append(params)
+        prev_errs.append(errs)
+
     for guess_idx in range(dbl_iter):
         # Use SJK's guesses as first try
         if guess_idx == 0:
@@ -241,14 +352,14 @@ def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
             n_change = n_changes[int((guess_idx - 1) / 5)]
 
         # Perform a double fit
-        params = fit_doub_arr(temps, kts, sing_params, a_change, n_change,
-                              tref=tref)
+        params, errs = fit_doub_arr(
+            temps, kts, change_guess(sing_params, a_change, n_change))
 
-        # Get an err_dct and the max error
-        err_dct = err.get_err_dct(ref_ktp_dct, params)
-        max_err = err.get_max_err(err_dct)
+        # Get the max error
+        max_err = max(abs(errs))
         max_errs.append(max_err)
         prev_params.append(params)
+        prev_errs.append(errs)
 
         # Exit the loop if tolerance is satisfied
         if max_err < dbltol:
@@ -258,9 +369,10 @@ def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
         if guess_idx in (dbl_iter - 1, predef_iter - 1):
             min_idx = numpy.argmin(max_errs)
             params = prev_params[min_idx]
+            errs = prev_errs[min_idx]
             break
 
-    return params, guess_idx
+    return params, guess_idx, errs
 
 
 def _resid_func(curr_guess, temps, kts, tref):
@@ -289,6 +401,42 @@ def _resid_func(curr_guess, temps, kts, tref):
     return resid
 
 
+def _resid_jac(curr_guess, temps, kts, tref):  # pylint: disable=unused-argument
+    """ Computes the analytic Jacobian of the double fitter residual
+        (_resid_func) with respect to the double Arrhenius params; kts is
+        not needed, but least_squares passes the same args to both
+
+        :param curr_guess: current guess for double Arrhenius params
+        :type curr_guess: list [A1, n1, Ea1, A2, n2, Ea2]
+        :param temps: temperatures at which rate constants are defined (K)
+        :type temps: numpy.ndarray of shape (num_temps,)
+        :param kts: rate constants
+        :type kts: Numpy.ndarray of shape (num_temps,)
+        :param tref: reference temp for the modified Arrhenius form
+        :type tref: float
+        :return jac: derivatives of the residual
+        :rtype: Numpy.ndarray of shape (num_temps, 6)
+    """
+
+    log_temps = numpy.log(temps / tref)
+    inv_rt = 1.0 / (RC * temps)
+
+    # Compute the temperature factors and the fitted rate constants
+    fac1 = numpy.exp(curr_guess[1] * log_temps - curr_guess[2] * inv_rt)
+    fac2 = numpy.exp(curr_guess[4] * log_temps - curr_guess[5] * inv_rt)
+    k_fit = curr_guess[0] * fac1 + curr_guess[3] * fac2
+
+    # d(resid)/dp = -d(k_fit)/dp / (k_fit ln 10)
+    jac = numpy.empty((len(temps), 6))
+    for idx, fac in ((0, fac1), (3, fac2)):
+        dk_da = -fac / (k_fit * numpy.log(10))
+        jac[:, idx] = dk_da
+        jac[:, idx + 1] = dk_da * curr_guess[idx] * log_temps
+        jac[:, idx + 2] = -dk_da * curr_guess[idx] * inv_rt
+
+    return jac
+
+
 def check_for_inf(params):
     """ Checks for infinite values in fitted Arrhenius parameters
 
@@ -2,8 +2,8 @@
 """
 
 import numpy
-from scipy.special import eval_chebyt
 from autoreact.params import RxnParams
+from ratefit import calc
 from ratefit.fit import arr
 from ratefit.fit import err
 
@@ -73,85 +73,96 @@ def get_alpha(ktp_dct, tdeg=4, pdeg=6):
         :rtype: tuple (pmin, pmax)
     """
 
-    def conv_dct_to_array(ktp_dct):
-        """ Converts the contents of a ktp_dct to a Numpy array
+    alphas, tlim, plim = get_alpha_batch([ktp_dct], tdeg=tdeg, pdeg=pdeg)
 
-            :return tp_array: array of kts
-            :rtype: Numpy array of shape (num_temps, num_pressures)
-        """
+    return alphas[0], tlim, plim
 
-        # Check the first pressure to get the number of temps (same for all)
-        num_temps = len(ktp_dct[list(ktp_dct.keys())[0]][0])
-        num_pressures = len(ktp_dct)
-        pt_array = numpy.ndarray([num_pressures, num_temps])
-        pressures = tuple(pressure for pressure in ktp_dct.keys()
-                          if pressure != 'high')
-        for pidx, pressure in enumerate(pressures):
-            _, kts = ktp_dct[pressure]
-            pt_array[pidx, :] = kts
 
-        tp_array = numpy.transpose(pt_array)
+def get_alpha_batch(ktp_dcts, tdeg=4, pdeg=6):
+    """ Performs the Chebyshev fit for several reactions whose rate constants
+        are all given on the same temperature and pressure grid. The design
+        matrix is built once and every reaction with the same set of valid
+        (i.e., finite) log k values is solved in a single least-squares call.
 
-        return tp_array
+        :param ktp_dcts: rate constants to be fitted; should be P-dependent
+        :type ktp_dcts: list [{pressure: (temps, kts)}, ...]
+        :param tdeg: number of temperature coefficients
+        :type tdeg: int
+        :param pdeg: number of pressure coefficients
+        :type pdeg: int
+        :return alphas: arrays of Chebyshev polynomial coefficients
+        :rtype: numpy.ndarray of shape (nrxn, tdeg, pdeg)
+        :return tlim: minimum and maximum temperatures of fit
+        :rtype: tuple (tmin, tmax)
+        :return plim: minimum and maximum pressures of fit
+        :rtype: tuple (pmin, pmax)
+    """
 
-    pressures = tuple(pressure for pressure in ktp_dct.keys()
+    pressures = tuple(pressure for pressure in ktp_dcts[0].keys()
                       if pressure != 'high')
-    temps = ktp_dct[pressures[0]][0]  # all temp vectors should be the same
-
-    # Get info on temps and pressures
-    tnum, pnum = len(temps), len(pressures)
-    tmin, tmax = min(temps), max(temps)
-    pmin, pmax = min(pressures), max(pressures)
-
-    # Get reduced temperatures and pressures
-    tred = (2*temps**(-1) - tmin**(-1) - tmax**(-1))\
-        / (tmax**(-1) - tmin**(-1))
-    pred = (2*numpy.log10(pressures) - numpy.log10(pmin) - numpy.log10(pmax))\
-        / (numpy.log10(pmax) - numpy.log10(pmin))
-
-    # Convert the ktp_dct to a Numpy array of shape (num_temps, num_pressures)
-    tp_array = conv_dct_to_array(ktp_dct)
-
-    # Create matrices for fits
-    amat = numpy.zeros((tnum * pnum, tdeg * pdeg), numpy.float64)
-    bvec = numpy.zeros((tnum * pnum), numpy.float64)
-    nzero = 0
-    for tidx1, temp in enumerate(tred):
-        for pidx1, press in enumerate(pred):
-            for tidx2 in range(tdeg):
-                for pidx2 in range(pdeg):
-                    idx1 = (pidx1 * tnum + tidx1)
-                    idx2 = (pidx2 * tdeg + tidx2)
-                    amat[idx1, idx2] = (
-                        eval_chebyt(tidx2, temp) * eval_chebyt(pidx2, press))
-            if tp_array[tidx1, pidx1] is not None:
-                bvec[idx1] = numpy.log10(tp_array[tidx1, pidx1])
-            else:
-                bvec[idx1] = None
-                nzero += 1
-
-    nnonzero = tnum * pnum - nzero
-    idxp = -1
-    amatp = numpy.zeros((nnonzero, tdeg * pdeg), numpy.float64)
-    bvecp = numpy.zeros((nnonzero), numpy.float64)
-    for idx in range(tnum*pnum):
-        if not numpy.isnan(bvec[idx]):
-            idxp += 1
-            bvecp[idxp] = bvec[idx]
-            for idx2 in range(tdeg*pdeg):
-                amatp[idxp, idx2] = amat[idx, idx2]
-
-    # Perform least-squares fit to get alpha coefficients
-    theta = numpy.linalg.lstsq(amatp, bvecp, rcond=RCOND)[0]
-
-    alpha = numpy.zeros((tdeg, pdeg), numpy.float64)
-    for tidx2 in range(tdeg):
-        for pidx2 in range(pdeg):
-            alpha[tidx2, pidx2] = theta[pidx2 * tdeg + tidx2]
-    tlim = (tmin, tmax)
-    plim = (pmin, pmax)
-
-    return alpha, tlim, plim
+    temps = ktp_dcts[0][pressures[0]][0]  # all temp vectors should be same
+    for ktp_dct in ktp_dcts[1:]:
+        _pressures = tuple(pressure for pressure in ktp_dct.keys()
+                           if pressure != 'high')
+        assert _pressures == pressures and numpy.allclose(
+            ktp_dct[pressures[0]][0], temps), (
+            'All ktp_dcts in a batch Chebyshev fit must share T and P grids')
+
+    amat, tlim, plim = design_matrix(temps, pressures, tdeg, pdeg)
+
+    # Right-hand sides: log10 k ordered by pressure, then by temperature
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        bmat = numpy.log10(numpy.array(
+            [[ktp_dct[pressure][1] for pressure in pressures]
+             for ktp_dct in ktp_dcts], dtype=numpy.float64)).reshape(
+                len(ktp_dcts), -1).T
+    valid = numpy.isfinite(bmat)
+
+    # Solve all reactions with the same valid rows at once
+    thetas = numpy.zeros((tdeg * pdeg, len(ktp_dcts)), numpy.float64)
+    mask_dct = {}
+    for ridx in range(len(ktp_dcts)):
+        mask_dct.setdefault(valid[:, ridx].tobytes(), []).append(ridx)
+    for ridxs in mask_dct.values():
+        rows = valid[:, ridxs[0]]
+        thetas[:, ridxs] = numpy.linalg.lstsq(
+            amat[rows], bmat[rows][:, ridxs], rcond=RCOND)[0]
+
+    # Theta is ordered by pressure coefficient, then by temp coefficient
+    alphas = numpy.transpose(thetas.T.reshape(-1, pdeg, tdeg), (0, 2, 1))
+
+    return alphas, tlim, plim
+
+
+def design_matrix(temps, pressures, tdeg, pdeg):
+    """ Builds the Chebyshev least-squares design matrix for a T, P grid as
+        the outer (Kronecker) product of the pressure and temperature bases.
+        Rows are ordered by pressure, then by temperature; columns are
+        ordered by pressure coefficient, then by temperature coefficient.
+
+        :param temps: temperatures of the grid (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures of the grid (atm)
+        :type pressures: tuple
+        :param tdeg: number of temperature coefficients
+        :type tdeg: int
+        :param pdeg: number of pressure coefficients
+        :type pdeg: int
+        :return amat: design matrix
+        :rtype: numpy.ndarray of shape (ntemp * npressure, tdeg * pdeg)
+        :return tlim: minimum and maximum temperatures of fit
+        :rtype: tuple (tmin, tmax)
+        :return plim: minimum and maximum pressures of fit
+        :rtype: tuple (pmin, pmax)
+    """
+
+    tlim = (min(temps), max(temps))
+    plim = (min(pressures), max(pressures))
+    tbasis = calc.cheb_temp_basis(temps, tlim, tdeg)
+    pbasis = calc.cheb_pressure_basis(pressures, plim, pdeg)
+    amat = numpy.kron(pbasis, tbasis)
+
+    return amat, tlim, plim
 
 
 def check_viability(ktp_dct):
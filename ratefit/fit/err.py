@@ -1,7 +1,9 @@
 """ Calculates errors between reference rate constants and fitted parameters
 """
 
+import numpy
 from mechanalyzer.calculator import rates
+from mechanalyzer.calculator import ktp_arr
 
 
 def get_err_dct(ref_ktp_dct, params):
@@ -24,12 +26,25 @@ def get_err_dct(ref_ktp_dct, params):
     err_dct = {}
     for pressure, (temps, fit_kts) in fit_ktp_dct.items():
         ref_kts = ref_ktp_dct[pressure][1]
-        errs = 100 * (fit_kts - ref_kts) / ref_kts
-        err_dct[pressure] = (temps, errs)
+        err_dct[pressure] = (temps, get_errs(ref_kts, fit_kts))
 
     return err_dct
 
 
+def get_errs(ref_kts, fit_kts):
+    """ Calculates the percent errors of fitted rate constants; used directly
+        by the fitters, which get the fitted rate constants as a by-product
+
+        :param ref_kts: reference rate constants
+        :type ref_kts: numpy.ndarray
+        :param fit_kts: fitted rate constants, of the same shape
+        :type fit_kts: numpy.ndarray
+        :return errs: percent errors
+        :rtype: numpy.ndarray
+    """
+    return 100 * (fit_kts - ref_kts) / ref_kts
+
+
 def get_max_err(err_dct):
     """ Gets the singular max (absolute) error from an err_dct
 
@@ -47,6 +62,42 @@ def get_max_err(err_dct):
     return max_err
 
 
+def get_err_stats(rxn_err_dct):
+    """ Gets the error statistics of all reactions at once, from their
+        err_dcts put on shared temperature and pressure axes
+
+        :param rxn_err_dct: fitting errors for each reaction
+        :type rxn_err_dct: dict {rxn: err_dct}
+        :return err_stats: reactions, max and mean absolute errors, and the
+            pressures and temperatures of the max errors (NaN errors and
+            temperatures and None pressures for a reaction without any
+            defined error)
+        :rtype: (tuple, numpy.ndarray, numpy.ndarray, tuple, numpy.ndarray)
+    """
+
+    err_ktps = ktp_arr.from_rxn_ktp_dct(rxn_err_dct)
+    abs_errs = numpy.abs(err_ktps.kts).reshape(len(err_ktps), -1)
+    defined = ~numpy.isnan(abs_errs)
+    abs_errs = numpy.where(defined, abs_errs, -1.0)
+
+    # Locate the max error of each reaction on the pressure-temperature grid
+    max_idxs = numpy.argmax(abs_errs, axis=1)
+    max_errs = abs_errs[numpy.arange(len(err_ktps)), max_idxs]
+    pidxs, tidxs = numpy.divmod(max_idxs, len(err_ktps.temps))
+    with numpy.errstate(invalid='ignore'):
+        mean_errs = (numpy.where(defined, abs_errs, 0.0).sum(axis=1) /
+                     defined.sum(axis=1))
+
+    # A reaction without any defined error has no max error to locate
+    has_errs = defined.any(axis=1)
+    max_errs = numpy.where(has_errs, max_errs, numpy.nan)
+
+    return (err_ktps.rxns, max_errs, mean_errs,
+            tuple(err_ktps.pressures[pidx] if has_err else None
+                  for pidx, has_err in zip(pidxs, has_errs)),
+            numpy.where(has_errs, err_ktps.temps[tidxs], numpy.nan))
+
+
 def get_temps_pressures(ktp_dct):
     """ Reads a ktp_dct and gets the list of pressure and corresponding list of
         temperature arrays
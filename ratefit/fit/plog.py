@@ -28,15 +28,28 @@ def get_params(ktp_dct, dbltol=15, dbl_iter=1, tref=1.0):
     pressures = [pressure for pressure in ktp_dct
                  if pressure != 'high']
 
-    # Run the Arrhenius fitter for each pressure
+    # Do the single Arrhenius fits of all pressures at once
+    sing_arr_params, sing_kts_lst = arr.single_arr_batch(
+        [ktp_dct[pressure][0] for pressure in pressures],
+        [ktp_dct[pressure][1] for pressure in pressures], return_kts=True)
+
+    # Run the Arrhenius fitter for each pressure; a double fit at one
+    # pressure is the first guess for the double fit at the next one
     plog_dct = {}
     err_dct = {}
-    for pressure in pressures:
+    dbl_guess = None
+    for pressure, sing_arr_tuple, sing_kts in zip(
+            pressures, sing_arr_params, sing_kts_lst):
         # Create a ktp_dct with only one pressure for use with Arrhenius fitter
         temp_ktp_dct = {pressure: ktp_dct[pressure]}
+        sing_params = RxnParams(
+            arr_dct={'arr_tuples': [list(sing_arr_tuple)]})
         temp_params, temp_err_dct = arr.get_params(
-            temp_ktp_dct, dbltol=dbltol, dbl_iter=dbl_iter, tref=tref)
+            temp_ktp_dct, dbltol=dbltol, dbl_iter=dbl_iter, tref=tref,
+            sing_params=sing_params, sing_kts=sing_kts, dbl_guess=dbl_guess)
         arr_params = temp_params.arr  # get the Arrhenius parameters
+        if len(arr_params) == 2:
+            dbl_guess = temp_params
         plog_dct[pressure] = arr_params  # update the plog_dct
         err_dct[pressure] = temp_err_dct[pressure]  # update the err_dct
 
@@ -2,6 +2,7 @@
 """
 
 import numpy
+from scipy.optimize import least_squares
 from ratefit.fit import arr
 from ratefit.fit import err
 
@@ -57,6 +58,77 @@ def test_double():
     assert max_err < 15  # %
 
 
+def test_single_batch():
+    """ Test the batched single Arrhenius fitter against one-by-one
+        least-squares fits
+    """
+
+    def _lstsq_params(temps, kts, fit_n=True):
+        """ [A, n, Ea] from a least-squares fit of a single set
+        """
+        theta = numpy.linalg.lstsq(
+            arr.design_matrix(temps, fit_n=fit_n), numpy.log(kts),
+            rcond=None)[0]
+        n_param = theta[1] if fit_n else 0.0
+        return numpy.array((numpy.exp(theta[0]), n_param, theta[-1]))
+
+    kts_3 = KTS_1.copy()
+    kts_3[[2, 5]] = 0.0  # non-positive k values are left out of the fit
+    kts_4 = 3.0 * KTS_1
+    kts_4[4] = numpy.nan  # and so are undefined ones
+    valid_3 = kts_3 > 0
+    # KTS_1 and 2*KTS_1, and kts_3 and 5*kts_3, share their temperatures
+    # and their valid k values: each pair is fitted with one lstsq call
+    temps_lst = [TEMPS_1, TEMPS_2, TEMPS_1, TEMPS_1[:3], TEMPS_1, TEMPS_1,
+                 TEMPS_1]
+    kts_lst = [KTS_1, KTS_2, kts_3, KTS_1[:3], 2.0 * KTS_1, kts_4,
+               5.0 * kts_3]
+    arr_params = arr.single_arr_batch(temps_lst, kts_lst)
+    ref_params = (
+        _lstsq_params(TEMPS_1, KTS_1),
+        _lstsq_params(TEMPS_2, KTS_2),
+        _lstsq_params(TEMPS_1[valid_3], kts_3[valid_3]),
+        _lstsq_params(TEMPS_1[:3], KTS_1[:3], fit_n=False),
+        _lstsq_params(TEMPS_1, 2.0 * KTS_1),
+        _lstsq_params(numpy.delete(TEMPS_1, 4), numpy.delete(kts_4, 4)),
+        _lstsq_params(TEMPS_1[valid_3], 5.0 * kts_3[valid_3]))
+    for params, ref, temps, kts in zip(
+            arr_params, ref_params, temps_lst, kts_lst):
+        assert numpy.allclose(params, ref)
+        assert numpy.allclose(params, arr.single_arr(temps, kts).arr[0])
+    assert arr_params[3][1] == 0.0  # no n fitted for three k values
+
+
+def test_double_optimum():
+    """ Test that the double Arrhenius fit ends at a least-squares optimum:
+        a fit with a finite-difference Jacobian started from it does not
+        lower the residual
+    """
+
+    def _resid(flat_params):
+        """ log10(k) - log10(k_fit) of double Arrhenius params, tref = 1 K
+        """
+        k_fit = sum(
+            a_fit * TEMPS_2 ** n_fit * numpy.exp(-ea_fit / (arr.RC * TEMPS_2))
+            for a_fit, n_fit, ea_fit in numpy.reshape(flat_params, (2, 3)))
+        return numpy.log10(KTS_2) - numpy.log10(k_fit)
+
+    sing_params = arr.single_arr(TEMPS_2, KTS_2)
+    params, _, errs = arr.double_arr(TEMPS_2, KTS_2, sing_params)
+    flat_params = numpy.ravel(params.arr)
+    resid = _resid(flat_params)
+    assert numpy.allclose(errs, err.get_errs(KTS_2, KTS_2 * 10 ** (-resid)))
+
+    fd_fit = least_squares(
+        _resid, flat_params, jac='3-point', x_scale='jac',
+        bounds=([0, -numpy.inf, -numpy.inf, 0, -numpy.inf, -numpy.inf],
+                numpy.inf),
+        ftol=1e-10, xtol=1e-10)
+    assert fd_fit.cost > 0.999 * 0.5 * numpy.sum(resid ** 2)
+
+
 if __name__ == '__main__':
     test_single()
     test_double()
+    test_single_batch()
+    test_double_optimum()
@@ -2,6 +2,8 @@
 """
 
 import numpy
+from scipy.special import eval_chebyt
+from ratefit import calc
 from ratefit.fit import cheb
 from ratefit.fit import err
 
@@ -89,5 +91,47 @@ def test_cheb():
     assert max_err < 5
 
 
+def test_cheb_batch():
+    """ test ratefit.fit.cheb.get_alpha_batch
+    """
+
+    # Scaling k by 10 only shifts the constant (T_0 * T_0) coefficient by 1
+    scaled_ktp_dct = {pressure: (temps, 10 * kts)
+                      for pressure, (temps, kts) in KTP_DCT.items()}
+    alpha, tlim, plim = cheb.get_alpha(KTP_DCT, tdeg=TDEG, pdeg=PDEG)
+    alphas, tlim2, plim2 = cheb.get_alpha_batch(
+        [KTP_DCT, scaled_ktp_dct], tdeg=TDEG, pdeg=PDEG)
+    shift = numpy.zeros((TDEG, PDEG))
+    shift[0, 0] = 1.0
+
+    assert numpy.allclose(alphas[0], alpha)
+    assert numpy.allclose(alphas[1], alpha + shift)
+    assert numpy.allclose(tlim, tlim2) and numpy.allclose(plim, plim2)
+
+
+def test_cheb_basis():
+    """ test ratefit.calc.cheb_basis and ratefit.calc.cheb_log_ktp
+    """
+
+    xvals = numpy.linspace(-1.0, 1.0, 7)
+    basis = calc.cheb_basis(xvals, TDEG)
+    for nidx in range(TDEG):
+        assert numpy.allclose(basis[:, nidx], eval_chebyt(nidx, xvals))
+
+    # Stacked alphas give the same result as one alpha at a time
+    alpha = numpy.arange(TDEG * PDEG, dtype=float).reshape(TDEG, PDEG) / 100
+    pressures = list(KTP_DCT.keys())
+    log_ktps = calc.cheb_log_ktp(
+        numpy.stack([alpha, 2 * alpha]), (300, 2400), (0.1, 100),
+        TEMPS, pressures)
+    assert log_ktps.shape == (2, len(TEMPS), len(pressures))
+    assert numpy.allclose(log_ktps[1], 2 * log_ktps[0])
+    assert numpy.allclose(
+        log_ktps[0],
+        calc.cheb_log_ktp(alpha, (300, 2400), (0.1, 100), TEMPS, pressures))
+
+
 if __name__ == '__main__':
     test_cheb()
+    test_cheb_batch()
+    test_cheb_basis()
@@ -28,5 +28,36 @@ def test_get_err_dct():
         assert max(abs(errs)) < 10  # check that all errors are less than 10%
 
 
+def test_get_err_stats():
+    """ Tests the get_err_stats function
+    """
+
+    rxn1 = (('H', 'O2'), ('OH', 'O'), (None,))
+    rxn2 = (('H2O2',), ('OH', 'OH'), ('(+M)',))
+    rxn_err_dct = {
+        rxn1: {'high': (np.array([1000., 1500.]), np.array([-3., 1.]))},
+        rxn2: err.get_err_dct(KTP_DCT1, PARAMS1)}
+    rxns, max_errs, mean_errs, max_pressures, max_temps = err.get_err_stats(
+        rxn_err_dct)
+    assert rxns == (rxn1, rxn2)
+    assert np.allclose(max_errs[0], 3.0)
+    assert np.allclose(mean_errs[0], 2.0)
+    assert max_pressures[0] == 'high'
+    assert max_temps[0] == 1000.
+    assert np.isclose(max_errs[1], err.get_max_err(rxn_err_dct[rxn2]))
+
+    # A reaction without any defined error gets NaN stats
+    rxn3 = (('O', 'O'), ('O2',), (None,))
+    rxn_err_dct[rxn3] = {
+        'high': (np.array([1000., 1500.]), np.array([np.nan, np.nan]))}
+    _, max_errs, mean_errs, max_pressures, max_temps = err.get_err_stats(
+        rxn_err_dct)
+    assert np.allclose(max_errs[0], 3.0)
+    assert np.isnan(max_errs[2]) and np.isnan(mean_errs[2])
+    assert max_pressures[2] is None
+    assert np.isnan(max_temps[2])
+
+
 if __name__ == '__main__':
     test_get_err_dct()
+    test_get_err_stats()
@@ -216,6 +216,19 @@ def test_fit_rxn_ktp_dct():
     for params in rxn_param_dct.values():
         assert numpy.allclose(ref_arr_params, params.arr)
 
+    # A reaction that fails should not stop the others, whether fitted
+    # serially or in parallel
+    bad_rxn = (('O', 'O'), ('O2',), (None,))
+    rxn_ktp_dct = dict(RXN_KTP_DCT)
+    rxn_ktp_dct[bad_rxn] = {'high': None}
+    for nprocs in (1, 2):
+        rxn_param_dct, rxn_err_dct = fit.fit_rxn_ktp_dct(
+            rxn_ktp_dct, 'arr', nprocs=nprocs)
+        assert tuple(rxn_param_dct) == (RXN1, RXN2)
+        assert tuple(rxn_err_dct) == (RXN1, RXN2)
+        for params in rxn_param_dct.values():
+            assert numpy.allclose(ref_arr_params, params.arr)
+
 
 if __name__ == '__main__':
     test_assess_fit_method()